@@ -0,0 +1,76 @@
+"""Time near-duplicate detection on generated backlogs.
+
+Compares :class:`core.near_duplicates.NearDuplicateIndex` with checking the
+Jaccard similarity of every pair, which is only run on the smaller
+backlogs. Run from the repository root::
+
+    python -m benchmarks.near_duplicates [--sizes 1000 10000 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from core.near_duplicates import NearDuplicateIndex, _signature, jaccard, shingles
+
+# Largest backlog the pairwise comparison is run on.
+_BASELINE_LIMIT = 2_000
+
+_WORDS = (
+    "add improve document refactor test cache index planner executor memory reflector "
+    "scheduler error handling metrics logging timeout retry budget config loader journal"
+).split()
+
+
+def _backlog(size: int) -> List[str]:
+    rng = random.Random(size)
+    texts: List[str] = []
+    for i in range(size):
+        if texts and i % 10 == 0:
+            words = rng.choice(texts).split()
+            words[rng.randrange(len(words))] = rng.choice(_WORDS)
+            texts.append(" ".join(words))
+        else:
+            texts.append(" ".join(rng.choice(_WORDS) for _ in range(8)))
+    return texts
+
+
+def _index(texts: List[str]) -> int:
+    index = NearDuplicateIndex()
+    for i, text in enumerate(texts):
+        index.add(i, text)
+    return len(index.clusters())
+
+
+def _pairwise(texts: List[str]) -> None:
+    sets = [shingles(text) for text in texts]
+    for i, a in enumerate(sets):
+        for b in sets[:i]:
+            jaccard(a, b)
+
+
+def _time(func, texts) -> float:
+    _signature.cache_clear()
+    start = time.perf_counter()
+    func(texts)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        texts = _backlog(size)
+        line = f"{size:>8} tasks: minhash/lsh {_time(_index, texts) * 1000:9.1f} ms"
+        if size <= _BASELINE_LIMIT:
+            line += f" | pairwise {_time(_pairwise, texts) * 1000:9.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
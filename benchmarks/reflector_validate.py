@@ -0,0 +1,75 @@
+"""Time Reflector.validate against the previous quadratic implementation.
+
+The previous implementation located duplicate ids with ``list.count`` for
+every id, so it is only timed on the smaller backlogs. Run from the
+repository root::
+
+    python -m benchmarks.reflector_validate [--sizes 1000 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List
+
+from core.backlog_validation import ValidationReport
+
+# Largest backlog the quadratic implementation is run on.
+_BASELINE_LIMIT = 20_000
+
+
+def _backlog(size: int) -> List[Dict]:
+    tasks = [
+        {
+            "id": i,
+            "description": f"Refactor pkg/module_{i % 5000}.py to reduce complexity" if i % 3 == 0 else f"task {i}",
+            "component": "core",
+            "dependencies": [i - 1] if i else [],
+            "priority": i % 5,
+            "status": "done" if i % 2 else "pending",
+        }
+        for i in range(size)
+    ]
+    tasks.append(dict(tasks[-1]))  # one duplicate id
+    return tasks
+
+
+def _baseline(tasks: List[Dict]) -> None:
+    task_ids = [task.get("id") for task in tasks if "id" in task]
+    if len(task_ids) != len(set(task_ids)):
+        [i for i in task_ids if task_ids.count(i) > 1]
+    refactor_files: Dict[str, Dict] = {}
+    for task in (t for t in tasks if "refactor" in t.get("description", "").lower()):
+        parts = task.get("description", "").split()
+        if len(parts) >= 2 and parts[1].endswith(".py"):
+            earlier = refactor_files.get(parts[1])
+            if not (earlier and task.get("status") == earlier.get("status") == "pending"):
+                refactor_files[parts[1]] = task
+    required = ["id", "description", "component", "dependencies", "priority", "status"]
+    for task in tasks:
+        [f for f in required if f not in task]
+
+
+def _time(func, tasks) -> float:
+    start = time.perf_counter()
+    func(tasks)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        tasks = _backlog(size)
+        report = _time(ValidationReport.build, tasks)
+        line = f"{size:>8} tasks: single pass {report * 1000:9.1f} ms"
+        if size <= _BASELINE_LIMIT:
+            line += f" | previous {_time(_baseline, tasks) * 1000:9.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare per-file analysis time of the single-parse SelfAuditor pipeline.
+
+The baseline reproduces the previous ``_analyze_file`` work: an
+``ast.parse`` syntax check followed by ``cc_visit`` and ``mi_visit``, each of
+which parses the source again. Run from the repository root::
+
+    python -m benchmarks.self_auditor_pipeline [--repeat N] [paths ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+from pathlib import Path
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+from radon.complexity import cc_visit
+from radon.metrics import mi_visit
+
+from core.self_auditor import SelfAuditor
+
+
+def _baseline(path: str, content: str) -> None:
+    ast.parse(content)
+    cc_visit(content)
+    mi_visit(content, False)
+
+
+def _sources(paths: List[Path]) -> List[Tuple[str, str]]:
+    sources = []
+    for path in paths:
+        content = path.read_text(encoding="utf-8")
+        try:
+            ast.parse(content)
+        except SyntaxError:
+            continue
+        sources.append((str(path), content))
+    return sources
+
+
+def _per_file_ms(func: Callable[[str, str], object], sources, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path, content in sources:
+            func(path, content)
+        runs.append((time.perf_counter() - start) / len(sources) * 1000)
+    return statistics.median(runs)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [
+        p for root in ("core", "vision", "broker", "worker", "tests") for p in Path(root).rglob("*.py")
+    ]
+    sources = _sources(paths)
+    auditor = SelfAuditor(cache=False)
+
+    before = _per_file_ms(_baseline, sources, args.repeat)
+    after = _per_file_ms(auditor._analyze_file, sources, args.repeat)
+    print(f"files: {len(sources)}")
+    print(f"three parses: {before:.2f} ms/file")
+    print(f"single parse: {after:.2f} ms/file ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
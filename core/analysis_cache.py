@@ -0,0 +1,73 @@
+"""Content-addressed on-disk cache of per-file analysis results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from opentelemetry import metrics
+
+from .cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Store analysis results under the SHA-256 of the analyzed source.
+
+    Entries are JSON files sharded by the first two hex digits of their key.
+    ``namespace`` is mixed into every key, so results computed with another
+    analyzer version or other thresholds are never returned. Lookups are
+    counted in the ``analysis_cache_hits_total`` and
+    ``analysis_cache_misses_total`` counters.
+    """
+
+    def __init__(self, namespace: str, root: Optional[Path] = None) -> None:
+        self.namespace = namespace
+        self.root = Path(root) if root is not None else cache_dir("auditor")
+        meter = metrics.get_meter_provider().get_meter(__name__)
+        self._hits = meter.create_counter(
+            "analysis_cache_hits_total", description="Analysis results served from the cache"
+        )
+        self._misses = meter.create_counter(
+            "analysis_cache_misses_total", description="Analysis results computed afresh"
+        )
+
+    # ------------------------------------------------------------------
+    def key(self, content: str) -> str:
+        """Return the cache key for ``content``."""
+        digest = hashlib.sha256(self.namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the entry stored under ``key`` or ``None``."""
+        try:
+            with self._path(key).open("r", encoding="utf-8") as fh:
+                value = json.load(fh)
+        except (OSError, ValueError):
+            self._misses.add(1)
+            return None
+        self._hits.add(1)
+        return value
+
+    def put(self, key: str, value: Dict) -> None:
+        """Store ``value`` under ``key``; failures only disable caching."""
+        path = self._path(key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(value, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.debug("Could not cache analysis result %s: %s", key, exc)
+            tmp.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
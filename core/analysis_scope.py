@@ -0,0 +1,173 @@
+"""Decide which source files need to be analyzed again."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+from .cache import cache_dir
+from .file_index import FileIndex, shared_index
+from .vcs import git_output, git_revision
+
+logger = logging.getLogger(__name__)
+
+
+class ScopeChanges(NamedTuple):
+    """Result of :meth:`AnalysisScope.changes`."""
+
+    changed: List[Path]
+    removed: List[str]
+    files: List[Path]
+
+
+class AnalysisScope:
+    """Track analyzed files between cycles and report only changed ones.
+
+    The scope covers the files matching ``patterns`` under ``root`` as listed
+    by a :class:`~core.file_index.FileIndex`. After
+    every cycle it persists the current commit together with a content digest
+    and the merged metrics of every file. The next cycle asks git which files
+    differ from that commit (tracked changes plus untracked files) and only
+    hashes those; outside a repository, or when the commit is unknown, every
+    file is hashed instead. Files that already differed from the commit when
+    the snapshot was taken are recorded and always hashed again, so reverting
+    them (``git checkout``, ``git stash``) is noticed although git no longer
+    lists them. Files whose digest matches the snapshot are not reported, so
+    analysis cost follows the size of the change.
+
+    ``namespace`` identifies how the stored metrics were computed, such as
+    the analyzer version and thresholds. A snapshot written under another
+    namespace is discarded and every file is reported again.
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[str],
+        root: Path = Path("."),
+        name: str = "default",
+        state_path: Optional[Path] = None,
+        index: Optional[FileIndex] = None,
+        namespace: str = "",
+    ) -> None:
+        self.patterns = list(patterns)
+        self.namespace = namespace
+        self.root = Path(root)
+        self.index = index
+        if state_path is None:
+            digest = hashlib.sha256(str(self.root.resolve()).encode("utf-8")).hexdigest()[:16]
+            state_path = cache_dir("scope") / f"{name}-{digest}.json"
+        self.state_path = Path(state_path)
+        self._state = self._load_state()
+        self._pending: Dict[str, object] = {}
+
+    # ------------------------------------------------------------------
+    def discover(self) -> List[Path]:
+        """Return the files covered by the scope in a stable order."""
+        index = self.index or shared_index(self.root)
+        return index.glob(*self.patterns)
+
+    def changes(self) -> ScopeChanges:
+        """Return the files that changed since the last :meth:`merge`."""
+        if self._state.get("namespace", "") != self.namespace:
+            self._state = {"commit": None, "files": {}, "dirty": [], "namespace": self.namespace}
+        files = self.discover()
+        known: Dict[str, Dict] = self._state["files"]
+        commit = git_revision(self.root)
+        candidates = self._git_candidates(self._state.get("commit"))
+        dirty = candidates if commit == self._state.get("commit") else self._git_candidates(commit)
+        if candidates is not None:
+            candidates = candidates | set(self._state.get("dirty", []))
+        digests: Dict[str, str] = {}
+        changed: List[Path] = []
+        for path in files:
+            key = str(path)
+            if candidates is not None and key in known and self._relative(path) not in candidates:
+                continue
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                continue
+            if known.get(key, {}).get("digest") != digest:
+                digests[key] = digest
+                changed.append(path)
+        current = {str(path) for path in files}
+        removed = [key for key in known if key not in current]
+        self._pending = {
+            "commit": commit,
+            "digests": digests,
+            "removed": removed,
+            "dirty": sorted(dirty) if dirty is not None else [],
+        }
+        logger.debug("Analysis scope: %d changed, %d removed of %d files", len(changed), len(removed), len(files))
+        return ScopeChanges(changed, removed, files)
+
+    def merge(self, metrics: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Merge fresh ``metrics`` into the snapshot, persist it and return all metrics.
+
+        ``metrics`` holds the results for the files reported by the preceding
+        :meth:`changes` call.
+        """
+        pending = self._pending or {
+            "commit": self._state.get("commit"),
+            "digests": {},
+            "removed": [],
+            "dirty": self._state.get("dirty", []),
+        }
+        files: Dict[str, Dict] = self._state["files"]
+        for key in pending["removed"]:
+            files.pop(key, None)
+        for key, digest in pending["digests"].items():
+            files[key] = {"digest": digest, "metrics": metrics.get(key)}
+        self._state["commit"] = pending["commit"]
+        self._state["dirty"] = pending["dirty"]
+        self._state["namespace"] = self.namespace
+        self._pending = {}
+        self._save_state()
+        return {key: entry["metrics"] for key, entry in files.items() if entry["metrics"] is not None}
+
+    def digests(self) -> Dict[str, str]:
+        """Return the content digest of every file as of the last :meth:`changes` call."""
+        pending = self._pending or {"digests": {}, "removed": []}
+        digests = {key: entry["digest"] for key, entry in self._state["files"].items()}
+        for key in pending["removed"]:
+            digests.pop(key, None)
+        digests.update(pending["digests"])
+        return digests
+
+    # ------------------------------------------------------------------
+    def _git_candidates(self, commit: Optional[str]) -> Optional[Set[str]]:
+        if not commit:
+            return None
+        diff = git_output(["diff", "--name-only", "--relative", commit, "--"], self.root)
+        untracked = git_output(["ls-files", "--others", "--exclude-standard"], self.root)
+        if diff is None or untracked is None:
+            return None
+        return set(diff.decode("utf-8").splitlines()) | set(untracked.decode("utf-8").splitlines())
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _load_state(self) -> Dict:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if isinstance(state.get("files"), dict):
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"commit": None, "files": {}, "dirty": [], "namespace": self.namespace}
+
+    def _save_state(self) -> None:
+        tmp = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(self._state, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.state_path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not persist analysis scope %s: %s", self.state_path, exc)
+            tmp.unlink(missing_ok=True)
@@ -1,38 +1,300 @@
 import asyncio
+import codecs
+import os
 import shlex
-from typing import Sequence, Union, Dict
+import signal
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+Command = Union[str, Sequence[str]]
+
+# Size of the reads from a command's pipes.
+_CHUNK_SIZE = 64 * 1024
+
+_EOF = object()
+
+
+class OutputLine(NamedTuple):
+    """One line of output from :meth:`AsyncRunner.stream`."""
+
+    stream: str
+    text: str
+
 
 class AsyncRunner:
-    """Run shell commands asynchronously."""
+    """Run shell commands asynchronously.
+
+    Every command is started in its own session, so a command that times
+    out or is cancelled is killed together with all the processes it
+    spawned.
+    """
 
-    async def run(self, command: Union[str, Sequence[str]]) -> Dict[str, Union[str, int]]:
+    async def run(self, command: Command, timeout: Optional[float] = None) -> Dict[str, Union[str, int, bool, None]]:
         """Execute ``command`` asynchronously and capture output.
 
         Parameters
         ----------
         command:
             The command to execute. Can be a string or sequence of arguments.
+        timeout:
+            Seconds after which the command's process group is killed.
 
         Returns
         -------
         dict
-            Dictionary with ``stdout``, ``stderr`` and ``exit_code``.
+            Dictionary with ``stdout``, ``stderr``, ``exit_code`` and
+            ``timed_out``. Output produced before a timeout is kept.
         """
-        if isinstance(command, str):
-            args = shlex.split(command)
-        else:
-            args = list(command)
-
         proc = await asyncio.create_subprocess_exec(
-            *args,
+            *self._args(command),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
+        readers = [asyncio.ensure_future(stream.read()) for stream in (proc.stdout, proc.stderr)]
 
-        stdout, stderr = await proc.communicate()
+        timed_out = False
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._kill(proc)
+            await proc.wait()
+        except BaseException:
+            self._kill(proc)
+            for reader in readers:
+                reader.cancel()
+            raise
+        stdout, stderr = await asyncio.gather(*readers)
 
         return {
-            "stdout": stdout.decode(),
-            "stderr": stderr.decode(),
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
             "exit_code": proc.returncode,
+            "timed_out": timed_out,
         }
+
+    async def run_many(
+        self,
+        commands: Iterable[Command],
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Union[str, int, bool, None]]]:
+        """Run ``commands`` with at most ``concurrency`` at a time.
+
+        Results are yielded in completion order. Each is the dictionary
+        returned by :meth:`run` plus the ``command``, its ``index`` in
+        ``commands`` and an ``error`` message, which is ``None`` unless the
+        command could not be started. Commands that fail to start have an
+        ``exit_code`` of ``None`` and do not affect the rest of the batch.
+
+        Parameters
+        ----------
+        commands:
+            The commands to execute.
+        concurrency:
+            Maximum number of commands running at once; must be at least 1.
+        timeout:
+            Seconds each command may run.
+        deadline:
+            Seconds the whole batch may take. Running commands are killed
+            when it passes; commands not started by then are reported with
+            ``timed_out`` set and an ``exit_code`` of ``None``.
+
+        Leaving the iteration early, or cancelling the task consuming it,
+        kills every running command once the generator is closed; use
+        :func:`contextlib.aclosing` to close it deterministically.
+
+        Raises
+        ------
+        ValueError
+            If ``concurrency`` is less than 1.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        loop = asyncio.get_running_loop()
+        batch_end = None if deadline is None else loop.time() + deadline
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(index: int, command: Command) -> Dict:
+            async with semaphore:
+                limit = timeout
+                if batch_end is not None:
+                    remaining = batch_end - loop.time()
+                    limit = remaining if limit is None else min(limit, remaining)
+                error = None
+                if limit is not None and limit <= 0:
+                    result = {"stdout": "", "stderr": "", "exit_code": None, "timed_out": True}
+                else:
+                    try:
+                        result = await self.run(command, timeout=limit)
+                    except (OSError, ValueError) as exc:
+                        error = f"could not start command: {exc}"
+                        result = {"stdout": "", "stderr": "", "exit_code": None, "timed_out": False}
+            result.update(index=index, command=command, error=error)
+            return result
+
+        pending = [asyncio.ensure_future(run_one(index, command)) for index, command in enumerate(commands)]
+        try:
+            for next_result in asyncio.as_completed(pending):
+                yield await next_result
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stream(
+        self,
+        command: Command,
+        timeout: Optional[float] = None,
+        max_lines: int = 1024,
+        encoding: str = "utf-8",
+        max_line_length: int = 64 * 1024,
+    ) -> "LineStream":
+        """Return an async iterator over the output lines of ``command``.
+
+        Lines are yielded as :class:`OutputLine` tuples tagged ``"stdout"``
+        or ``"stderr"`` as soon as they are complete, without their line
+        ending. See :class:`LineStream` for the parameters.
+
+        Example
+        -------
+        >>> async with runner.stream(["make", "test"]) as lines:  # doctest: +SKIP
+        ...     async for line in lines:
+        ...         print(line.stream, line.text)
+        >>> lines.returncode  # doctest: +SKIP
+        """
+        return LineStream(self._args(command), timeout, max_lines, encoding, max_line_length)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _args(command: Command):
+        if isinstance(command, str):
+            return shlex.split(command)
+        return list(command)
+
+    @staticmethod
+    def _kill(proc: asyncio.subprocess.Process) -> None:
+        if proc.returncode is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:  # pragma: no cover - Windows
+                proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+class LineStream:
+    """Async iterator over the decoded output lines of a command.
+
+    The command starts on the first iteration. Each pipe is read by its own
+    task that decodes chunks incrementally, so multi-byte characters split
+    across reads are handled, and puts complete lines into a queue holding
+    at most ``max_lines`` lines. When the consumer falls behind the readers
+    stop reading, the pipes fill up and the command blocks on its next
+    write; memory use stays bounded by the queue and ``max_line_length``,
+    the length at which over-long lines are split.
+
+    After the iteration ends ``returncode`` and ``timed_out`` are set. The
+    command's process group is killed when ``timeout`` seconds pass, and
+    when the stream is closed early through :meth:`aclose` or ``async
+    with``.
+    """
+
+    def __init__(
+        self,
+        args: List[str],
+        timeout: Optional[float] = None,
+        max_lines: int = 1024,
+        encoding: str = "utf-8",
+        max_line_length: int = 64 * 1024,
+    ) -> None:
+        self.args = args
+        self.timeout = timeout
+        self.encoding = encoding
+        self.max_line_length = max_line_length
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self._queue: asyncio.Queue = asyncio.Queue(max_lines)
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._readers: List[asyncio.Future] = []
+        self._open = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def __aenter__(self) -> "LineStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> "LineStream":
+        return self
+
+    async def __anext__(self) -> OutputLine:
+        if self._proc is None:
+            await self._start()
+        while self._open:
+            item = await self._queue.get()
+            if item is not _EOF:
+                return item
+            self._open -= 1
+        await self._finish()
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        """Kill the command if it is still running and release its pipes."""
+        if self._proc is None:
+            return
+        AsyncRunner._kill(self._proc)
+        for reader in self._readers:
+            reader.cancel()
+        await asyncio.gather(*self._readers, return_exceptions=True)
+        self._open = 0
+        await self._finish()
+
+    # ------------------------------------------------------------------
+    async def _start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            *self.args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        self._readers = [
+            asyncio.ensure_future(self._pump("stdout", self._proc.stdout)),
+            asyncio.ensure_future(self._pump("stderr", self._proc.stderr)),
+        ]
+        self._open = len(self._readers)
+        if self.timeout is not None:
+            self._timer = asyncio.get_running_loop().call_later(self.timeout, self._expire)
+
+    async def _finish(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.returncode = await self._proc.wait()
+
+    def _expire(self) -> None:
+        if self._proc.returncode is None:
+            self.timed_out = True
+            AsyncRunner._kill(self._proc)
+
+    async def _pump(self, name: str, pipe: asyncio.StreamReader) -> None:
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        pending = ""
+        while True:
+            chunk = await pipe.read(_CHUNK_SIZE)
+            pending += decoder.decode(chunk, final=not chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                await self._queue.put(OutputLine(name, line[:-1] if line.endswith("\r") else line))
+            while len(pending) > self.max_line_length:
+                await self._queue.put(OutputLine(name, pending[: self.max_line_length]))
+                pending = pending[self.max_line_length:]
+            if not chunk:
+                break
+        if pending:
+            await self._queue.put(OutputLine(name, pending))
+        await self._queue.put(_EOF)
@@ -0,0 +1,159 @@
+"""Backlog aggregates computed once per reflection cycle."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from .backlog_validation import ValidationBuilder, ValidationReport, refactor_target
+from .near_duplicates import NearDuplicateIndex
+
+PRIORITIES = (1, 2, 3, 4, 5)
+DEFAULT_PRIORITY = 3
+
+
+class BacklogAnalytics:
+    """Status, priority, component and refactor aggregates of a backlog.
+
+    Every task is visited exactly once, when it is added, and its description
+    is parsed at most once. Decision rules read the aggregates instead of
+    looping over the backlog themselves, so the cost of a cycle does not grow
+    with the number of rules. Tasks appended later, such as the ones a cycle
+    creates, are folded in with :meth:`extend` without revisiting the rest.
+
+    Attributes
+    ----------
+    total:
+        Number of tasks.
+    status_counts:
+        Tasks per ``status`` (``"unknown"`` when missing).
+    priority_distribution:
+        Tasks per priority 1-5; tasks without a priority count as 3.
+    component_counts:
+        Tasks per ``component`` (``"unknown"`` when missing).
+    pending_refactors:
+        Pending tasks whose description mentions a refactor.
+    refactor_files:
+        Files targeted by refactor tasks, from the description or from
+        ``metadata`` with ``type: refactor``.
+    duplicate_tasks:
+        ``{"description", "task_ids": [first_id, id]}`` for every task
+        repeating an earlier task's description.
+    near_duplicates:
+        :class:`~core.near_duplicates.NearDuplicateIndex` over the distinct
+        descriptions of tasks that are not done. Refactor tasks are only
+        compared with tasks targeting the same file. Descriptions are queued
+        as tasks are added and indexed on first access, so callers that
+        never ask for near-duplicates do not pay for the MinHash signatures.
+    open_decisions:
+        ``decision_type`` of every task the reflector generated that is not
+        done yet.
+    """
+
+    def __init__(self, tasks: Iterable[Mapping] = (), near_duplicates: Optional[NearDuplicateIndex] = None) -> None:
+        self.total = 0
+        self.status_counts: Dict[str, int] = {}
+        self.priority_distribution: Dict[int, int] = {priority: 0 for priority in PRIORITIES}
+        self.component_counts: Dict[str, int] = {}
+        self.pending_refactors = 0
+        self.refactor_files: Set[str] = set()
+        self.duplicate_tasks: List[Dict] = []
+        self.open_decisions: Set[str] = set()
+        self._near_index = NearDuplicateIndex() if near_duplicates is None else near_duplicates
+        self._descriptions: Dict[str, object] = {}
+        self._near_tasks: List[Dict] = []
+        self._near_indexed = 0
+        self._near_clusters: Optional[List[Dict]] = None
+        self._validation = ValidationBuilder()
+        self._report: Optional[ValidationReport] = None
+        self.extend(tasks)
+
+    # ------------------------------------------------------------------
+    def add(self, task: Mapping) -> None:
+        """Fold ``task`` into the aggregates."""
+        get = task.get
+        self.total += 1
+
+        status = get("status", "unknown")
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        priority = get("priority", DEFAULT_PRIORITY)
+        if priority in self.priority_distribution:
+            self.priority_distribution[priority] += 1
+        component = get("component", "unknown")
+        self.component_counts[component] = self.component_counts.get(component, 0) + 1
+
+        desc = get("description", "")
+        if status == "pending" and "refactor" in desc.lower():
+            self.pending_refactors += 1
+        target = refactor_target(desc)
+        if target is not None:
+            self.refactor_files.add(target)
+        meta = get("metadata") or {}
+        meta_target = meta.get("filepath") if meta.get("type") == "refactor" else None
+        if meta_target:
+            self.refactor_files.add(meta_target)
+        if meta.get("generated_by") == "Reflector" and status != "done" and meta.get("decision_type"):
+            self.open_decisions.add(meta["decision_type"])
+
+        if desc in self._descriptions:
+            self.duplicate_tasks.append({"description": desc, "task_ids": [self._descriptions[desc], get("id")]})
+        else:
+            self._descriptions[desc] = get("id")
+            if status != "done":
+                self._near_tasks.append({"id": get("id"), "description": desc, "group": target or meta_target})
+                self._near_clusters = None
+
+        self._validation.add(task, target)
+        self._report = None
+
+    def extend(self, tasks: Iterable[Mapping]) -> None:
+        """Fold every task of ``tasks`` into the aggregates."""
+        for task in tasks:
+            self.add(task)
+
+    # ------------------------------------------------------------------
+    @property
+    def validation(self) -> ValidationReport:
+        """Consistency problems of the tasks added so far."""
+        if self._report is None:
+            self._report = self._validation.report()
+        return self._report
+
+    @property
+    def near_duplicates(self) -> NearDuplicateIndex:
+        """Near-duplicate index over the open tasks added so far."""
+        for key in range(self._near_indexed, len(self._near_tasks)):
+            entry = self._near_tasks[key]
+            self._near_index.add(key, entry["description"], entry["group"])
+        self._near_indexed = len(self._near_tasks)
+        return self._near_index
+
+    @property
+    def near_duplicate_tasks(self) -> List[Dict]:
+        """``{"task_ids", "descriptions"}`` for every cluster of similar open tasks."""
+        if self._near_clusters is None:
+            self._near_clusters = [
+                {
+                    "task_ids": [self._near_tasks[key]["id"] for key in cluster],
+                    "descriptions": [self._near_tasks[key]["description"] for key in cluster],
+                }
+                for cluster in self.near_duplicates.clusters()
+            ]
+        return self._near_clusters
+
+    def count(self, status: str) -> int:
+        """Return the number of tasks with ``status``."""
+        return self.status_counts.get(status, 0)
+
+    def task_analysis(self) -> Dict:
+        """Return the backlog summary used by the reflector's decision rules."""
+        return {
+            "total_tasks": self.total,
+            "pending_tasks": self.count("pending"),
+            "in_progress_tasks": self.count("in_progress"),
+            "done_tasks": self.count("done"),
+            "duplicate_tasks": list(self.duplicate_tasks),
+            "near_duplicate_tasks": list(self.near_duplicate_tasks),
+            "priority_distribution": dict(self.priority_distribution),
+            "component_distribution": dict(self.component_counts),
+            "pending_refactor_tasks": self.pending_refactors,
+        }
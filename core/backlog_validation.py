@@ -0,0 +1,114 @@
+"""Single-pass consistency checks for task backlogs."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+REQUIRED_FIELDS = ("id", "description", "component", "dependencies", "priority", "status")
+
+_MISSING = object()
+
+
+def refactor_target(description: str) -> Optional[str]:
+    """Return the file named by a ``"Refactor <file>.py ..."`` description."""
+    if "refactor" not in description.lower():
+        return None
+    parts = description.split(None, 2)
+    if len(parts) >= 2 and parts[1].endswith(".py"):
+        return parts[1]
+    return None
+
+
+@dataclass
+class ValidationReport:
+    """Every problem found in a backlog, collected in one pass.
+
+    Attributes
+    ----------
+    duplicate_ids:
+        Each occurrence of an id used by more than one task, in backlog order.
+    duplicate_refactors:
+        ``(filepath, task_id, earlier_task_id)`` for pending refactor tasks
+        targeting a file whose latest refactor task is also pending.
+    missing_fields:
+        ``(task_id, fields)`` for tasks lacking required fields.
+    dangling_dependencies:
+        ``(task_id, dependency)`` for dependencies on ids not in the backlog.
+    """
+
+    duplicate_ids: List = field(default_factory=list)
+    duplicate_refactors: List[Tuple[str, object, object]] = field(default_factory=list)
+    missing_fields: List[Tuple[object, List[str]]] = field(default_factory=list)
+    dangling_dependencies: List[Tuple[object, object]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """``True`` if the backlog has no problems at all."""
+        return not (
+            self.duplicate_ids or self.duplicate_refactors or self.missing_fields or self.dangling_dependencies
+        )
+
+    @classmethod
+    def build(cls, tasks: Iterable[Mapping]) -> "ValidationReport":
+        """Check ``tasks`` using hash indexes, in time linear in the backlog size."""
+        builder = ValidationBuilder()
+        for task in tasks:
+            builder.add(task)
+        return builder.report()
+
+
+class ValidationBuilder:
+    """Accumulate a :class:`ValidationReport` one task at a time.
+
+    Lets callers that already walk the backlog, such as
+    :class:`core.backlog_analytics.BacklogAnalytics`, validate in the same
+    pass and extend the backlog later without starting over.
+    """
+
+    def __init__(self) -> None:
+        self._ids: List = []
+        self._duplicate_refactors: List[Tuple[str, object, object]] = []
+        self._missing_fields: List[Tuple[object, List[str]]] = []
+        self._latest_refactors: Dict[str, Mapping] = {}
+        self._dependencies: List[Tuple[object, Iterable]] = []
+
+    def add(self, task: Mapping, target=_MISSING) -> None:
+        """Add ``task``; ``target`` is its precomputed :func:`refactor_target`."""
+        get = task.get
+        task_id = get("id", _MISSING)
+        if task_id is not _MISSING:
+            self._ids.append(task_id)
+
+        missing = [name for name in REQUIRED_FIELDS if name not in task]
+        if missing:
+            self._missing_fields.append((get("id", "unknown"), missing))
+
+        if target is _MISSING:
+            target = refactor_target(get("description", ""))
+        if target is not None:
+            earlier = self._latest_refactors.get(target)
+            if earlier is not None and get("status") == earlier.get("status") == "pending":
+                self._duplicate_refactors.append((target, get("id"), earlier.get("id")))
+            else:
+                self._latest_refactors[target] = task
+
+        deps = get("dependencies")
+        if deps:
+            self._dependencies.append((get("id"), deps))
+
+    def report(self) -> ValidationReport:
+        """Return the report for every task added so far."""
+        report = ValidationReport(
+            duplicate_refactors=list(self._duplicate_refactors),
+            missing_fields=list(self._missing_fields),
+        )
+        counts = Counter(self._ids)
+        if len(counts) != len(self._ids):
+            report.duplicate_ids = [task_id for task_id in self._ids if counts[task_id] > 1]
+        for task_id, deps in self._dependencies:
+            for dep in deps:
+                if dep not in counts:
+                    report.dangling_dependencies.append((task_id, dep))
+        return report
@@ -9,8 +9,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 import yaml
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from core.memory import TASK_SCHEMA
+from core.task_loader import load_task_file
+from core.validation import validate_tasks
 
 
 def load_schema_and_tasks(path: Path):
@@ -36,7 +38,6 @@ def load_schema_and_tasks(path: Path):
         sys.exit(2)
 
     schema_lines = []
-    task_lines = []
     lines = text.splitlines()
     schema_started = False
     for line in lines:
@@ -46,7 +47,6 @@ def load_schema_and_tasks(path: Path):
         if schema_started and line.startswith("#"):
             schema_lines.append(line[1:].lstrip())
             continue
-        task_lines.append(line)
 
     if schema_lines:
         schema_str = "\n".join(schema_lines)
@@ -58,8 +58,10 @@ def load_schema_and_tasks(path: Path):
     else:
         schema = TASK_SCHEMA
 
+    # The schema header consists of YAML comments, so the task list can be
+    # served from the shared parse cache without stripping it first.
     try:
-        tasks = yaml.safe_load("\n".join(task_lines)) or []
+        tasks = load_task_file(path)
     except yaml.YAMLError as exc:
         logging.error("[ERROR] %s", exc)
         sys.exit(1)
@@ -85,7 +87,7 @@ def main():
     schema, tasks = load_schema_and_tasks(Path("tasks.yml"))
 
     try:
-        validate(instance=tasks, schema=schema)
+        validate_tasks(tasks, schema)
     except ValidationError as exc:
         logging.error("[ERROR] %s", exc)
         sys.exit(1)
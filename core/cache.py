@@ -0,0 +1,20 @@
+"""Location of the on-disk caches shared by AI-SWA components."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "AI_SWA_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".ai_swa_cache"
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return the cache directory for ``parts``, creating it if needed.
+
+    The root defaults to ``.ai_swa_cache`` in the working directory and can be
+    moved with the ``AI_SWA_CACHE_DIR`` environment variable.
+    """
+    path = Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)).joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -6,9 +6,12 @@ import sys
 
 from .orchestrator import Orchestrator
 from .memory import Memory
+from .sqlite_memory import SQLiteMemory
 from .planner import Planner
 from .executor import Executor
+from .result_cache import ResultCache
 from .reflector import Reflector
+from .analysis_scope import AnalysisScope
 from .self_auditor import SelfAuditor
 from .telemetry import setup_telemetry
 
@@ -21,6 +24,33 @@ def build_parser() -> argparse.ArgumentParser:
         default="state.json",
         help="Path to persistent state file",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["yaml", "sqlite"],
+        default="yaml",
+        help="Storage backend for the task backlog",
+    )
+    parser.add_argument(
+        "--database",
+        default="tasks.sqlite3",
+        help="SQLite database used by the sqlite backend",
+    )
+    parser.add_argument(
+        "--background-audit",
+        action="store_true",
+        help="Run the self-audit after each task off the critical path",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of independent ready tasks to execute concurrently",
+    )
+    parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help="Replay cached results of task commands whose declared inputs are unchanged",
+    )
     return parser
 
 
@@ -31,20 +61,28 @@ def main(argv=None):
 
     setup_telemetry()
 
-    memory = Memory(Path(args.memory))
     try:
+        if args.backend == "sqlite":
+            memory = SQLiteMemory(Path(args.memory), Path(args.database))
+        else:
+            memory = Memory(Path(args.memory))
         memory.save(memory.load())
     except Exception as exc:  # pragma: no cover - unexpected I/O errors
         print(f"Error accessing memory: {exc}", file=sys.stderr)
         return 1
 
     planner = Planner()
-    executor = Executor()
-    reflector = Reflector()
-    auditor = SelfAuditor()
-    orchestrator = Orchestrator(planner, executor, reflector, memory, auditor)
+    executor = Executor(result_cache=ResultCache() if args.result_cache else None)
+    reflector = Reflector(memory=memory)
+    auditor = SelfAuditor(scope=AnalysisScope(["**/*.py"], name="auditor"))
+    orchestrator = Orchestrator(
+        planner, executor, reflector, memory, auditor, background_audit=args.background_audit
+    )
     print("Orchestrator running")
-    orchestrator.run()
+    try:
+        orchestrator.run(workers=args.workers)
+    finally:
+        memory.close()
     return 0
 
 
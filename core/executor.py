@@ -1,18 +1,199 @@
 from __future__ import annotations
 
+import base64
+from dataclasses import dataclass, field
+import json
+import logging
+import math
+import os
+import shutil
+import signal
 import subprocess
 import shlex
+import sys
 from datetime import datetime
 from pathlib import Path
+import threading
 import time
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
 
 from opentelemetry import metrics, trace
 
+from .result_cache import ResultCache
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Size of the reads from a command's pipes.
+_CHUNK_SIZE = 64 * 1024
+
+# ``ru_maxrss`` is reported in kilobytes on Linux and in bytes on macOS.
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def _usage(rusage) -> Dict[str, float]:
+    return {
+        "user_cpu_seconds": rusage.ru_utime,
+        "system_cpu_seconds": rusage.ru_stime,
+        "max_rss_bytes": rusage.ru_maxrss * _MAXRSS_UNIT,
+        "block_input_ops": rusage.ru_inblock,
+        "block_output_ops": rusage.ru_oublock,
+        "voluntary_context_switches": rusage.ru_nvcsw,
+        "involuntary_context_switches": rusage.ru_nivcsw,
+    }
+
+
+# Applies rlimits passed as JSON and execs the command; used where
+# ``resource.prlimit`` is unavailable.
+_RLIMIT_WRAPPER = (
+    "import json, os, resource, sys\n"
+    "for kind, soft, hard in json.loads(sys.argv[1]):\n"
+    "    resource.setrlimit(kind, (soft, hard))\n"
+    "os.execvp(sys.argv[2], sys.argv[2:])\n"
+)
+
+
+def _resource_limits(cpu_limit: Optional[float], memory_limit: Optional[int]) -> List[Tuple[int, int, int]]:
+    """Return ``(resource, soft, hard)`` for the limits that are set.
+
+    Limits never exceed the hard limits this process already runs under.
+    """
+    if resource is None:
+        return []
+    limits = []
+    if cpu_limit is not None:
+        seconds = max(1, math.ceil(cpu_limit))
+        limits.append((resource.RLIMIT_CPU, seconds, seconds + 1))
+    if memory_limit is not None:
+        limits.append((resource.RLIMIT_AS, memory_limit, memory_limit))
+    clamped = []
+    for kind, soft, hard in limits:
+        _, current = resource.getrlimit(kind)
+        if current != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current), min(hard, current)
+        clamped.append((kind, soft, hard))
+    return clamped
+
+
+class OutputBuffer:
+    """Keep the first ``head_bytes`` and the last ``tail_bytes`` of a stream.
+
+    Memory use is bounded by ``head_bytes + tail_bytes`` plus one chunk no
+    matter how much is written; everything in between is only counted.
+    """
+
+    def __init__(self, head_bytes: int, tail_bytes: int) -> None:
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.total = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """Account for ``data`` and keep the parts that fall into head or tail."""
+        self.total += len(data)
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.tail_bytes > 0:
+            self._tail += data
+            if len(self._tail) > self.tail_bytes:
+                del self._tail[: len(self._tail) - self.tail_bytes]
+
+    @property
+    def omitted(self) -> int:
+        """Number of bytes neither in the head nor in the tail."""
+        return self.total - len(self._head) - len(self._tail)
+
+    def text(self) -> str:
+        """Return head and tail decoded, with a marker for any omitted bytes."""
+        head = self._head.decode("utf-8", errors="replace")
+        tail = self._tail.decode("utf-8", errors="replace")
+        if self.omitted:
+            return f"{head}\n... {self.omitted} bytes omitted ...\n{tail}"
+        return head + tail
+
+    def state(self) -> Dict:
+        """Return a JSON-serializable snapshot of the buffer."""
+        return {
+            "head_bytes": self.head_bytes,
+            "tail_bytes": self.tail_bytes,
+            "total": self.total,
+            "head": base64.b64encode(bytes(self._head)).decode("ascii"),
+            "tail": base64.b64encode(bytes(self._tail)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "OutputBuffer":
+        """Rebuild a buffer from :meth:`state`."""
+        buffer = cls(state["head_bytes"], state["tail_bytes"])
+        buffer.total = state["total"]
+        buffer._head = bytearray(base64.b64decode(state["head"]))
+        buffer._tail = bytearray(base64.b64decode(state["tail"]))
+        return buffer
+
+
+@dataclass
+class CommandOutput:
+    """Outcome of a task command run by :meth:`Executor.execute`."""
+
+    returncode: int
+    log_file: Path
+    stdout: OutputBuffer
+    stderr: OutputBuffer
+    timed_out: bool = False
+    usage: Dict[str, float] = field(default_factory=dict)
+    cached: bool = False
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes written to stdout and stderr together."""
+        return self.stdout.total + self.stderr.total
+
 
 class Executor:
-    """Carry out tasks and capture their output."""
+    """Carry out tasks and capture their output.
 
-    def __init__(self) -> None:
+    Parameters
+    ----------
+    head_bytes, tail_bytes:
+        Bytes of the beginning and end of each output stream kept in memory
+        for summaries. The complete output only goes to the log file.
+    log_dir:
+        Directory receiving ``task-<id>-<timestamp>.log`` files.
+    timeout, cpu_limit, memory_limit:
+        Defaults for tasks that do not set their own: seconds of wall-clock
+        time after which the command's process group is killed, seconds of
+        CPU time (``RLIMIT_CPU``) and bytes of address space
+        (``RLIMIT_AS``) the command may use.
+    result_cache:
+        Optional :class:`~core.result_cache.ResultCache`. Tasks declaring
+        ``inputs`` replay a cached result instead of running when their
+        command, environment and input files are unchanged.
+    """
+
+    def __init__(
+        self,
+        head_bytes: int = 64 * 1024,
+        tail_bytes: int = 64 * 1024,
+        log_dir: Path = Path("logs"),
+        timeout: Optional[float] = None,
+        cpu_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.log_dir = Path(log_dir)
+        self.timeout = timeout
+        self.cpu_limit = cpu_limit
+        self.memory_limit = memory_limit
+        self.result_cache = result_cache
         meter = metrics.get_meter_provider().get_meter(__name__)
         self._tasks_executed = meter.create_counter(
             "tasks_executed_total", description="Number of executed tasks"
@@ -20,20 +201,55 @@ class Executor:
         self._task_duration = meter.create_histogram(
             "task_duration_seconds", description="Task execution duration"
         )
+        self._output_bytes = meter.create_counter(
+            "task_output_bytes_total", unit="By", description="Bytes written by task commands per stream"
+        )
+        self._cpu_seconds = meter.create_histogram(
+            "task_cpu_seconds", unit="s", description="CPU time of task commands by mode"
+        )
+        self._max_rss = meter.create_histogram(
+            "task_max_rss_bytes", unit="By", description="Peak resident set size of task commands"
+        )
+        self._block_io = meter.create_histogram(
+            "task_block_io_operations", description="Block I/O operations of task commands by direction"
+        )
+        self._context_switches = meter.create_histogram(
+            "task_context_switches", description="Context switches of task commands by kind"
+        )
         self._tracer = trace.get_tracer(__name__)
 
-    def execute(self, task: object) -> None:
-        """Execute ``task`` and write any command output to ``logs/``.
+    def execute(self, task: object) -> Optional[CommandOutput]:
+        """Execute ``task`` and stream any command output to ``logs/``.
 
         If the task defines a ``command`` attribute, it will be executed in a
-        subprocess. The combined stdout and stderr are written to a timestamped
-        log file under ``logs/``.
+        subprocess. Its stdout and stderr are appended to a timestamped log
+        file under ``logs/`` chunk by chunk as they are produced, so memory
+        use does not depend on the amount of output. Only the head and tail
+        of each stream are kept in the returned :class:`CommandOutput`.
+
+        The task's ``timeout``, ``cpu_limit`` and ``memory_limit``, falling
+        back to the executor's, are enforced on the command. Its resource
+        usage is recorded in the ``task_cpu_seconds``,
+        ``task_max_rss_bytes``, ``task_block_io_operations`` and
+        ``task_context_switches`` histograms and on the span.
+
+        With a ``result_cache``, tasks that declare ``inputs`` (glob patterns
+        of the files the command reads) are looked up first. A hit copies
+        the cached log and returns the cached exit code and output with
+        ``cached`` set. Runs that finish without a timeout or signal are
+        stored. The effective timeout and rlimits are part of the key; a task
+        with an invalid input pattern runs without the cache.
 
         Parameters
         ----------
         task:
             Object representing the task to execute. It may define
             ``description`` and/or ``command`` attributes.
+
+        Returns
+        -------
+        CommandOutput or None
+            The command's outcome, or ``None`` when the task has no command.
         """
 
         if hasattr(task, "description"):
@@ -45,20 +261,187 @@ class Executor:
 
         command = getattr(task, "command", None)
         if not command:
-            return
+            return None
 
         attrs = {"task.id": getattr(task, "id", "unknown")}
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.log_dir.mkdir(exist_ok=True)
+        log_file = self.log_dir / f"task-{getattr(task, 'id', 'unknown')}-{timestamp}.log"
+
+        cache_key = None
+        inputs = getattr(task, "inputs", None)
+        if self.result_cache is not None and inputs is not None:
+            limits = {name: self._limit(task, name) for name in ("timeout", "cpu_limit", "memory_limit")}
+            try:
+                cache_key = self.result_cache.key(command, inputs, limits=limits)
+            except ValueError as exc:
+                logger.warning("Not caching task %s: %s", attrs["task.id"], exc)
+
         start_time = time.perf_counter()
-        with self._tracer.start_as_current_span("executor.execute", attributes=attrs):
-            args = shlex.split(command)
-            result = subprocess.run(args, capture_output=True, text=True)
+        with self._tracer.start_as_current_span("executor.execute", attributes=attrs) as span:
+            output = self._replay(cache_key, log_file) if cache_key is not None else None
+            if cache_key is not None:
+                span.set_attribute("task.cache", "hit" if output is not None else "miss")
+            if output is None:
+                output = self._run_command(task, command, log_file, attrs)
+                if cache_key is not None and not output.timed_out and output.returncode >= 0:
+                    meta = {
+                        "returncode": output.returncode,
+                        "stdout": output.stdout.state(),
+                        "stderr": output.stderr.state(),
+                    }
+                    self.result_cache.put(cache_key, meta, log_file)
+            span.set_attribute("task.output_bytes", output.total_bytes)
+            span.set_attribute("task.exit_code", output.returncode)
+            span.set_attribute("task.timed_out", output.timed_out)
+            for name, value in output.usage.items():
+                span.set_attribute(f"task.{name}", value)
         duration = time.perf_counter() - start_time
 
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-        log_file = log_dir / f"task-{getattr(task, 'id', 'unknown')}-{timestamp}.log"
-        log_file.write_text(result.stdout + result.stderr)
-
         self._tasks_executed.add(1, attrs)
         self._task_duration.record(duration, attrs)
+        return output
+
+    # ------------------------------------------------------------------
+    def _run_command(self, task: object, command: str, log_file: Path, attrs: Dict) -> CommandOutput:
+        buffers = {
+            "stdout": OutputBuffer(self.head_bytes, self.tail_bytes),
+            "stderr": OutputBuffer(self.head_bytes, self.tail_bytes),
+        }
+        timeout = self._limit(task, "timeout")
+        limits = _resource_limits(self._limit(task, "cpu_limit"), self._limit(task, "memory_limit"))
+        with open(log_file, "wb", buffering=0) as log:
+            returncode, timed_out, usage = self._run(shlex.split(command), log, buffers, timeout, limits)
+        for stream, buffer in buffers.items():
+            self._output_bytes.add(buffer.total, {**attrs, "stream": stream})
+        self._record_usage(usage, attrs)
+        return CommandOutput(returncode, log_file, buffers["stdout"], buffers["stderr"], timed_out, usage)
+
+    def _replay(self, cache_key: str, log_file: Path) -> Optional[CommandOutput]:
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return None
+        meta, stored_log = cached
+        try:
+            shutil.copyfile(stored_log, log_file)
+        except OSError:  # evicted concurrently
+            return None
+        return CommandOutput(
+            meta["returncode"],
+            log_file,
+            OutputBuffer.from_state(meta["stdout"]),
+            OutputBuffer.from_state(meta["stderr"]),
+            cached=True,
+        )
+
+    def _limit(self, task: object, name: str):
+        value = getattr(task, name, None)
+        return getattr(self, name) if value is None else value
+
+    def _run(
+        self,
+        args,
+        log: BinaryIO,
+        buffers: Dict[str, OutputBuffer],
+        timeout: Optional[float] = None,
+        limits: Sequence[Tuple[int, int, int]] = (),
+    ) -> Tuple[int, bool, Dict[str, float]]:
+        # ``preexec_fn`` is not safe while other threads run, so the limits
+        # are set on the child right after it starts, or by a small wrapper
+        # that execs the command where ``prlimit`` is unavailable.
+        prlimit = getattr(resource, "prlimit", None)
+        if limits and prlimit is None:
+            args = [sys.executable, "-c", _RLIMIT_WRAPPER, json.dumps(list(limits)), *args]
+        lock = threading.Lock()
+        proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        if limits and prlimit is not None:
+            try:
+                for kind, soft, hard in limits:
+                    prlimit(proc.pid, kind, (soft, hard))
+            except ProcessLookupError:
+                pass
+            except BaseException:
+                self._kill(proc)
+                proc.communicate()
+                raise
+        readers = [
+            threading.Thread(target=self._pump, args=(pipe, log, buffers[name], lock), daemon=True)
+            for name, pipe in (("stdout", proc.stdout), ("stderr", proc.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = threading.Event()
+        reaped = threading.Lock()
+
+        def expire() -> None:
+            with reaped:
+                if proc.returncode is None:
+                    timed_out.set()
+                    self._kill(proc)
+
+        timer = threading.Timer(timeout, expire) if timeout is not None else None
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+        usage: Dict[str, float] = {}
+        try:
+            if hasattr(os, "wait4"):
+                _, status, rusage = os.wait4(proc.pid, 0)
+                with reaped:
+                    proc.returncode = os.waitstatus_to_exitcode(status)
+                usage = _usage(rusage)
+            else:  # pragma: no cover - Windows
+                try:
+                    proc.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    expire()
+                    proc.wait()
+        except BaseException:
+            self._kill(proc)
+            proc.wait()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            for reader in readers:
+                reader.join()
+        return proc.returncode, timed_out.is_set(), usage
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen) -> None:
+        if proc.returncode is not None:
+            return
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:  # pragma: no cover - Windows
+                proc.kill()
+        except ProcessLookupError:
+            pass
+
+    def _record_usage(self, usage: Dict[str, float], attrs: Dict) -> None:
+        if not usage:
+            return
+        self._cpu_seconds.record(usage["user_cpu_seconds"], {**attrs, "cpu.mode": "user"})
+        self._cpu_seconds.record(usage["system_cpu_seconds"], {**attrs, "cpu.mode": "system"})
+        self._max_rss.record(usage["max_rss_bytes"], attrs)
+        self._block_io.record(usage["block_input_ops"], {**attrs, "disk.io.direction": "read"})
+        self._block_io.record(usage["block_output_ops"], {**attrs, "disk.io.direction": "write"})
+        self._context_switches.record(usage["voluntary_context_switches"], {**attrs, "context_switch.kind": "voluntary"})
+        self._context_switches.record(
+            usage["involuntary_context_switches"], {**attrs, "context_switch.kind": "involuntary"}
+        )
+
+    @staticmethod
+    def _pump(pipe: BinaryIO, log: BinaryIO, buffer: OutputBuffer, lock: threading.Lock) -> None:
+        with pipe:
+            for chunk in iter(lambda: pipe.read1(_CHUNK_SIZE), b""):
+                with lock:
+                    log.write(chunk)
+                    buffer.write(chunk)
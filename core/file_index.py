@@ -0,0 +1,254 @@
+"""Cached, ignore-aware listing of repository files."""
+
+from __future__ import annotations
+
+from fnmatch import fnmatch
+import os
+from pathlib import Path
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+DEFAULT_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ai_swa_cache",
+    "*.egg-info",
+)
+
+# Directory listings whose mtime is this close to the moment they were read
+# are rescanned, since an entry added within the same timestamp tick would
+# not change the mtime.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def glob_regex(pattern: str) -> Pattern:
+    """Compile a ``Path.glob`` style pattern matched against whole relative paths.
+
+    ``*`` and ``?`` never cross ``/``; ``**/`` matches any number of
+    directories, including none.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+class _IgnoreRules:
+    """Patterns of one ``.gitignore`` file, relative to its directory."""
+
+    def __init__(self, base: str, lines: Sequence[str]) -> None:
+        self.base = base
+        self.rules: List[Tuple[Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            if "/" in line:
+                regex = glob_regex(line.lstrip("/"))
+            else:
+                regex = glob_regex("**/" + line)
+            self.rules.append((regex, negate, dir_only))
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """Return whether ``rel`` is ignored, or ``None`` if no rule applies."""
+        if self.base:
+            rel = rel[len(self.base) + 1:]
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                result = not negate
+        return result
+
+
+class _Listing(NamedTuple):
+    mtime_ns: int
+    ignore_mtime_ns: Optional[int]
+    scanned_ns: int
+    files: List[str]
+    dirs: List[str]
+    rules: Optional[_IgnoreRules]
+
+
+class FileIndex:
+    """List the files of a source tree, skipping ignored and excluded paths.
+
+    The tree is walked with :func:`os.scandir`. Directories whose name
+    matches one of ``excludes`` (``fnmatch`` patterns) or that are ignored by
+    a ``.gitignore`` along the way are pruned without being entered. The
+    listing of every directory is cached together with its modification time
+    and that of its ``.gitignore``; later walks only ``stat`` unchanged
+    directories instead of listing them again.
+    """
+
+    def __init__(
+        self,
+        root: Path = Path("."),
+        excludes: Sequence[str] = DEFAULT_EXCLUDES,
+        use_gitignore: bool = True,
+    ) -> None:
+        self.root = Path(root)
+        self.excludes = list(excludes)
+        self.use_gitignore = use_gitignore
+        self._listings: Dict[str, _Listing] = {}
+
+    # ------------------------------------------------------------------
+    def files(self) -> List[Path]:
+        """Return every indexed file below ``root`` in sorted order."""
+        found: List[str] = []
+        listings: Dict[str, _Listing] = {}
+        self._walk("", [], found, listings)
+        self._listings = listings
+        found.sort()
+        return [self.root / rel for rel in found]
+
+    def glob(self, *patterns: str) -> List[Path]:
+        """Return indexed files whose path relative to ``root`` matches ``patterns``.
+
+        Files are grouped by the first pattern they match, in pattern order,
+        and sorted within each group.
+        """
+        regexes = [glob_regex(pattern) for pattern in patterns]
+        groups: List[List[Path]] = [[] for _ in regexes]
+        for path in self.files():
+            rel = path.relative_to(self.root).as_posix()
+            for group, regex in zip(groups, regexes):
+                if regex.match(rel):
+                    group.append(path)
+                    break
+        return [path for group in groups for path in group]
+
+    # ------------------------------------------------------------------
+    def _excluded(self, name: str) -> bool:
+        return any(fnmatch(name, pattern) for pattern in self.excludes)
+
+    def _ignored(self, rel: str, is_dir: bool, rules: List[_IgnoreRules]) -> bool:
+        ignored = False
+        for ruleset in rules:
+            result = ruleset.match(rel, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def _walk(self, rel_dir: str, rules: List[_IgnoreRules], found: List[str], listings: Dict) -> None:
+        listing = self._listing(rel_dir)
+        if listing is None:
+            return
+        listings[rel_dir] = listing
+        if listing.rules is not None:
+            rules = rules + [listing.rules]
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for name in listing.files:
+            rel = prefix + name
+            if not self._excluded(name) and not self._ignored(rel, False, rules):
+                found.append(rel)
+        for name in listing.dirs:
+            rel = prefix + name
+            if not self._excluded(name) and not self._ignored(rel, True, rules):
+                self._walk(rel, rules, found, listings)
+
+    def _listing(self, rel_dir: str) -> Optional[_Listing]:
+        directory = self.root / rel_dir if rel_dir else self.root
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        ignore_file = directory / ".gitignore"
+        ignore_mtime_ns = None
+        if self.use_gitignore:
+            try:
+                ignore_mtime_ns = os.stat(ignore_file).st_mtime_ns
+            except OSError:
+                pass
+
+        cached = self._listings.get(rel_dir)
+        if (
+            cached is not None
+            and cached.mtime_ns == mtime_ns
+            and cached.ignore_mtime_ns == ignore_mtime_ns
+            and cached.scanned_ns - max(mtime_ns, ignore_mtime_ns or 0) > _RACY_WINDOW_NS
+        ):
+            return cached
+
+        scanned_ns = time.time_ns()
+        files: List[str] = []
+        dirs: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        rules = None
+        if ignore_mtime_ns is not None:
+            try:
+                lines = ignore_file.read_text(encoding="utf-8").splitlines()
+                rules = _IgnoreRules(rel_dir, lines)
+            except (OSError, UnicodeDecodeError):
+                rules = None
+        return _Listing(mtime_ns, ignore_mtime_ns, scanned_ns, sorted(files), sorted(dirs), rules)
+
+
+_shared: Dict[str, FileIndex] = {}
+
+
+def shared_index(root: Path = Path(".")) -> FileIndex:
+    """Return the process-wide :class:`FileIndex` for ``root`` with default excludes."""
+    key = str(Path(root).resolve())
+    index = _shared.get(key)
+    if index is None:
+        index = _shared[key] = FileIndex(root)
+    return index
@@ -0,0 +1,129 @@
+"""Append-only journal of task status changes and additions."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+class TaskJournal:
+    """Write-ahead log that sits next to a YAML tasks file.
+
+    Every status change or task addition is appended as one JSON line and
+    flushed to disk with ``fsync`` so a crash never loses an acknowledged
+    change. :class:`core.memory.Memory` replays the journal on top of the
+    YAML file when loading and truncates it after writing a fresh YAML
+    snapshot (compaction).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._entries: Optional[int] = None
+        self._repaired = False
+
+    @classmethod
+    def for_tasks_file(cls, tasks_file) -> "TaskJournal":
+        """Return the journal belonging to ``tasks_file``."""
+        path = Path(tasks_file)
+        return cls(path.with_name(f"{path.name}.journal"))
+
+    def __len__(self) -> int:
+        if self._entries is None:
+            self._entries = sum(1 for _ in self.entries())
+        return self._entries
+
+    # ------------------------------------------------------------------
+    def record_status(self, task_id, status: str) -> None:
+        """Append a status change for ``task_id``."""
+        self._append({"op": "status", "id": task_id, "status": status})
+
+    def record_added(self, task_data: Dict) -> None:
+        """Append a new task given as a plain dictionary."""
+        self._append({"op": "add", "task": task_data})
+
+    def entries(self) -> Iterator[Dict]:
+        """Yield journal entries in the order they were written.
+
+        Torn or corrupt lines left behind by a crash are skipped; the
+        entries after them are still returned.
+        """
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                if not line.endswith("\n"):
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+    def replay(self, tasks_data: List[Dict]) -> List[Dict]:
+        """Apply the journal to ``tasks_data`` and return the result.
+
+        Replaying is idempotent: additions of an id that already exists
+        replace the existing entry, so a journal that survived a compaction
+        can be applied to the new snapshot without duplicating tasks.
+        """
+        index = {item.get("id"): pos for pos, item in enumerate(tasks_data)}
+        for entry in self.entries():
+            if entry.get("op") == "status":
+                pos = index.get(entry.get("id"))
+                if pos is not None:
+                    tasks_data[pos]["status"] = entry["status"]
+            elif entry.get("op") == "add":
+                task = entry["task"]
+                pos = index.get(task.get("id"))
+                if pos is None:
+                    index[task.get("id")] = len(tasks_data)
+                    tasks_data.append(task)
+                else:
+                    tasks_data[pos] = task
+        return tasks_data
+
+    def reset(self) -> None:
+        """Discard all entries after the tasks file has been compacted."""
+        if self.path.exists():
+            self.path.unlink()
+        self._entries = 0
+        self._repaired = True
+
+    # ------------------------------------------------------------------
+    def _append(self, entry: Dict) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        entries = len(self)
+        if not self._repaired:
+            self._truncate_torn_tail()
+            self._repaired = True
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._entries = entries + 1
+
+    def _truncate_torn_tail(self) -> None:
+        """Cut a partial last line so the next entry starts on a line of its own."""
+        try:
+            fh = self.path.open("r+b")
+        except FileNotFoundError:
+            return
+        with fh:
+            size = fh.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                fh.seek(start)
+                block = fh.read(end - start)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end != size:
+                fh.truncate(end)
+                fh.flush()
+                os.fsync(fh.fileno())
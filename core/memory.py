@@ -2,11 +2,15 @@
 
 from pathlib import Path
 import json
-import yaml
-from jsonschema import validate
+import os
+from collections.abc import Mapping
 from dataclasses import asdict
-from typing import List
+from typing import Dict, List
+from .journal import TaskJournal
 from .task import Task
+from .task_table import TaskTable
+from .task_loader import dump_yaml, load_task_file, remember_task_file
+from .validation import TaskListValidator
 
 
 TASK_SCHEMA = {
@@ -30,9 +34,13 @@ TASK_SCHEMA = {
             "priority": {"type": "integer", "minimum": 1, "maximum": 5},
             "status": {
                 "type": "string",
-                "enum": ["pending", "in_progress", "done"],
+                "enum": ["pending", "in_progress", "done", "failed"],
             },
             "command": {"type": ["string", "null"]},
+            "timeout": {"type": ["number", "null"], "exclusiveMinimum": 0},
+            "cpu_limit": {"type": ["number", "null"], "exclusiveMinimum": 0},
+            "memory_limit": {"type": ["integer", "null"], "exclusiveMinimum": 0},
+            "inputs": {"type": ["array", "null"], "items": {"type": "string"}},
         },
     },
 }
@@ -43,15 +51,21 @@ TASK_SCHEMA = {
 class Memory:
     """Persist simple JSON state to disk."""
 
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, compact_every: int = 1000):
         """Initialize the memory store.
 
         Parameters
         ----------
         path:
             File location for the JSON state.
+        compact_every:
+            Number of journal entries after which a tasks file is rewritten
+            in full and its journal truncated.
         """
         self.path = Path(path)
+        self.compact_every = compact_every
+        self._journals: Dict[Path, TaskJournal] = {}
+        self._validator = TaskListValidator(TASK_SCHEMA)
 
     def load(self):
         """Load and return persisted state or an empty dict."""
@@ -66,23 +80,103 @@ class Memory:
         with self.path.open("w") as fh:
             json.dump(data, fh)
 
+    def close(self) -> None:
+        """Release resources held by the store; the YAML store holds none."""
+
     # New helper methods for YAML task files
     def load_tasks(self, tasks_file: str) -> List[Task]:
-        """Return list of :class:`Task` from a YAML file or an empty list."""
+        """Return list of :class:`Task` from a YAML file or an empty list.
+
+        Changes recorded in the journal next to ``tasks_file`` are replayed
+        on top of the YAML snapshot.
+        """
+        fields = set(Task.__dataclass_fields__.keys())
+        return [Task(**{k: v for k, v in item.items() if k in fields}) for item in self.load_task_data(tasks_file)]
+
+    def load_table(self, tasks_file: str) -> TaskTable:
+        """Return the backlog of ``tasks_file`` as a :class:`TaskTable`.
+
+        The journal is replayed like in :meth:`load_tasks`, but the rows are
+        stored column-wise without building a ``Task`` per entry.
+        """
+        return TaskTable(self.load_task_data(tasks_file))
+
+    def load_task_data(self, tasks_file: str) -> List[Dict]:
+        """Return the task mappings of ``tasks_file`` with its journal replayed.
+
+        Unlike :meth:`load_tasks` keys that are not :class:`Task` fields,
+        such as ``metadata``, are kept.
+        """
         path = Path(tasks_file)
-        if not path.exists():
+        journal = self._journal(tasks_file)
+        if not path.exists() and not journal.path.exists():
             return []
-        with path.open("r") as fh:
-            tasks_data = yaml.safe_load(fh) or []
-        validate(instance=tasks_data, schema=TASK_SCHEMA)
-        fields = set(Task.__dataclass_fields__.keys())
-        tasks = [Task(**{k: v for k, v in item.items() if k in fields}) for item in tasks_data]
-        return tasks
+        tasks_data = []
+        if path.exists():
+            tasks_data = load_task_file(path, TASK_SCHEMA)
+            self._validator.mark_valid(tasks_data)
+        return journal.replay(tasks_data)
 
     def save_tasks(self, tasks: List[Task], tasks_file: str) -> None:
-        """Write list of :class:`Task` to ``tasks_file`` in YAML format."""
-        tasks_data = [{k: v for k, v in asdict(t).items() if v is not None} for t in tasks]
-        validate(instance=tasks_data, schema=TASK_SCHEMA)
+        """Write list of :class:`Task` to ``tasks_file`` in YAML format.
+
+        The file is replaced atomically and the journal is truncated, which
+        makes this the compaction step for journaled changes.
+        """
+        self.save_task_data([self._task_data(t) for t in tasks], tasks_file)
+
+    def save_task_data(self, tasks_data: List[Dict], tasks_file: str) -> None:
+        """Write the task mappings ``tasks_data`` like :meth:`save_tasks`."""
+        self._validator.validate(tasks_data)
         path = Path(tasks_file)
-        with path.open("w") as fh:
-            yaml.safe_dump(tasks_data, fh, sort_keys=False)
+        text = dump_yaml(tasks_data)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with tmp_path.open("w") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+        remember_task_file(path, text, tasks_data, TASK_SCHEMA)
+        self._journal(tasks_file).reset()
+
+    def record_status(self, task: Task, tasks: List[Task], tasks_file: str) -> None:
+        """Journal the current status of ``task`` instead of rewriting the file.
+
+        ``tasks`` is the full backlog; it is written out when the journal
+        grows beyond ``compact_every`` entries.
+        """
+        self._validator.validate_items([self._task_data(task)])
+        journal = self._journal(tasks_file)
+        journal.record_status(task.id, task.status)
+        self._maybe_compact(journal, tasks, tasks_file)
+
+    def record_tasks(self, new_tasks: List[Task], tasks: List[Task], tasks_file: str) -> None:
+        """Journal the addition of ``new_tasks`` to the backlog ``tasks``."""
+        tasks_data = [self._task_data(t) for t in new_tasks]
+        self._validator.validate_items(tasks_data)
+        journal = self._journal(tasks_file)
+        for item in tasks_data:
+            journal.record_added(item)
+        self._maybe_compact(journal, tasks, tasks_file)
+
+    def compact_tasks(self, tasks: List[Task], tasks_file: str) -> None:
+        """Fold pending journal entries back into ``tasks_file``."""
+        if len(self._journal(tasks_file)):
+            self.save_tasks(tasks, tasks_file)
+
+    # ------------------------------------------------------------------
+    def _journal(self, tasks_file: str) -> TaskJournal:
+        key = Path(tasks_file)
+        if key not in self._journals:
+            self._journals[key] = TaskJournal.for_tasks_file(key)
+        return self._journals[key]
+
+    def _maybe_compact(self, journal: TaskJournal, tasks: List[Task], tasks_file: str) -> None:
+        if len(journal) >= self.compact_every:
+            self.save_tasks(tasks, tasks_file)
+
+    @staticmethod
+    def _task_data(task) -> Dict:
+        # ``TaskTable`` rows are mappings and keep keys such as ``metadata``.
+        items = task.items() if isinstance(task, Mapping) else asdict(task).items()
+        return {k: v for k, v in items if v is not None}
@@ -0,0 +1,101 @@
+"""Per-file metric history kept by :class:`core.self_auditor.SelfAuditor`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import cache_dir
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS metric_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        path TEXT NOT NULL,
+        revision TEXT,
+        digest TEXT NOT NULL,
+        complexity REAL NOT NULL,
+        mi REAL NOT NULL,
+        recorded_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_metric_history_path ON metric_history (path, id)",
+]
+
+# (path, revision, digest, complexity, mi)
+Entry = Tuple[str, Optional[str], str, float, float]
+
+
+class MetricHistory:
+    """Append-only store of complexity and maintainability per file version.
+
+    A row is appended whenever a file's content digest differs from its most
+    recent row, so the store grows with actual changes rather than with the
+    number of audits. :meth:`history` compares the two latest rows of a file
+    through the ``(path, id)`` index and returns the same keys the auditor
+    used to read from wily.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self.db_path = Path(db_path) if db_path is not None else cache_dir("history") / "metrics.sqlite3"
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._conn:
+            for statement in SCHEMA_STATEMENTS:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    def record(self, entries: Iterable[Entry]) -> int:
+        """Append ``entries`` whose digest differs from the file's latest row.
+
+        Returns the number of rows written.
+        """
+        now = time.time()
+        rows = []
+        for path, revision, digest, complexity, mi in entries:
+            latest = self._latest(path, 1)
+            if latest and latest[0][0] == digest:
+                continue
+            rows.append((path, revision, digest, complexity, mi, now))
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO metric_history (path, revision, digest, complexity, mi, recorded_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def known(self, path: str) -> bool:
+        """Return ``True`` if ``path`` has at least one recorded version."""
+        return bool(self._latest(path, 1))
+
+    def history(self, path: str) -> Dict:
+        """Return the change between the two latest versions of ``path``.
+
+        An empty dict is returned until two versions have been recorded.
+        """
+        latest = self._latest(path, 2)
+        if len(latest) < 2:
+            return {}
+        (_, current_complexity, current_mi), (_, prev_complexity, prev_mi) = latest
+        return {
+            "previous_complexity": prev_complexity,
+            "current_complexity": current_complexity,
+            "delta_complexity": current_complexity - prev_complexity,
+            "previous_mi": prev_mi,
+            "current_mi": current_mi,
+            "delta_mi": current_mi - prev_mi,
+        }
+
+    # ------------------------------------------------------------------
+    def _latest(self, path: str, limit: int) -> List[Tuple]:
+        return self._conn.execute(
+            "SELECT digest, complexity, mi FROM metric_history WHERE path = ? ORDER BY id DESC LIMIT ?",
+            (path, limit),
+        ).fetchall()
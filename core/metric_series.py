@@ -0,0 +1,114 @@
+"""Time series of reflection cycle summaries with rolling-window aggregates."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import time
+from typing import Dict, NamedTuple, Optional
+
+COLUMNS = (
+    "avg_complexity",
+    "max_complexity",
+    "files_needing_refactor",
+    "total_tasks",
+    "done_tasks",
+    "pending_tasks",
+    "completion_rate",
+)
+
+SCHEMA_STATEMENTS = [
+    "CREATE TABLE IF NOT EXISTS cycle_samples (seq INTEGER PRIMARY KEY, ts REAL NOT NULL, "
+    + ", ".join(f"{name} REAL NOT NULL, sum_{name} REAL NOT NULL" for name in COLUMNS)
+    + ")",
+    "CREATE INDEX IF NOT EXISTS idx_cycle_samples_ts ON cycle_samples (ts, seq)",
+]
+
+
+class WindowStats(NamedTuple):
+    """Aggregates of the samples inside one time window."""
+
+    count: int
+    means: Dict[str, float]
+    first: Dict[str, float]
+    last: Dict[str, float]
+
+
+class MetricSeries:
+    """Append-only store of per-cycle summaries.
+
+    Every row carries running sums of all columns, so the mean of any column
+    over a window is the difference of two rows' sums divided by the
+    difference of their sequence numbers. A window query therefore costs
+    three indexed lookups no matter how many samples it covers.
+
+    Timestamps are clamped on insert so they never decrease, which keeps
+    time order and sequence order identical even when the clock steps
+    backwards. The database is opened on first use and only created by
+    :meth:`append`.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def close(self) -> None:
+        """Close the database connection if it was opened."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    def append(self, sample: Dict[str, float], ts: Optional[float] = None) -> None:
+        """Append ``sample``; missing columns are stored as ``0``."""
+        ts = time.time() if ts is None else ts
+        conn = self._connect(create=True)
+        previous = conn.execute("SELECT * FROM cycle_samples ORDER BY seq DESC LIMIT 1").fetchone()
+        if previous is not None:
+            ts = max(ts, previous["ts"])
+        values = [float(sample.get(name, 0) or 0) for name in COLUMNS]
+        sums = [value + (previous[f"sum_{name}"] if previous else 0.0) for name, value in zip(COLUMNS, values)]
+        columns = ", ".join(f"{name}, sum_{name}" for name in COLUMNS)
+        placeholders = ", ".join("?" for _ in range(2 * len(COLUMNS) + 1))
+        params = [ts] + [item for pair in zip(values, sums) for item in pair]
+        with conn:
+            conn.execute(f"INSERT INTO cycle_samples (ts, {columns}) VALUES ({placeholders})", params)
+
+    def window(self, seconds: float, end: Optional[float] = None) -> Optional[WindowStats]:
+        """Return aggregates of the samples with ``end - seconds < ts <= end``."""
+        conn = self._connect(create=False)
+        if conn is None:
+            return None
+        end = time.time() if end is None else end
+        start = end - seconds
+        last = conn.execute(
+            "SELECT * FROM cycle_samples WHERE ts <= ? ORDER BY ts DESC, seq DESC LIMIT 1", (end,)
+        ).fetchone()
+        first = conn.execute(
+            "SELECT * FROM cycle_samples WHERE ts > ? ORDER BY ts, seq LIMIT 1", (start,)
+        ).fetchone()
+        if last is None or first is None or first["seq"] > last["seq"]:
+            return None
+        count = last["seq"] - first["seq"] + 1
+        means = {
+            name: (last[f"sum_{name}"] - first[f"sum_{name}"] + first[name]) / count for name in COLUMNS
+        }
+        return WindowStats(count, means, self._values(first), self._values(last))
+
+    # ------------------------------------------------------------------
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if not create and not self.db_path.exists():
+                return None
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            with self._conn:
+                for statement in SCHEMA_STATEMENTS:
+                    self._conn.execute(statement)
+        return self._conn
+
+    @staticmethod
+    def _values(row: sqlite3.Row) -> Dict[str, float]:
+        values = {name: row[name] for name in COLUMNS}
+        values["ts"] = row["ts"]
+        return values
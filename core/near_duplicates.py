@@ -0,0 +1,153 @@
+"""Near-duplicate detection for short texts with MinHash and LSH."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import hashlib
+import re
+import struct
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[\w./]*\w")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?\Z")
+
+# Larger than every 32-bit hash; the signature of an empty set.
+_EMPTY = 1 << 32
+
+
+def shingles(text: str, size: int = 2) -> FrozenSet[str]:
+    """Return the word ``size``-grams of ``text``.
+
+    Text is lowercased and numbers are replaced by ``#`` so that tasks which
+    only differ in counts or scores share their shingles. Texts shorter than
+    ``size`` words yield a single shingle.
+    """
+    tokens = ["#" if _NUMBER.match(token) else token for token in _TOKEN.findall(text.lower())]
+    if len(tokens) <= size:
+        return frozenset([" ".join(tokens)]) if tokens else frozenset()
+    return frozenset(" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Return the Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(items: FrozenSet[str], num_perm: int = 64, seed: int = 1) -> Tuple[int, ...]:
+    """Return the MinHash signature of ``items``.
+
+    Position ``i`` holds the minimum over ``items`` of the ``i``-th 32-bit
+    word of a seeded SHAKE-128 digest, so every position uses an independent
+    hash function and all of them come from a single digest per item. The
+    probability that two signatures agree at a position equals the Jaccard
+    similarity of the sets.
+    """
+    if not items:
+        return (_EMPTY,) * num_perm
+    salt = seed.to_bytes(8, "little")
+    unpack = struct.Struct(f"<{num_perm}I").unpack
+    columns = [unpack(hashlib.shake_128(salt + item.encode("utf-8")).digest(4 * num_perm)) for item in items]
+    return tuple(map(min, zip(*columns)))
+
+
+@lru_cache(maxsize=65536)
+def _signature(text: str, size: int, num_perm: int, seed: int) -> Tuple[FrozenSet[str], Tuple[int, ...]]:
+    items = shingles(text, size)
+    return items, minhash(items, num_perm, seed)
+
+
+class NearDuplicateIndex:
+    """Cluster texts whose shingle sets are at least ``threshold`` similar.
+
+    Each text's MinHash signature is cut into ``bands`` bands; texts sharing
+    a band land in the same bucket and only those candidate pairs are
+    compared exactly. Texts with identical shingles are merged directly
+    without consulting the buckets. Adding a text therefore costs time
+    proportional to its length plus the few candidates it collides with,
+    and indexing a backlog is roughly linear in its size. Texts with
+    different ``group`` values are never compared.
+
+    With the defaults (64 permutations in 16 bands of 4 rows) pairs at a
+    similarity of 0.6 become candidates with a probability of about 0.9, and
+    pairs at 0.8 almost always do.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 2,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self._rows = num_perm // bands
+        self._keys: List[Hashable] = []
+        self._shingles: List[FrozenSet[str]] = []
+        self._parent: List[int] = []
+        self._exact: Dict[Tuple[Hashable, FrozenSet[str]], int] = {}
+        self._buckets: Dict[Tuple, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ------------------------------------------------------------------
+    def add(self, key: Hashable, text: str, group: Optional[Hashable] = None) -> None:
+        """Index ``text`` under ``key``; empty texts are ignored."""
+        items, signature = _signature(text, self.shingle_size, self.num_perm, self.seed)
+        if not items:
+            return
+        index = len(self._keys)
+        self._keys.append(key)
+        self._shingles.append(items)
+        self._parent.append(index)
+
+        same = self._exact.get((group, items))
+        if same is not None:
+            self._union(same, index)
+            return
+        self._exact[(group, items)] = index
+
+        rows = self._rows
+        checked = set()
+        for band in range(self.bands):
+            bucket = self._buckets.setdefault((group, band, signature[band * rows:(band + 1) * rows]), [])
+            for other in bucket:
+                if other in checked:
+                    continue
+                checked.add(other)
+                if self._find(other) != self._find(index) and jaccard(items, self._shingles[other]) >= self.threshold:
+                    self._union(other, index)
+            bucket.append(index)
+
+    def clusters(self) -> List[List[Hashable]]:
+        """Return the keys of every cluster with more than one member.
+
+        Clusters are ordered by their first member and list keys in the
+        order they were added.
+        """
+        groups: Dict[int, List[Hashable]] = {}
+        for index, key in enumerate(self._keys):
+            groups.setdefault(self._find(index), []).append(key)
+        return [members for members in groups.values() if len(members) > 1]
+
+    # ------------------------------------------------------------------
+    def _find(self, index: int) -> int:
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, a: int, b: int) -> None:
+        a, b = self._find(a), self._find(b)
+        if a != b:
+            self._parent[max(a, b)] = min(a, b)
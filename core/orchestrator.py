@@ -1,94 +1,244 @@
 """High-level coordinator for planner, executor and auditor."""
 
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import time
+from typing import List, Optional
 from opentelemetry import metrics, trace
 
-from .task import Task
+from .executor import CommandOutput
+from .task_table import TaskTable, TaskView
 
 
 
 class Orchestrator:
     """Coordinate the self-improving loop of planning and execution."""
 
-    def __init__(self, planner, executor, reflector, memory, auditor):
-        """Store dependencies for later use."""
+    def __init__(self, planner, executor, reflector, memory, auditor, background_audit: bool = False):
+        """Store dependencies for later use.
+
+        With ``background_audit`` the self-audit after each task runs off the
+        critical path; its results are merged into the backlog once ready.
+        """
 
         self.planner = planner
         self.executor = executor
         self.reflector = reflector
         self.memory = memory
         self.auditor = auditor
+        self.background_audit = background_audit
+        self._audit_future = None
+        self._audit_requested = False
         meter = metrics.get_meter_provider().get_meter(__name__)
         self._runs = meter.create_counter(
             "orchestrator_runs_total", description="Number of orchestrator loops"
         )
+        self._makespan = meter.create_histogram(
+            "orchestrator_makespan_seconds", description="Wall-clock time to drain the backlog"
+        )
         self._tracer = trace.get_tracer(__name__)
 
     # ------------------------------------------------------------------
-    def _task_to_dict(self, task: Task) -> dict:
-        return {f: getattr(task, f) for f in Task.__dataclass_fields__ if hasattr(task, f)}
-
-    # ------------------------------------------------------------------
-    def _load_tasks(self, tasks_file: str) -> List[Task]:
-        tasks = self.memory.load_tasks(tasks_file)
-        return tasks or []
+    def _load_tasks(self, tasks_file: str) -> TaskTable:
+        tasks = self.memory.load_table(tasks_file)
+        return tasks if tasks is not None else TaskTable()
 
     # ------------------------------------------------------------------
-    def _reflect(self, tasks: List[Task], tasks_file: str) -> List[Task]:
-        reflected = self.reflector.run_cycle([self._task_to_dict(t) for t in tasks])
+    def _reflect(self, tasks: TaskTable, tasks_file: str) -> TaskTable:
+        # The table rows are passed as they are; the reflector returns the
+        # backlog followed by the tasks it created.
+        reflected = self.reflector.run_cycle(tasks)
         if reflected is None:
             return tasks
-        if reflected and isinstance(reflected[0], Task):
-            tasks = reflected
-        else:
-            fields = set(Task.__dataclass_fields__.keys())
-            tasks = [Task(**{k: v for k, v in item.items() if k in fields}) for item in reflected]
+        if reflected is not tasks:
+            tasks.extend(reflected[len(tasks):])
         self.memory.save_tasks(tasks, tasks_file)
         return tasks
 
     # ------------------------------------------------------------------
-    def _execute_task(self, task: Task, tasks: List[Task], tasks_file: str) -> None:
+    def _start_task(self, task: TaskView, tasks: TaskTable, tasks_file: str) -> None:
         if hasattr(task, "status"):
             task.status = "in_progress"
-            self.memory.save_tasks(tasks, tasks_file)
+            self.memory.record_status(task, tasks, tasks_file)
         else:
             print(f"Warning: Task '{getattr(task, 'id', 'N/A')}' has no 'status' attribute.")
 
         print(f"Orchestrator: Executing task '{getattr(task, 'id', 'N/A')}'.")
-        self.executor.execute(task)
 
+    # ------------------------------------------------------------------
+    def _finish_task(
+        self,
+        task: TaskView,
+        tasks: TaskTable,
+        tasks_file: str,
+        output: Optional[CommandOutput] = None,
+        error: Optional[Exception] = None,
+        audit: bool = True,
+    ) -> None:
+        """Record the outcome of ``task``.
+
+        A command that timed out or exited with a non-zero status, or an
+        ``error`` raised while executing the task, marks it ``"failed"``,
+        which keeps its dependents blocked; otherwise the task is ``"done"``.
+        With ``audit`` unset the caller runs :meth:`_audit` itself.
+        """
+        failure = None
+        if error is not None:
+            failure = f"execution raised {error!r}"
+        elif isinstance(output, CommandOutput) and (output.timed_out or output.returncode != 0):
+            reason = "timed out" if output.timed_out else f"exited with status {output.returncode}"
+            failure = f"command {reason}, see {output.log_file}"
+        status = "failed" if failure else "done"
         if hasattr(task, "status"):
-            task.status = "done"
-            self.memory.save_tasks(tasks, tasks_file)
+            task.status = status
+            self.memory.record_status(task, tasks, tasks_file)
         else:
             print(
-                f"Warning: Task '{getattr(task, 'id', 'N/A')}' has no 'status' attribute to mark as done."
+                f"Warning: Task '{getattr(task, 'id', 'N/A')}' has no 'status' attribute to mark as {status}."
             )
 
-        print(f"Orchestrator: Task '{getattr(task, 'id', 'N/A')}' completed.")
+        if failure:
+            print(f"Orchestrator: Task '{getattr(task, 'id', 'N/A')}' failed: {failure}.")
+        else:
+            print(f"Orchestrator: Task '{getattr(task, 'id', 'N/A')}' completed.")
 
-        audit_results = self.auditor.audit([self._task_to_dict(t) for t in tasks])
+        if audit:
+            self._audit(tasks, tasks_file)
+
+    # ------------------------------------------------------------------
+    def _audit(self, tasks: TaskTable, tasks_file: str) -> None:
+        if not self.background_audit:
+            audit_results = self.auditor.audit(tasks)
+            self._add_audit_tasks(audit_results, tasks, tasks_file)
+        elif self._audit_future is None:
+            self._audit_future = self.auditor.audit_async(list(tasks))
+        else:
+            self._audit_requested = True
+
+    # ------------------------------------------------------------------
+    def _add_audit_tasks(self, audit_results: List[dict], tasks: TaskTable, tasks_file: str) -> None:
         if audit_results:
-            fields = set(Task.__dataclass_fields__.keys())
-            new_tasks = [Task(**{k: v for k, v in item.items() if k in fields}) for item in audit_results]
-            tasks.extend(new_tasks)
-            self.memory.save_tasks(tasks, tasks_file)
-
-    def run(self, tasks_file: str = "tasks.yml") -> None:
-        """Run the orchestration loop."""
-        attrs = {"tasks.file": tasks_file}
-        with self._tracer.start_as_current_span("orchestrator.run", attributes=attrs):
-            tasks: List[Task] = self._load_tasks(tasks_file)
-            tasks = self._reflect(tasks, tasks_file)
+            start = len(tasks)
+            tasks.extend(audit_results)
+            self.memory.record_tasks(tasks[start:], tasks, tasks_file)
+
+    # ------------------------------------------------------------------
+    def _collect_audit(self, tasks: TaskTable, tasks_file: str, block: bool = False) -> bool:
+        """Merge a finished background audit into ``tasks``.
+
+        Returns ``True`` if an audit was collected. An audit requested while
+        another was running is submitted once the running one is merged, so
+        its task ids never collide with the merged tasks.
+        """
+        future = self._audit_future
+        if future is None or not (block or future.done()):
+            return False
+        self._audit_future = None
+        self._add_audit_tasks(future.result(), tasks, tasks_file)
+        if self._audit_requested:
+            self._audit_requested = False
+            self._audit_future = self.auditor.audit_async(list(tasks))
+        return True
+
+    # ------------------------------------------------------------------
+    def _execute_task(self, task: TaskView, tasks: TaskTable, tasks_file: str) -> None:
+        self._start_task(task, tasks, tasks_file)
+        try:
+            output = self.executor.execute(task)
+        except Exception as exc:
+            self._finish_task(task, tasks, tasks_file, error=exc)
+        else:
+            self._finish_task(task, tasks, tasks_file, output)
 
+    # ------------------------------------------------------------------
+    def _run_serial(self, tasks: TaskTable, tasks_file: str) -> None:
+        while True:
+            self._collect_audit(tasks, tasks_file)
+            next_task = self.planner.plan(tasks)
+            if next_task is None:
+                if self._collect_audit(tasks, tasks_file, block=True):
+                    continue
+                print("Orchestrator: No actionable tasks. Halting.")
+                break
+
+            print(f"Orchestrator: Task '{getattr(next_task, 'id', 'N/A')}' selected for execution.")
+            self._execute_task(next_task, tasks, tasks_file)
+            self._runs.add(1)
+
+    # ------------------------------------------------------------------
+    def _run_parallel(self, tasks: TaskTable, tasks_file: str, workers: int) -> None:
+        """Run ready tasks on a thread pool of ``workers`` threads.
+
+        Only as many ready tasks as there are idle workers are taken from the
+        scheduler and marked ``"in_progress"``; the rest stay pending until a
+        worker frees up. Completions are handled on the calling thread as
+        they arrive, so status updates, audits and saves never race with
+        each other and dependents become ready as soon as their last
+        dependency finishes. The self-audit runs once per batch of
+        completions, after the freed workers have been handed new tasks. A
+        task whose execution raises is marked ``"failed"`` and the remaining
+        tasks keep running.
+        """
+        running = {}
+        audit_due = False
+        with ThreadPoolExecutor(max_workers=workers) as pool:
             while True:
-                next_task = self.planner.plan(tasks)
-                if next_task is None:
+                scheduler = self.planner.scheduler(tasks)
+                for task in scheduler.pop_ready(workers - len(running)):
+                    print(f"Orchestrator: Task '{getattr(task, 'id', 'N/A')}' selected for execution.")
+                    self._start_task(task, tasks, tasks_file)
+                    running[pool.submit(self.executor.execute, task)] = task
+
+                if audit_due:
+                    # Tasks the audit adds are dispatched on the next pass.
+                    audit_due = False
+                    self._audit(tasks, tasks_file)
+                    continue
+
+                if not running:
+                    if self._collect_audit(tasks, tasks_file, block=True):
+                        continue
                     print("Orchestrator: No actionable tasks. Halting.")
                     break
 
-                print(f"Orchestrator: Task '{getattr(next_task, 'id', 'N/A')}' selected for execution.")
-                self._execute_task(next_task, tasks, tasks_file)
-                self._runs.add(1)
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as exc:
+                        self._finish_task(task, tasks, tasks_file, error=exc, audit=False)
+                    else:
+                        self._finish_task(task, tasks, tasks_file, output, audit=False)
+                    scheduler.update(task)
+                    self._runs.add(1)
+                audit_due = True
+                self._collect_audit(tasks, tasks_file)
+
+    def run(self, tasks_file: str = "tasks.yml", workers: int = 1) -> None:
+        """Run the orchestration loop.
+
+        Parameters
+        ----------
+        tasks_file:
+            YAML file holding the task backlog.
+        workers:
+            Number of tasks executed concurrently. With more than one worker
+            every ready task exposed by the planner is dispatched to a thread
+            pool and dependents are unlocked as soon as their dependencies
+            complete.
+        """
+        attrs = {"tasks.file": tasks_file, "orchestrator.workers": workers}
+        with self._tracer.start_as_current_span("orchestrator.run", attributes=attrs):
+            tasks = self._load_tasks(tasks_file)
+            tasks = self._reflect(tasks, tasks_file)
+
+            start_time = time.perf_counter()
+            if workers > 1:
+                self._run_parallel(tasks, tasks_file, workers)
+            else:
+                self._run_serial(tasks, tasks_file)
+            makespan = time.perf_counter() - start_time
+            self._makespan.record(makespan, attrs)
+            self.memory.compact_tasks(tasks, tasks_file)
 
-            print("Orchestrator: Run finished.")
+            print(f"Orchestrator: Run finished in {makespan:.2f}s.")
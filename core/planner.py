@@ -1,13 +1,59 @@
+from itertools import islice
 from typing import List, Optional
 from .task import Task
+from .scheduler import TaskScheduler
+from .task_table import TaskTable
 
 
 class Planner:
     """
     A class that plans the execution order of tasks.
     It prioritizes tasks based on their priority and dependencies.
+
+    The planner keeps a :class:`TaskScheduler` for the task list it was last
+    given. Repeated calls with the same list only register newly appended
+    tasks and pick up status changes incrementally instead of rescanning the
+    whole backlog. A :class:`TaskTable` reports the rows written since the
+    last call; a plain list is re-read in full before the planner concludes
+    that nothing is ready.
     """
 
+    def __init__(self) -> None:
+        self._tasks: Optional[List[Task]] = None
+        self._known = 0
+        self._revision = 0
+        self._scheduler: Optional[TaskScheduler] = None
+
+    def scheduler(self, tasks: List[Task]) -> TaskScheduler:
+        """Return a :class:`TaskScheduler` kept in sync with ``tasks``.
+
+        The scheduler is rebuilt when ``tasks`` is a different list or has
+        shrunk since the last call; tasks appended to the same list are
+        registered incrementally, as are rows of a :class:`TaskTable` written
+        since the last call.
+
+        Raises:
+            ValueError: If two tasks share the same id.
+        """
+        if self._scheduler is None or tasks is not self._tasks or len(tasks) < self._known:
+            self._scheduler = TaskScheduler(tasks)
+            self._tasks, self._known = tasks, len(tasks)
+            self._revision = getattr(tasks, "revision", 0)
+            return self._scheduler
+        if len(tasks) > self._known:
+            try:
+                for task in islice(tasks, self._known, None):
+                    self._scheduler.add(task)
+            except ValueError:
+                self._scheduler = None
+                raise
+            self._known = len(tasks)
+        if isinstance(tasks, TaskTable) and tasks.revision != self._revision:
+            for row in tasks.changed_rows(self._revision):
+                self._scheduler.update(tasks[row])
+            self._revision = tasks.revision
+        return self._scheduler
+
     def plan(self, tasks: List[Task]) -> Optional[Task]:
         """
         Determines the next task to execute based on priority and dependencies.
@@ -24,45 +70,10 @@ class Planner:
             executed (e.g., all tasks are done, or pending tasks have unmet
             dependencies).
         """
-        seen_ids = set()
-        for task in tasks:
-            task_id = getattr(task, 'id', None)
-            if task_id in seen_ids:
-                raise ValueError(f"Duplicate task id {task_id} detected")
-            if task_id is not None:
-                seen_ids.add(task_id)
-
-        # Filter tasks that are "pending"
-        pending_tasks = [task for task in tasks if hasattr(task, 'status') and task.status == "pending"]
-
-        if not pending_tasks:
-            return None
-
-        ready_tasks = []
-        for task in pending_tasks:
-            if not hasattr(task, 'dependencies') or not task.dependencies:
-                # Task has no dependencies
-                ready_tasks.append(task)
-                continue
-
-            dependencies_met = True
-            for dep_id in task.dependencies:
-                # Find the dependent task in the original list
-                dependent_task = next((t for t in tasks if hasattr(t, 'id') and t.id == dep_id), None)
-
-                # If a dependency is not found or not "done", it's not met
-                if not dependent_task or not hasattr(dependent_task, 'status') or dependent_task.status != "done":
-                    dependencies_met = False
-                    break
-
-            if dependencies_met:
-                ready_tasks.append(task)
-
-        if not ready_tasks:
-            return None
-
-        # Sort ready tasks by priority (highest first)
-        # Assumes tasks in ready_tasks have 'priority' attribute
-        ready_tasks.sort(key=lambda t: getattr(t, 'priority', 0), reverse=True)
-
-        return ready_tasks[0]
+        scheduler = self.scheduler(tasks)
+        task = scheduler.next_task()
+        if task is None and not isinstance(tasks, TaskTable):
+            # Plain lists do not report writes; re-read them before giving up.
+            scheduler.sync()
+            task = scheduler.next_task()
+        return task
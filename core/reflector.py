@@ -2,17 +2,44 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+import hashlib
+import json
 import logging
 from datetime import datetime
+import os
 from pathlib import Path
+import time
 from typing import Dict, List, Optional
 
+from jsonschema import ValidationError
+from opentelemetry import metrics
 import yaml
 
+from .analysis_scope import AnalysisScope, ScopeChanges
+from .backlog_analytics import BacklogAnalytics
+from .backlog_validation import ValidationReport
+from .cache import cache_dir
+from .file_index import shared_index
+from .memory import Memory
+from .metric_series import MetricSeries
 from .self_auditor import SelfAuditor
 from .observability import MetricsProvider
 
 
+ANALYSIS_PATTERNS = ["core/*.py", "tests/*.py", "*.py"]
+
+# Bump when the inputs or the decision logic of a cycle change, so that
+# decisions cached by an older version are not reused.
+_CYCLE_FORMAT = 3
+
+
+def _jsonable(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    return repr(value)
+
+
 class Reflector:
     """Run a reflection cycle to analyze and evolve the system."""
 
@@ -22,39 +49,157 @@ class Reflector:
         complexity_threshold: int = 15,
         analysis_paths: Optional[List[Path]] = None,
         metrics_provider: Optional["MetricsProvider"] = None,
+        workers: int = 1,
+        trend_window: float = 7 * 24 * 3600,
+        memory: Optional[Memory] = None,
     ) -> None:
         self.tasks_path = Path(tasks_path)
+        self.memory = memory if memory is not None else Memory(self.tasks_path.with_name("state.json"))
         self.complexity_threshold = complexity_threshold
+        self.self_auditor = SelfAuditor(complexity_threshold=complexity_threshold, workers=workers)
+        self.scope: Optional[AnalysisScope] = None
+        if analysis_paths is None:
+            self.scope = AnalysisScope(ANALYSIS_PATTERNS, name="reflector", namespace=self.self_auditor.namespace)
         self.analysis_paths = analysis_paths or self._discover_analysis_paths()
-        self.self_auditor = SelfAuditor(complexity_threshold=complexity_threshold)
         self.metrics_provider = metrics_provider
         self.logger = logging.getLogger(__name__)
+        key = hashlib.sha256(str(self.tasks_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        self.cycle_path = cache_dir("reflector") / f"cycle-{key}.json"
+        self.series = MetricSeries(cache_dir("reflector") / f"series-{key}.sqlite3")
+        self.trend_window = trend_window
+
+        meter = metrics.get_meter_provider().get_meter(__name__)
+        self._cycles = meter.create_counter(
+            "reflector_cycles_total", description="Reflection cycles by outcome"
+        )
+        self._cycle_duration = meter.create_histogram(
+            "reflector_cycle_seconds", description="Duration of reflection cycles"
+        )
 
     # ------------------------------------------------------------------
     def run_cycle(self, tasks: Optional[List[Dict]] = None) -> List[Dict]:
-        """Execute a full reflection cycle and persist any new tasks."""
+        """Execute a full reflection cycle and persist any new tasks.
+
+        When the fingerprint of the cycle's inputs matches the previous
+        cycle, analysis, decision making and execution are skipped and the
+        tasks created by the previous cycle are returned again without being
+        saved a second time. Cycles are counted in
+        ``reflector_cycles_total`` with ``reflector.cycle`` set to
+        ``"cached"`` or ``"fresh"``. A fresh cycle summarizes the backlog once
+        into a :class:`~core.backlog_analytics.BacklogAnalytics` shared by
+        analysis, every decision rule and validation.
+        """
 
         self.logger.info("Starting reflection cycle")
+        start = time.perf_counter()
 
         if tasks is None:
             tasks = self._load_tasks()
 
-        analysis_results = self.analyze()
-        decisions = self.decide(analysis_results, tasks)
-        new_tasks = self.execute(decisions, tasks)
+        changes = self.scope.changes() if self.scope is not None else None
+        observability = self.metrics_provider.collect() if self.metrics_provider else None
+        fingerprint = self.fingerprint(tasks, changes, observability)
+        previous = self._load_cycle()
+        unchanged = changes is None or not (changes.changed or changes.removed)
+        if unchanged and previous.get("fingerprint") == fingerprint:
+            self.logger.info("Inputs unchanged since the last cycle; reusing its result")
+            if self.scope is not None:
+                self.scope.merge({})
+            new_tasks = previous["tasks"]
+            outcome = "cached"
+        else:
+            backlog = BacklogAnalytics(tasks)
+            analysis_results = self.analyze(changes, backlog, observability)
+            decisions = self.decide(analysis_results, tasks, backlog)
+            new_tasks = self._apply(decisions, tasks, backlog)
+            self._store_cycle(fingerprint, new_tasks)
+            outcome = "fresh"
+        result = list(tasks) + new_tasks
+
+        attrs = {"reflector.cycle": outcome}
+        self._cycles.add(1, attrs)
+        self._cycle_duration.record(time.perf_counter() - start, attrs)
+        return result
+
+    # ------------------------------------------------------------------
+    def _apply(self, decisions: Dict, tasks: List[Dict], backlog: BacklogAnalytics) -> List[Dict]:
+        """Execute ``decisions``, save the grown backlog and return the new tasks."""
+        new_tasks = self.execute(decisions, tasks, backlog)
 
         if new_tasks:
-            updated_tasks = tasks + new_tasks
-            self.validate(updated_tasks)
+            updated_tasks = list(tasks) + new_tasks
+            backlog.extend(new_tasks)
+            self.validate(updated_tasks, backlog.validation)
             self._save_tasks(updated_tasks)
             self.logger.info("Reflection cycle completed: %d new tasks", len(new_tasks))
         else:
             self.logger.info("Reflection cycle completed: no new tasks generated")
 
-        return tasks + new_tasks
+        return new_tasks
+
+    # ------------------------------------------------------------------
+    def fingerprint(
+        self,
+        tasks: List[Dict],
+        changes: Optional[ScopeChanges] = None,
+        observability: Optional[Dict] = None,
+    ) -> str:
+        """Return a digest of everything a cycle's decisions depend on.
+
+        Covers the content of the analyzed files, the backlog, the
+        observability metrics snapshot and the thresholds. ``observability``
+        is collected from the metrics provider when omitted.
+        """
+        if observability is None and self.metrics_provider:
+            observability = self.metrics_provider.collect()
+        digest = hashlib.sha256()
+        inputs = {
+            "format": _CYCLE_FORMAT,
+            "thresholds": [self.complexity_threshold, self.self_auditor.maintainability_threshold],
+            "files": self._file_digests(changes),
+            "metrics": observability,
+        }
+        digest.update(json.dumps(inputs, sort_keys=True, default=_jsonable).encode("utf-8"))
+        for task in tasks:
+            digest.update(json.dumps(task, sort_keys=True, default=_jsonable).encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
 
     # ------------------------------------------------------------------
-    def analyze(self) -> Dict:
+    def analyze(
+        self,
+        changes: Optional[ScopeChanges] = None,
+        backlog: Optional[BacklogAnalytics] = None,
+        observability: Optional[Dict] = None,
+    ) -> Dict:
+        try:
+            if self.scope is not None:
+                if changes is None:
+                    changes = self.scope.changes()
+                self.analysis_paths = changes.files
+                code_metrics = self.scope.merge(self.self_auditor.analyze(changes.changed))
+            else:
+                code_metrics = self.self_auditor.analyze(self.analysis_paths)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.logger.error("Code analysis failed: %s", exc)
+            return self.build_analysis(error=str(exc), observability=observability)
+        return self.build_analysis(code_metrics, backlog=backlog, observability=observability)
+
+    # ------------------------------------------------------------------
+    def build_analysis(
+        self,
+        code_metrics: Optional[Dict[str, Dict]] = None,
+        error: Optional[str] = None,
+        backlog: Optional[BacklogAnalytics] = None,
+        observability: Optional[Dict] = None,
+    ) -> Dict:
+        """Return the analysis of a cycle from already computed per-file metrics.
+
+        When ``backlog`` is given the cycle's summary is appended to the
+        metric time series before the evolution trends are computed.
+        ``observability`` is a metrics snapshot already collected for this
+        cycle; the metrics provider is queried when it is omitted.
+        """
         analysis = {
             "timestamp": datetime.now().isoformat(),
             "code_metrics": {},
@@ -63,24 +208,46 @@ class Reflector:
             "strategic_insights": [],
         }
 
-        try:
-            code_metrics = self.self_auditor.analyze(self.analysis_paths)
-            analysis["code_metrics"] = self._summarize_code_metrics(code_metrics)
-        except Exception as exc:  # pragma: no cover - defensive
-            self.logger.error("Code analysis failed: %s", exc)
-            analysis["code_metrics"] = {"error": str(exc)}
+        if error is not None:
+            analysis["code_metrics"] = {"error": error}
+        else:
+            analysis["code_metrics"] = self._summarize_code_metrics(code_metrics or {})
+            if backlog is not None:
+                self._record_cycle(analysis["code_metrics"], backlog)
 
         analysis["system_health"] = self._analyze_system_health()
         analysis["evolution_trends"] = self._analyze_evolution_trends()
         analysis["strategic_insights"] = self._generate_strategic_insights(analysis)
 
-        if self.metrics_provider:
+        if observability is not None:
+            analysis["observability_metrics"] = observability
+        elif self.metrics_provider:
             analysis["observability_metrics"] = self.metrics_provider.collect()
 
         return analysis
 
     # ------------------------------------------------------------------
-    def decide(self, analysis_results: Dict, current_tasks: List[Dict]) -> Dict:
+    def reflect(self, code_metrics: Dict[str, Dict], tasks: Optional[List[Dict]] = None) -> List[Dict]:
+        """Decide on and persist new tasks for already computed per-file metrics.
+
+        Used by callers that keep their own analysis state, such as
+        :class:`core.reflector_daemon.ReflectorDaemon`.
+        """
+        if tasks is None:
+            tasks = self._load_tasks()
+        backlog = BacklogAnalytics(tasks)
+        decisions = self.decide(self.build_analysis(code_metrics, backlog=backlog), tasks, backlog)
+        return list(tasks) + self._apply(decisions, tasks, backlog)
+
+    # ------------------------------------------------------------------
+    def decide(
+        self, analysis_results: Dict, current_tasks: List[Dict], backlog: Optional[BacklogAnalytics] = None
+    ) -> Dict:
+        """Return the decisions for ``analysis_results`` and the current backlog.
+
+        Decision rules read the aggregates of ``backlog`` (built from
+        ``current_tasks`` when omitted) instead of scanning the tasks.
+        """
         decisions = {
             "refactor_tasks": [],
             "architectural_improvements": [],
@@ -89,22 +256,24 @@ class Reflector:
             "process_improvements": [],
         }
 
-        task_analysis = self._analyze_task_backlog(current_tasks)
+        if backlog is None:
+            backlog = BacklogAnalytics(current_tasks)
+        task_analysis = backlog.task_analysis()
 
         code_metrics = analysis_results.get("code_metrics", {})
         if code_metrics.get("needs_attention"):
-            refactor_decisions = self._decide_refactoring_priorities(code_metrics, current_tasks)
+            refactor_decisions = self._decide_refactoring_priorities(code_metrics, task_analysis)
             decisions["refactor_tasks"].extend(refactor_decisions)
 
         system_health = analysis_results.get("system_health", {})
         if system_health.get("architectural_issues"):
-            arch = self._decide_architectural_improvements(system_health, current_tasks)
+            arch = self._decide_architectural_improvements(system_health, task_analysis)
             decisions["architectural_improvements"].extend(arch)
 
         debt_decisions = self._decide_technical_debt_priorities(analysis_results, task_analysis)
         decisions["technical_debt_priorities"].extend(debt_decisions)
 
-        capability_decisions = self._decide_new_capabilities(analysis_results, current_tasks)
+        capability_decisions = self._decide_new_capabilities(analysis_results, task_analysis)
         decisions["new_capabilities"].extend(capability_decisions)
 
         process_decisions = self._decide_process_improvements(task_analysis, analysis_results)
@@ -114,83 +283,126 @@ class Reflector:
         return decisions
 
     # ------------------------------------------------------------------
-    def execute(self, decisions: Dict, current_tasks: List[Dict]) -> List[Dict]:
+    def execute(
+        self, decisions: Dict, current_tasks: List[Dict], backlog: Optional[BacklogAnalytics] = None
+    ) -> List[Dict]:
+        """Return the tasks created for ``decisions``.
+
+        A decision is skipped while a task generated for a decision of the
+        same type is still open, so reflecting repeatedly on an unchanged
+        backlog does not pile up copies of the same task.
+        """
+        if backlog is None:
+            backlog = BacklogAnalytics(current_tasks)
+        open_decisions = set(backlog.open_decisions)
         new_tasks: List[Dict] = []
         next_id = max([task.get("id", 0) for task in current_tasks], default=0) + 1
 
-        for ref in decisions["refactor_tasks"]:
-            new_tasks.append(self._create_refactor_task(ref, next_id))
-            next_id += 1
-        for arch in decisions["architectural_improvements"]:
-            new_tasks.append(self._create_architectural_task(arch, next_id))
-            next_id += 1
-        for debt in decisions["technical_debt_priorities"]:
-            new_tasks.append(self._create_debt_task(debt, next_id))
-            next_id += 1
-        for cap in decisions["new_capabilities"]:
-            new_tasks.append(self._create_capability_task(cap, next_id))
-            next_id += 1
-        for proc in decisions["process_improvements"]:
-            new_tasks.append(self._create_process_task(proc, next_id))
-            next_id += 1
+        creators = (
+            ("refactor_tasks", self._create_refactor_task),
+            ("architectural_improvements", self._create_architectural_task),
+            ("technical_debt_priorities", self._create_debt_task),
+            ("new_capabilities", self._create_capability_task),
+            ("process_improvements", self._create_process_task),
+        )
+        for category, create in creators:
+            for decision in decisions[category]:
+                if decision["type"] in open_decisions:
+                    self.logger.debug("Skipping %s decision; a generated task is still open", decision["type"])
+                    continue
+                open_decisions.add(decision["type"])
+                new_tasks.append(create(decision, next_id))
+                next_id += 1
 
         return new_tasks
 
     # ------------------------------------------------------------------
-    def validate(self, tasks: List[Dict]) -> bool:
-        task_ids = [task.get("id") for task in tasks if "id" in task]
-        if len(task_ids) != len(set(task_ids)):
-            dup = [i for i in task_ids if task_ids.count(i) > 1]
-            raise ValueError(f"Duplicate task IDs found: {dup}")
-
-        refactor_tasks = [t for t in tasks if "refactor" in t.get("description", "").lower()]
-        refactor_files: Dict[str, Dict] = {}
-        for task in refactor_tasks:
-            desc = task.get("description", "")
-            parts = desc.split()
-            if len(parts) >= 2 and parts[1].endswith(".py"):
-                filepath = parts[1]
-                if filepath in refactor_files and task.get("status") == refactor_files[filepath].get("status") == "pending":
-                    self.logger.warning(
-                        "Potential duplicate refactor task for %s: tasks %s and %s",
-                        filepath,
-                        task.get("id"),
-                        refactor_files[filepath].get("id"),
-                    )
-                else:
-                    refactor_files[filepath] = task
-
-        required = ["id", "description", "component", "dependencies", "priority", "status"]
-        for task in tasks:
-            missing = [f for f in required if f not in task]
-            if missing:
-                raise ValueError(f"Task {task.get('id', 'unknown')} missing fields: {missing}")
+    def validate(self, tasks: List[Dict], report: Optional[ValidationReport] = None) -> bool:
+        """Check ``tasks`` for consistency before they are saved.
+
+        Duplicate ids and missing required fields raise ``ValueError``;
+        duplicate pending refactors and dangling dependencies are logged.
+        ``report`` may be passed when it was already built for ``tasks``.
+        """
+        if report is None:
+            report = self.validation_report(tasks)
+        if report.duplicate_ids:
+            raise ValueError(f"Duplicate task IDs found: {report.duplicate_ids}")
+
+        for filepath, task_id, earlier_id in report.duplicate_refactors:
+            self.logger.warning(
+                "Potential duplicate refactor task for %s: tasks %s and %s", filepath, task_id, earlier_id
+            )
+        for task_id, dependency in report.dangling_dependencies:
+            self.logger.warning("Task %s depends on unknown task %s", task_id, dependency)
+
+        if report.missing_fields:
+            task_id, missing = report.missing_fields[0]
+            raise ValueError(f"Task {task_id} missing fields: {missing}")
 
         return True
 
+    # ------------------------------------------------------------------
+    def validation_report(self, tasks: List[Dict]) -> ValidationReport:
+        """Return every consistency problem of ``tasks`` in one report."""
+        return ValidationReport.build(tasks)
+
     # ------------------------------------------------------------------
     def _discover_analysis_paths(self) -> List[Path]:
-        paths = []
-        for pattern in ["core/*.py", "tests/*.py", "*.py"]:
-            paths.extend(Path(".").glob(pattern))
-        return [p for p in paths if p.is_file()]
+        if self.scope is not None:
+            return self.scope.discover()
+        return shared_index().glob(*ANALYSIS_PATTERNS)
+
+    # ------------------------------------------------------------------
+    def _file_digests(self, changes: Optional[ScopeChanges]) -> Dict[str, str]:
+        if self.scope is not None and changes is not None:
+            return self.scope.digests()
+        digests: Dict[str, str] = {}
+        for path in self.analysis_paths:
+            try:
+                digests[str(path)] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            except OSError:
+                continue
+        return digests
+
+    # ------------------------------------------------------------------
+    def _load_cycle(self) -> Dict:
+        try:
+            cycle = json.loads(self.cycle_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return cycle if isinstance(cycle, dict) else {}
+
+    def _store_cycle(self, fingerprint: str, new_tasks: List[Dict]) -> None:
+        tmp = self.cycle_path.with_name(f".{self.cycle_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(
+                json.dumps({"fingerprint": fingerprint, "tasks": new_tasks}, default=_jsonable),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.cycle_path)
+        except (OSError, TypeError, ValueError) as exc:
+            self.logger.warning("Could not store reflection cycle: %s", exc)
+            tmp.unlink(missing_ok=True)
 
     # ------------------------------------------------------------------
     def _load_tasks(self) -> List[Dict]:
         try:
-            with open(self.tasks_path, "r") as f:
-                return yaml.safe_load(f) or []
-        except FileNotFoundError:
-            self.logger.warning("Tasks file %s not found", self.tasks_path)
-            return []
+            tasks = self.memory.load_task_data(self.tasks_path)
         except yaml.YAMLError as exc:
             self.logger.error("Failed to parse tasks file: %s", exc)
             return []
+        except ValidationError as exc:
+            self.logger.error("Invalid task in %s: %s", self.tasks_path, exc.message)
+            return []
+        if not tasks and not self.tasks_path.exists():
+            self.logger.warning("Tasks file %s not found", self.tasks_path)
+        return tasks
 
     # ------------------------------------------------------------------
     def _save_tasks(self, tasks: List[Dict]) -> None:
-        with open(self.tasks_path, "w") as f:
-            yaml.dump(tasks, f, default_flow_style=False, sort_keys=False)
+        # Tasks may be read-only mappings such as ``TaskTable`` rows.
+        self.memory.save_task_data([dict(task) for task in tasks], self.tasks_path)
 
     # ------------------------------------------------------------------
     def _summarize_code_metrics(self, metrics: Dict) -> Dict:
@@ -240,12 +452,56 @@ class Reflector:
         }
 
     # ------------------------------------------------------------------
-    def _analyze_evolution_trends(self) -> Dict:
-        return {
-            "complexity_trend": "stable",
+    def _record_cycle(self, code_summary: Dict, backlog: BacklogAnalytics) -> None:
+        total = backlog.total
+        done = backlog.count("done")
+        self.series.append(
+            {
+                "avg_complexity": code_summary.get("avg_complexity", 0),
+                "max_complexity": code_summary.get("max_complexity", 0),
+                "files_needing_refactor": code_summary.get("files_needing_refactor", 0),
+                "total_tasks": total,
+                "done_tasks": done,
+                "pending_tasks": backlog.count("pending"),
+                "completion_rate": done / total if total else 0,
+            }
+        )
+
+    # ------------------------------------------------------------------
+    def _analyze_evolution_trends(self, now: Optional[float] = None) -> Dict:
+        """Summarize the last ``trend_window`` seconds of recorded cycles.
+
+        ``complexity_trend`` compares the mean average complexity with the
+        preceding window, ``feature_velocity`` is tasks completed per day
+        and ``task_completion_rate`` the mean share of done tasks.
+        """
+        now = time.time() if now is None else now
+        trends = {
+            "complexity_trend": "unknown",
             "task_completion_rate": "unknown",
             "feature_velocity": "unknown",
         }
+        current = self.series.window(self.trend_window, now)
+        if current is None:
+            return trends
+
+        trends["task_completion_rate"] = round(current.means["completion_rate"], 3)
+        elapsed = current.last["ts"] - current.first["ts"]
+        if elapsed > 0:
+            completed = current.last["done_tasks"] - current.first["done_tasks"]
+            trends["feature_velocity"] = round(completed / (elapsed / 86400), 2)
+
+        previous = self.series.window(self.trend_window, now - self.trend_window)
+        if previous is not None:
+            before = previous.means["avg_complexity"]
+            after = current.means["avg_complexity"]
+            if after > before * 1.05:
+                trends["complexity_trend"] = "increasing"
+            elif after < before * 0.95:
+                trends["complexity_trend"] = "decreasing"
+            else:
+                trends["complexity_trend"] = "stable"
+        return trends
 
     # ------------------------------------------------------------------
     def _generate_strategic_insights(self, analysis: Dict) -> List[str]:
@@ -263,50 +519,15 @@ class Reflector:
 
     # ------------------------------------------------------------------
     def _analyze_task_backlog(self, tasks: List[Dict]) -> Dict:
-        analysis = {
-            "total_tasks": len(tasks),
-            "pending_tasks": 0,
-            "in_progress_tasks": 0,
-            "done_tasks": 0,
-            "duplicate_tasks": [],
-            "priority_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
-        }
-
-        descriptions: Dict[str, int] = {}
-        for task in tasks:
-            status = task.get("status", "unknown")
-            if status == "pending":
-                analysis["pending_tasks"] += 1
-            elif status == "in_progress":
-                analysis["in_progress_tasks"] += 1
-            elif status == "done":
-                analysis["done_tasks"] += 1
-
-            priority = task.get("priority", 3)
-            if priority in analysis["priority_distribution"]:
-                analysis["priority_distribution"][priority] += 1
-
-            desc = task.get("description", "")
-            if desc in descriptions:
-                analysis["duplicate_tasks"].append({"description": desc, "task_ids": [descriptions[desc], task.get("id")]})
-            else:
-                descriptions[desc] = task.get("id")
-
-        return analysis
+        return BacklogAnalytics(tasks).task_analysis()
 
     # ------------------------------------------------------------------
-    def _decide_refactoring_priorities(self, code_metrics: Dict, current_tasks: List[Dict]) -> List[Dict]:
+    def _decide_refactoring_priorities(self, code_metrics: Dict, task_analysis: Dict) -> List[Dict]:
         decisions: List[Dict] = []
         if not code_metrics.get("needs_attention"):
             return decisions
 
-        pending_refactors = [
-            t
-            for t in current_tasks
-            if t.get("status") == "pending" and "refactor" in t.get("description", "").lower()
-        ]
-
-        if len(pending_refactors) > 5:
+        if task_analysis.get("pending_refactor_tasks", 0) > 5:
             decisions.append(
                 {
                     "type": "refactor_consolidation",
@@ -318,24 +539,27 @@ class Reflector:
         return decisions
 
     # ------------------------------------------------------------------
-    def _decide_architectural_improvements(self, system_health: Dict, current_tasks: List[Dict]) -> List[Dict]:
+    def _decide_architectural_improvements(self, system_health: Dict, task_analysis: Dict) -> List[Dict]:
         return []
 
     # ------------------------------------------------------------------
     def _decide_technical_debt_priorities(self, analysis: Dict, task_analysis: Dict) -> List[Dict]:
         decisions: List[Dict] = []
-        if task_analysis.get("duplicate_tasks"):
+        duplicates = task_analysis.get("duplicate_tasks", [])
+        near_duplicates = task_analysis.get("near_duplicate_tasks", [])
+        if duplicates or near_duplicates:
             decisions.append(
                 {
                     "type": "task_cleanup",
                     "reason": "Duplicate tasks detected",
-                    "duplicates": task_analysis["duplicate_tasks"],
+                    "duplicates": duplicates,
+                    "near_duplicates": near_duplicates,
                 }
             )
         return decisions
 
     # ------------------------------------------------------------------
-    def _decide_new_capabilities(self, analysis: Dict, current_tasks: List[Dict]) -> List[Dict]:
+    def _decide_new_capabilities(self, analysis: Dict, task_analysis: Dict) -> List[Dict]:
         return []
 
     # ------------------------------------------------------------------
@@ -379,7 +603,9 @@ class Reflector:
     def _create_debt_task(self, decision: Dict, task_id: int) -> Dict:
         description = f"Technical debt - {decision['reason']}"
         if decision["type"] == "task_cleanup":
-            dup_count = len(decision.get("duplicates", []))
+            dup_count = len(decision.get("duplicates", [])) + sum(
+                len(cluster["task_ids"]) - 1 for cluster in decision.get("near_duplicates", [])
+            )
             description = f"Clean up {dup_count} duplicate tasks"
 
         return {
@@ -0,0 +1,239 @@
+"""Long-running reflection driven by filesystem change notifications."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .file_index import glob_regex, shared_index
+from .reflector import ANALYSIS_PATTERNS, Reflector
+
+try:  # pragma: no cover - optional dependency
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - watchdog not installed
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forward watchdog events to :meth:`ReflectorDaemon.touch`."""
+
+    def __init__(self, daemon: "ReflectorDaemon") -> None:
+        super().__init__()
+        self.daemon = daemon
+
+    def on_any_event(self, event) -> None:  # pragma: no cover - needs watchdog
+        if event.is_directory:
+            return
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        self.daemon.touch(path for path in paths if path)
+
+
+class ReflectorDaemon:
+    """Keep per-file metrics in memory and reflect whenever files change.
+
+    Change notifications come from :mod:`watchdog` (inotify, FSEvents, ...)
+    when it is installed and from a polling loop over the shared
+    :class:`~core.file_index.FileIndex` otherwise. Notifications are
+    debounced: a batch is processed once no new change has arrived for
+    ``debounce`` seconds. Only the touched files are analyzed again; their
+    metrics are merged into the in-memory state before the reflector decides
+    on new tasks, so no full cycle is needed.
+    """
+
+    def __init__(
+        self,
+        reflector: Reflector,
+        root: Path = Path("."),
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+        use_watchdog: bool = True,
+    ) -> None:
+        self.reflector = reflector
+        self.root = Path(root)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_watchdog = use_watchdog and Observer is not None
+        self._patterns = [glob_regex(pattern) for pattern in self._scope_patterns()]
+        self._paths: Optional[Set[str]] = None
+        if reflector.scope is None:
+            self._paths = {self._key(Path(path)) for path in reflector.analysis_paths}
+        self.metrics: Dict[str, Dict] = {}
+        self._pending: Set[str] = set()
+        self._last_event = 0.0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer = None
+        self._poll_state: Dict[str, Tuple[int, int]] = {}
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Analyze the scope once and start watching for changes."""
+        self._initial_analysis()
+        if self.use_watchdog:
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), str(self.root), recursive=True)
+            self._observer.start()
+        else:
+            self._poll_state = self._stat_files()
+            self._spawn(self._poll_loop, "reflector-poll")
+        self._spawn(self._process_loop, "reflector-daemon")
+        logger.info("Reflector daemon watching %s (%s)", self.root, "watchdog" if self.use_watchdog else "polling")
+
+    def stop(self) -> None:
+        """Stop watching and wait for the worker threads to finish."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def run_forever(self) -> None:
+        """Run until interrupted."""
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # ------------------------------------------------------------------
+    def touch(self, paths: Iterable[str]) -> None:
+        """Record changed ``paths`` (absolute or relative to ``root``)."""
+        relevant = [rel for rel in (self._relative(path) for path in paths) if rel and self._in_scope(rel)]
+        if not relevant:
+            return
+        with self._cond:
+            self._pending.update(relevant)
+            self._last_event = time.monotonic()
+            self._cond.notify_all()
+
+    def process(self, paths: Iterable[str]) -> List[Dict]:
+        """Reanalyze ``paths`` (relative to ``root``) and reflect on the result."""
+        existing: List[Path] = []
+        for rel in sorted(set(paths)):
+            path = self.root / rel
+            if path.is_file():
+                existing.append(path)
+            else:
+                self.metrics.pop(self._key(path), None)
+        fresh = self.reflector.self_auditor.analyze(existing) if existing else {}
+        for path in existing:
+            key = self._key(path)
+            self.metrics.pop(key, None)
+            if str(path) in fresh:
+                self.metrics[key] = fresh[str(path)]
+        logger.info("Reanalyzed %d changed files", len(existing))
+        return self.reflector.reflect(self.metrics)
+
+    # ------------------------------------------------------------------
+    def _initial_analysis(self) -> None:
+        scope = self.reflector.scope
+        if scope is not None:
+            changes = scope.changes()
+            metrics = scope.merge(self.reflector.self_auditor.analyze(changes.changed))
+        else:
+            metrics = self.reflector.self_auditor.analyze(self.reflector.analysis_paths)
+        self.metrics = {self._key(Path(key)): value for key, value in metrics.items()}
+
+    def _process_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                remaining = self._last_event + self.debounce - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                batch, self._pending = self._pending, set()
+            try:
+                self.process(batch)
+            except Exception as exc:  # pragma: no cover - keep the daemon alive
+                logger.error("Reflection after change failed: %s", exc)
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            state = self._stat_files()
+            changed = [rel for rel, stat in state.items() if self._poll_state.get(rel) != stat]
+            changed.extend(rel for rel in self._poll_state if rel not in state)
+            self._poll_state = state
+            if changed:
+                self.touch(changed)
+
+    def _stat_files(self) -> Dict[str, Tuple[int, int]]:
+        state: Dict[str, Tuple[int, int]] = {}
+        index = shared_index(self.root)
+        for path in index.files():
+            rel = path.relative_to(index.root).as_posix()
+            if not self._in_scope(rel):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            state[rel] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _relative(self, path: str) -> Optional[str]:
+        candidate = Path(path)
+        if candidate.is_absolute():
+            try:
+                candidate = candidate.relative_to(self.root.resolve())
+            except ValueError:
+                return None
+        return candidate.as_posix()
+
+    def _scope_patterns(self) -> List[str]:
+        if self.reflector.scope is not None:
+            return self.reflector.scope.patterns
+        return ANALYSIS_PATTERNS
+
+    def _in_scope(self, rel: str) -> bool:
+        if self._paths is not None:
+            return rel in self._paths
+        return any(regex.match(rel) for regex in self._patterns)
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entry point
+    parser = argparse.ArgumentParser(description="Reflect continuously as files change")
+    parser.add_argument("--tasks", default="tasks.yml", help="Tasks file to update")
+    parser.add_argument("--debounce", type=float, default=0.5, help="Quiet period before reflecting")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Polling period without watchdog")
+    parser.add_argument("--polling", action="store_true", help="Poll even if watchdog is installed")
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+    ReflectorDaemon(
+        Reflector(tasks_path=Path(args.tasks)),
+        debounce=args.debounce,
+        poll_interval=args.poll_interval,
+        use_watchdog=not args.polling,
+    ).run_forever()
@@ -0,0 +1,204 @@
+"""Content-addressed on-disk cache of task command results."""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from opentelemetry import metrics
+
+from .cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key derivation or the entry layout changes.
+_FORMAT = 2
+
+
+class ResultCache:
+    """Store the outcome of task commands keyed by everything they depend on.
+
+    The key of a command covers the command line, the working directory,
+    the resource limits it runs under, the values of the environment
+    variables in ``env`` and the SHA-256 of every file matching the task's
+    declared input patterns. Each entry is a
+    JSON metadata file plus a copy of the command's log, sharded by the
+    first two hex digits of the key.
+
+    The cache is bounded by ``max_bytes``: every lookup refreshes the
+    entry's modification time and, after each store, the least recently
+    used entries are deleted until the cache fits again. Lookups and
+    evictions are counted in ``task_result_cache_hits_total``,
+    ``task_result_cache_misses_total`` and
+    ``task_result_cache_evictions_total``.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        env: Sequence[str] = ("PATH",),
+    ) -> None:
+        self.root = Path(root) if root is not None else cache_dir("results")
+        self.max_bytes = max_bytes
+        self.env = sorted(env)
+        meter = metrics.get_meter_provider().get_meter(__name__)
+        self._hits = meter.create_counter(
+            "task_result_cache_hits_total", description="Task commands replayed from the cache"
+        )
+        self._misses = meter.create_counter(
+            "task_result_cache_misses_total", description="Task commands run because no result was cached"
+        )
+        self._evictions = meter.create_counter(
+            "task_result_cache_evictions_total", description="Cached task results evicted to respect the size bound"
+        )
+
+    # ------------------------------------------------------------------
+    def key(
+        self,
+        command: str,
+        inputs: Sequence[str],
+        cwd: Optional[Path] = None,
+        limits: Optional[Dict[str, object]] = None,
+    ) -> str:
+        """Return the cache key of ``command`` run in ``cwd`` with ``inputs``.
+
+        ``inputs`` are glob patterns relative to ``cwd`` or absolute; a
+        pattern matching nothing is part of the key as well, so creating a
+        file it names changes the key. ``limits`` holds the effective
+        timeout and rlimits, since they decide whether the command can
+        finish at all.
+
+        Raises
+        ------
+        ValueError
+            If a pattern is not a valid glob pattern.
+        """
+        cwd = Path(cwd) if cwd is not None else Path.cwd()
+        digest = hashlib.sha256()
+        header = {
+            "format": _FORMAT,
+            "command": command,
+            "cwd": str(cwd.resolve()),
+            "env": {name: os.environ.get(name) for name in self.env},
+            "limits": limits or {},
+        }
+        digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+        for pattern in sorted(set(inputs)):
+            digest.update(b"\0pattern\0" + pattern.encode("utf-8"))
+            for name, path in self._matches(pattern, cwd):
+                digest.update(b"\0file\0" + name.encode("utf-8") + b"\0")
+                digest.update(self._file_digest(path))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict, Path]]:
+        """Return the metadata and stored log of ``key``, or ``None``."""
+        meta_path, log_path = self._paths(key)
+        try:
+            with meta_path.open("r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            os.utime(meta_path)
+            os.utime(log_path)
+        except (OSError, ValueError):
+            self._misses.add(1)
+            return None
+        self._hits.add(1)
+        return meta, log_path
+
+    def put(self, key: str, meta: Dict, log_file: Path) -> None:
+        """Store ``meta`` and a copy of ``log_file`` under ``key``.
+
+        Entries larger than ``max_bytes`` are not stored; failures only
+        disable caching.
+        """
+        meta_path, log_path = self._paths(key)
+        log_tmp = log_path.with_name(f".{log_path.name}.{os.getpid()}.tmp")
+        meta_tmp = meta_path.with_name(f".{meta_path.name}.{os.getpid()}.tmp")
+        try:
+            encoded = json.dumps(meta, separators=(",", ":"))
+            if Path(log_file).stat().st_size + len(encoded) > self.max_bytes:
+                return
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(log_file, log_tmp)
+            os.replace(log_tmp, log_path)
+            meta_tmp.write_text(encoded, encoding="utf-8")
+            os.replace(meta_tmp, meta_path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.debug("Could not cache task result %s: %s", key, exc)
+            log_tmp.unlink(missing_ok=True)
+            meta_tmp.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits; return how many."""
+        entries: Dict[str, List] = {}
+        total = 0
+        for shard in self._shards():
+            try:
+                with os.scandir(shard) as files:
+                    for item in files:
+                        if item.name.startswith("."):
+                            continue
+                        stat = item.stat()
+                        stem = item.name.rsplit(".", 1)[0]
+                        entry = entries.setdefault(stem, [0, 0, []])
+                        entry[0] = max(entry[0], stat.st_mtime_ns)
+                        entry[1] += stat.st_size
+                        entry[2].append(item.path)
+                        total += stat.st_size
+            except OSError:
+                continue
+        evicted = 0
+        for _, size, paths in sorted(entries.values(), key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        if evicted:
+            self._evictions.add(evicted)
+        return evicted
+
+    # ------------------------------------------------------------------
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        shard = self.root / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.log"
+
+    def _shards(self) -> List[Path]:
+        try:
+            return [Path(entry.path) for entry in os.scandir(self.root) if entry.is_dir()]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _matches(pattern: str, cwd: Path) -> List[Tuple[str, Path]]:
+        if os.path.isabs(pattern):
+            paths = [Path(match) for match in glob.glob(pattern, recursive=True)]
+            return sorted((path.as_posix(), path) for path in paths if path.is_file())
+        try:
+            paths = list(cwd.glob(pattern))
+        except NotImplementedError as exc:
+            raise ValueError(f"Unsupported input pattern {pattern!r}: {exc}") from exc
+        return sorted((path.relative_to(cwd).as_posix(), path) for path in paths if path.is_file())
+
+    @staticmethod
+    def _file_digest(path: Path) -> bytes:
+        digest = hashlib.sha256()
+        try:
+            with path.open("rb") as fh:
+                for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return b"unreadable"
+        return digest.digest()
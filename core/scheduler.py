@@ -0,0 +1,199 @@
+"""Incremental dependency-aware scheduling of pending tasks."""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_ANONYMOUS = object()
+
+# Statuses after which a handed out task no longer needs watching.
+_TERMINAL = frozenset({"done", "failed"})
+
+
+class TaskScheduler:
+    """Keep track of ready tasks as task statuses change.
+
+    The scheduler indexes tasks by id, keeps a counter of unmet dependencies
+    for every task and a heap of ready tasks ordered by priority. A status
+    change only touches the task itself and its direct dependents, so
+    selecting the next task costs ``O(log n)`` regardless of backlog size.
+
+    Tasks handed out by :meth:`next_task` are tracked until they are done or
+    failed, so status changes made directly on those objects are picked up
+    lazily. Any other change of a status or of the dependencies must be
+    reported with :meth:`update`, or picked up with :meth:`sync`.
+    """
+
+    def __init__(self, tasks: Iterable[object] = ()) -> None:
+        self._tasks: Dict[Hashable, object] = {}
+        self._status: Dict[Hashable, Optional[str]] = {}
+        self._unmet: Dict[Hashable, int] = {}
+        self._deps: Dict[Hashable, Tuple[Hashable, ...]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._dependents: Dict[Hashable, List[Hashable]] = {}
+        self._ready: List[Tuple[float, int, Hashable]] = []
+        self._queued: Set[Hashable] = set()
+        self._outstanding: Set[Hashable] = set()
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    # ------------------------------------------------------------------
+    def _key(self, task: object) -> Hashable:
+        task_id = getattr(task, "id", None)
+        if task_id is None:
+            return (_ANONYMOUS, id(task))
+        return task_id
+
+    # ------------------------------------------------------------------
+    def add(self, task: object) -> None:
+        """Register ``task`` and queue it if it is ready.
+
+        Raises
+        ------
+        ValueError
+            If a task with the same id is already registered.
+        """
+        key = self._key(task)
+        if key in self._tasks:
+            raise ValueError(f"Duplicate task id {key} detected")
+
+        status = getattr(task, "status", None)
+        self._tasks[key] = task
+        self._order[key] = len(self._order)
+
+        self._deps[key] = ()
+        self._unmet[key] = 0
+        self._link(key, self._dependencies(task))
+        self._status[key] = status
+
+        if status == "done":
+            self._release(key)
+        self._push_if_ready(key)
+
+    # ------------------------------------------------------------------
+    def update(self, task: object) -> None:
+        """Re-read the status and dependencies of ``task`` after it was changed externally."""
+        key = self._key(task)
+        if key not in self._tasks:
+            self.add(task)
+            return
+        task = self._tasks[key]
+        dependencies = self._dependencies(task)
+        if dependencies != self._deps[key]:
+            for dep_id in self._deps[key]:
+                self._dependents[dep_id].remove(key)
+            self._link(key, dependencies)
+        self._set_status(key, getattr(task, "status", None))
+        self._push_if_ready(key)
+
+    # ------------------------------------------------------------------
+    def sync(self) -> None:
+        """Re-read every registered task; costs ``O(n)``."""
+        for task in list(self._tasks.values()):
+            self.update(task)
+
+    # ------------------------------------------------------------------
+    def next_task(self) -> Optional[object]:
+        """Return the highest priority ready task without removing it.
+
+        Among tasks with equal priority the one registered first wins. Returns
+        ``None`` when no pending task has all of its dependencies done.
+        """
+        self._sync_outstanding()
+        while self._ready:
+            key = self._ready[0][2]
+            status = getattr(self._tasks[key], "status", None)
+            if status != self._status[key]:
+                self._pop()
+                self._set_status(key, status)
+                continue
+            if self._is_ready(key):
+                self._outstanding.add(key)
+                return self._tasks[key]
+            self._pop()
+        return None
+
+    # ------------------------------------------------------------------
+    def pop_ready(self, limit: Optional[int] = None) -> List[object]:
+        """Remove and return ready tasks, highest priority first.
+
+        At most ``limit`` tasks are returned when it is given; the others
+        stay queued. Returned tasks are tracked like those handed out by
+        :meth:`next_task`; they are queued again only if their status returns
+        to ``"pending"``.
+        """
+        self._sync_outstanding()
+        ready: List[object] = []
+        while self._ready and (limit is None or len(ready) < limit):
+            key = self._pop()
+            status = getattr(self._tasks[key], "status", None)
+            if status != self._status[key]:
+                self._set_status(key, status)
+                continue
+            if self._is_ready(key):
+                self._outstanding.add(key)
+                ready.append(self._tasks[key])
+        return ready
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _dependencies(task: object) -> Tuple[Hashable, ...]:
+        return tuple(dict.fromkeys(getattr(task, "dependencies", None) or []))
+
+    # ------------------------------------------------------------------
+    def _link(self, key: Hashable, dependencies: Tuple[Hashable, ...]) -> None:
+        unmet = 0
+        for dep_id in dependencies:
+            self._dependents.setdefault(dep_id, []).append(key)
+            if self._status.get(dep_id) != "done":
+                unmet += 1
+        self._deps[key] = dependencies
+        self._unmet[key] = unmet
+
+    # ------------------------------------------------------------------
+    def _is_ready(self, key: Hashable) -> bool:
+        return self._status[key] == "pending" and self._unmet[key] == 0
+
+    # ------------------------------------------------------------------
+    def _push_if_ready(self, key: Hashable) -> None:
+        if key in self._queued or not self._is_ready(key):
+            return
+        priority = getattr(self._tasks[key], "priority", 0)
+        heapq.heappush(self._ready, (-priority, self._order[key], key))
+        self._queued.add(key)
+
+    # ------------------------------------------------------------------
+    def _pop(self) -> Hashable:
+        key = heapq.heappop(self._ready)[2]
+        self._queued.discard(key)
+        return key
+
+    # ------------------------------------------------------------------
+    def _set_status(self, key: Hashable, status: Optional[str]) -> None:
+        previous = self._status[key]
+        if previous == status:
+            return
+        self._status[key] = status
+        if status in _TERMINAL:
+            self._outstanding.discard(key)
+        if status == "done":
+            self._release(key)
+        elif previous == "done":
+            for dependent in self._dependents.get(key, ()):
+                self._unmet[dependent] += 1
+        self._push_if_ready(key)
+
+    # ------------------------------------------------------------------
+    def _release(self, key: Hashable) -> None:
+        for dependent in self._dependents.get(key, ()):
+            self._unmet[dependent] -= 1
+            self._push_if_ready(dependent)
+
+    # ------------------------------------------------------------------
+    def _sync_outstanding(self) -> None:
+        for key in list(self._outstanding):
+            self._set_status(key, getattr(self._tasks[key], "status", None))
@@ -2,13 +2,47 @@
 
 from __future__ import annotations
 
+import argparse
 import ast
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+import hashlib
 import logging
+import math
 from pathlib import Path
-from typing import Dict, List
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-from radon.complexity import cc_visit, cc_rank
-from radon.metrics import mi_visit, mi_rank
+import radon
+from radon.complexity import cc_rank
+from radon.metrics import h_visit_ast, mi_compute, mi_rank
+from radon.raw import analyze as raw_analyze
+from radon.visitors import ComplexityVisitor, Function
+
+from .analysis_cache import AnalysisCache
+from .analysis_scope import AnalysisScope
+from .backlog_analytics import BacklogAnalytics
+from .file_index import shared_index
+from .metric_history import MetricHistory
+from .vcs import git_revision, previous_sources
+
+# Bump when the layout of the per-file metrics returned by
+# ``SelfAuditor._analyze_file`` changes, to invalidate cached results.
+_METRICS_FORMAT = 2
+
+
+class _FileState(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: str
+    metrics: Optional[Dict]
+
+
+def _analyze_chunk(settings: Tuple[int, str], sources: List[Tuple[str, str]]) -> List[Dict]:
+    """Analyze ``sources`` in a worker process and return their metrics in order."""
+    auditor = SelfAuditor(*settings, cache=False)
+    return [auditor._analyze_file(path, text) for path, text in sources]
 
 
 class SelfAuditor:
@@ -19,70 +53,181 @@ class SelfAuditor:
         complexity_threshold: int = 15,
         maintainability_threshold: str = "B",
         use_wily: bool = False,
+        incremental: bool = False,
+        cache: bool = True,
+        workers: int = 1,
+        track_history: bool = False,
+        scope: Optional[AnalysisScope] = None,
     ) -> None:
         self.complexity_threshold = complexity_threshold
         self.maintainability_threshold = maintainability_threshold
+        # ``use_wily`` predates the native history store and now enables it.
         self.use_wily = use_wily
+        self.track_history = track_history or use_wily
+        self._history: Optional[MetricHistory] = None
+        self.incremental = incremental
+        self.workers = workers
+        # Identifies the analyzer version and thresholds behind stored metrics.
+        self.namespace = (
+            f"format={_METRICS_FORMAT};radon={radon.__version__};"
+            f"cc={complexity_threshold};mi={maintainability_threshold}"
+        )
+        self.scope = scope
+        if scope is not None:
+            scope.namespace = self.namespace
         self.logger = logging.getLogger(__name__)
+        self.cache: Optional[AnalysisCache] = None
+        if cache:
+            self.cache = AnalysisCache(self.namespace)
+        self._snapshot: Dict[str, _FileState] = {}
+        self._snapshot_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
 
     # ------------------------------------------------------------------
-    def analyze(self, paths: List[Path]) -> Dict[str, Dict]:
-        """Return metrics for ``paths`` which should be Python files."""
+    def analyze(self, paths: List[Path], workers: Optional[int] = None) -> Dict[str, Dict]:
+        """Return metrics for ``paths`` which should be Python files.
 
-        results: Dict[str, Dict] = {}
-        wily_state = None
-        wily_config = None
-        if self.use_wily:
-            try:
-                from wily.config import DEFAULT_CONFIG
-                from wily.commands.build import build
-                from wily.archivers import resolve_archiver
-                from wily.operators import resolve_operators
-                from wily.state import State
-
-                wily_config = DEFAULT_CONFIG
-                wily_config.path = "."
-                archiver = resolve_archiver(wily_config.archiver)
-                operators = resolve_operators(wily_config.operators)
-                build(wily_config, archiver, operators)
-                wily_state = State(wily_config)
-            except Exception as exc:  # pragma: no cover - wily optional
-                self.logger.warning("Wily processing failed: %s", exc)
+        With more than one worker (``workers`` or the instance default) files
+        are analyzed in chunks on a process pool. Results are keyed and
+        ordered by ``paths`` either way.
+        """
 
+        sources = []
         for path in paths:
-            if not path.exists() or path.suffix != ".py":
-                continue
-            try:
-                text = path.read_text(encoding="utf-8")
-            except (OSError, UnicodeDecodeError) as exc:  # pragma: no cover - IO issues
-                self.logger.warning("Could not read %s: %s", path, exc)
-                continue
+            text = self._read_source(path)
+            if text is not None:
+                sources.append((path, text))
+        return self._analyze_sources(sources, workers)
+
+    # ------------------------------------------------------------------
+    def analyze_incremental(self, paths: List[Path], workers: Optional[int] = None) -> Dict[str, Dict]:
+        """Return metrics for ``paths``, reanalyzing only changed files.
+
+        Files are compared with the previous call by size and modification
+        time first and by SHA-256 content hash when those differ, so only
+        files whose content actually changed are parsed again. The result is
+        identical to :meth:`analyze` for the same files.
+        """
+
+        with self._snapshot_lock:
+            snapshot: Dict[str, _FileState] = {}
+            changed = []
+            for path in paths:
+                key = str(path)
+                if path.suffix != ".py":
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                state = self._snapshot.get(key)
+                if state and (state.size, state.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    snapshot[key] = state
+                    continue
+                text = self._read_source(path)
+                if text is None:
+                    continue
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if state and state.digest == digest:
+                    snapshot[key] = state._replace(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    continue
+                changed.append((path, text, stat, digest))
+
+            fresh = self._analyze_sources([(path, text) for path, text, _, _ in changed], workers)
+            for path, _, stat, digest in changed:
+                snapshot[str(path)] = _FileState(
+                    stat.st_size, stat.st_mtime_ns, digest, fresh.get(str(path))
+                )
+            self._snapshot = snapshot
+            self.logger.debug("Reanalyzed %d of %d files", len(changed), len(snapshot))
+
+            results: Dict[str, Dict] = {}
+            for path in paths:
+                state = snapshot.get(str(path))
+                if state and state.metrics is not None:
+                    results[str(path)] = state.metrics
+            return results
+
+    # ------------------------------------------------------------------
+    def _read_source(self, path: Path) -> Optional[str]:
+        if not path.exists() or path.suffix != ".py":
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as exc:  # pragma: no cover - IO issues
+            self.logger.warning("Could not read %s: %s", path, exc)
+            return None
 
+    # ------------------------------------------------------------------
+    def _analyze_sources(
+        self, sources: List[Tuple[Path, str]], workers: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        results: Dict[str, Dict] = {}
+        if not sources:
+            return results
+
+        analyzed: Dict[str, Dict] = {}
+        misses = []
+        for path, text in sources:
             if not text.strip():
                 continue
+            key = self.cache.key(text) if self.cache else None
+            file_metrics = self.cache.get(key) if key else None
+            if file_metrics is None:
+                misses.append((str(path), text, key))
+            else:
+                analyzed[str(path)] = file_metrics
+
+        fresh = self._analyze_files([(path, text) for path, text, _ in misses], workers)
+        for (path, _, key), file_metrics in zip(misses, fresh):
+            if key:
+                self.cache.put(key, file_metrics)
+            analyzed[path] = file_metrics
 
-            file_metrics = self._analyze_file(str(path), text)
+        if self.track_history:
+            self._update_history(sources, analyzed)
 
-            if self.use_wily and wily_state and wily_config:
-                history = self._wily_history(wily_state, wily_config, path)
-                if history:
-                    file_metrics["history"] = history
-            results[str(path)] = file_metrics
+        for path, _ in sources:
+            file_metrics = analyzed.get(str(path))
+            if file_metrics is not None:
+                results[str(path)] = file_metrics
 
         return results
 
+    # ------------------------------------------------------------------
+    def _analyze_files(self, sources: List[Tuple[str, str]], workers: Optional[int] = None) -> List[Dict]:
+        workers = self.workers if workers is None else workers
+        if workers > 1 and len(sources) > 1:
+            workers = min(workers, len(sources))
+            size = math.ceil(len(sources) / (workers * 4))
+            chunks = [sources[i:i + size] for i in range(0, len(sources), size)]
+            settings = (self.complexity_threshold, self.maintainability_threshold)
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = pool.map(partial(_analyze_chunk, settings), chunks)
+                    return [item for chunk in results for item in chunk]
+            except (OSError, BrokenProcessPool) as exc:
+                self.logger.warning("Parallel analysis failed, analyzing serially: %s", exc)
+        return [self._analyze_file(path, text) for path, text in sources]
+
     # ------------------------------------------------------------------
     def _analyze_file(self, filepath: str, content: str) -> Dict:
+        """Compute the metrics of one module from a single parse.
+
+        The source is parsed once and the resulting tree is shared by every
+        metric; radon's ``cc_visit`` and ``mi_visit`` would each parse it
+        again. Only the raw line counts need the tokenizer.
+        """
         try:
-            ast.parse(content)
+            tree = ast.parse(content)
         except SyntaxError:
             return {"error": "Syntax error in file"}
 
-        complexity_results = cc_visit(content)
+        visitor = ComplexityVisitor.from_ast(tree)
         complexity_data = []
         max_complexity = 0
 
-        for item in complexity_results:
+        for item in visitor.blocks:
             complexity = item.complexity
             rank = cc_rank(complexity)
             complexity_data.append(
@@ -91,13 +236,13 @@ class SelfAuditor:
                     "complexity": complexity,
                     "rank": rank,
                     "lineno": item.lineno,
-                    "type": item.classname or "function",
+                    "type": (item.classname or "function") if isinstance(item, Function) else "class",
                 }
             )
             max_complexity = max(max_complexity, complexity)
 
         try:
-            mi_value = mi_visit(content, False)
+            mi_value = self._maintainability_index(tree, content, visitor.total_complexity)
             mi_rank_value = mi_rank(mi_value)
         except Exception:  # pragma: no cover - extremely unlikely
             mi_value = 0
@@ -112,70 +257,73 @@ class SelfAuditor:
             "complexity": complexity_data,
             "maintainability": {"mi": mi_value, "rank": mi_rank_value},
             "max_complexity": max_complexity,
+            "total_complexity": visitor.total_complexity,
             "needs_refactor": needs_complexity_refactor or needs_maintainability_refactor,
             "complexity_violations": [
                 item for item in complexity_data if item["complexity"] > self.complexity_threshold
             ],
         }
 
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _maintainability_index(tree: ast.AST, content: str, total_complexity: int) -> float:
+        """Return ``mi_visit(content, False)`` computed from an existing tree."""
+        raw = raw_analyze(content)
+        comments = raw.comments / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+        volume = h_visit_ast(tree).total.volume
+        return mi_compute(volume, total_complexity, raw.lloc, comments)
+
     # ------------------------------------------------------------------
     def _rank_worse_than(self, current: str, threshold: str) -> bool:
         order = {"A": 1, "B": 2, "C": 3, "D": 4, "F": 5}
         return order.get(current, 5) > order.get(threshold, 2)
 
     # ------------------------------------------------------------------
-    def _wily_history(self, state, config, path: Path) -> Dict:
-        """Return historical metrics for ``path`` using wily."""
-        try:
-            rel = str(path.relative_to(config.path))
-        except ValueError:
-            rel = str(path)
-
-        revisions = state.index[state.default_archiver].revisions
-        if len(revisions) < 2:
-            return {}
+    def _update_history(self, sources: List[Tuple[Path, str]], analyzed: Dict[str, Dict]) -> None:
+        """Record ``analyzed`` in the metric history and attach the deltas.
 
-        current_rev = revisions[0]
-        previous_rev = revisions[1]
-
-        try:
-            current_complexity = current_rev.get(
-                config, state.default_archiver, "cyclomatic", rel, "complexity"
-            )
-            prev_complexity = previous_rev.get(
-                config, state.default_archiver, "cyclomatic", rel, "complexity"
-            )
-            current_mi = current_rev.get(
-                config, state.default_archiver, "maintainability", rel, "mi"
-            )
-            prev_mi = previous_rev.get(
-                config, state.default_archiver, "maintainability", rel, "mi"
+        Files seen for the first time are seeded with their metrics at the
+        parent of ``HEAD`` so a change is visible from the first audit on.
+        """
+        if self._history is None:
+            self._history = MetricHistory()
+        history = self._history
+
+        keys: Dict[str, str] = {}
+        digests: Dict[str, str] = {}
+        for path, text in sources:
+            file_metrics = analyzed.get(str(path))
+            if file_metrics is None or "error" in file_metrics:
+                continue
+            keys[str(path)] = str(Path(path).resolve())
+            digests[str(path)] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        unseen = [Path(path) for path, key in keys.items() if not history.known(key)]
+        if unseen:
+            revision, previous = previous_sources(unseen)
+            seeds = list(previous.items())
+            seeded = self._analyze_files(seeds)
+            history.record(
+                (keys[path], revision, hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                 file_metrics["total_complexity"], file_metrics["maintainability"]["mi"])
+                for (path, text), file_metrics in zip(seeds, seeded)
+                if "error" not in file_metrics
             )
-        except Exception:
-            return {}
 
-        return {
-            "previous_complexity": prev_complexity,
-            "current_complexity": current_complexity,
-            "delta_complexity": current_complexity - prev_complexity,
-            "previous_mi": prev_mi,
-            "current_mi": current_mi,
-            "delta_mi": current_mi - prev_mi,
-        }
+        revision = git_revision()
+        history.record(
+            (key, revision, digests[path], analyzed[path]["total_complexity"],
+             analyzed[path]["maintainability"]["mi"])
+            for path, key in keys.items()
+        )
+        for path, key in keys.items():
+            deltas = history.history(key)
+            if deltas:
+                analyzed[path]["history"] = deltas
 
     # ------------------------------------------------------------------
     def _get_existing_refactor_files(self, existing_tasks: List[Dict]) -> set:
-        files = set()
-        for task in existing_tasks:
-            desc = task.get("description", "")
-            if "Refactor" in desc and desc.split():
-                part = desc.split()[1]
-                if part.endswith(".py"):
-                    files.add(part)
-            meta = task.get("metadata", {})
-            if meta.get("type") == "refactor" and meta.get("filepath"):
-                files.add(meta["filepath"])
-        return files
+        return BacklogAnalytics(existing_tasks).refactor_files
 
     # ------------------------------------------------------------------
     def _calculate_priority(self, metrics: Dict) -> int:
@@ -215,12 +363,21 @@ class SelfAuditor:
         A task is generated when either the cyclomatic complexity or
         maintainability index of a module exceeds the configured
         thresholds. Existing refactor tasks are ignored to avoid
-        duplicates.
+        duplicates. With a ``scope`` only files changed since the last
+        audit (according to git, or content hashes outside a repository)
+        are analyzed and merged into the persisted results; with
+        ``incremental`` unchanged files are skipped within this process.
         """
 
-        python_files = [f for f in Path(".").rglob("*.py") if "__pycache__" not in str(f)]
-
-        metrics = self.analyze(python_files)
+        if self.scope is not None:
+            changes = self.scope.changes()
+            metrics = self.scope.merge(self.analyze(changes.changed))
+        else:
+            python_files = shared_index().glob("**/*.py")
+            if self.incremental:
+                metrics = self.analyze_incremental(python_files)
+            else:
+                metrics = self.analyze(python_files)
         new_tasks: List[Dict] = []
         existing_refactor_files = self._get_existing_refactor_files(existing_tasks)
 
@@ -273,10 +430,25 @@ class SelfAuditor:
         self.logger.info("Generated %d refactoring tasks", len(new_tasks))
         return new_tasks
 
+    # ------------------------------------------------------------------
+    def audit_async(self, existing_tasks: List[Dict]) -> Future:
+        """Run :meth:`audit` on a background thread and return its future.
+
+        Audits submitted this way run one at a time in submission order.
+        """
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="self-audit")
+        return self._pool.submit(self.audit, existing_tasks)
+
 
 if __name__ == "__main__":  # pragma: no cover - manual testing helper
-    auditor = SelfAuditor()
-    sample_files = list(Path(".").rglob("*.py"))[:5]
+    parser = argparse.ArgumentParser(description="Print code metrics for Python files")
+    parser.add_argument("paths", nargs="*", type=Path, help="Files to analyze (default: first 5 found)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of analysis processes")
+    args = parser.parse_args()
+    auditor = SelfAuditor(workers=args.workers)
+    sample_files = args.paths or list(Path(".").rglob("*.py"))[:5]
     metrics = auditor.analyze(sample_files)
     for file, data in metrics.items():
         print(f"\n{file}:")
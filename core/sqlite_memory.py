@@ -0,0 +1,269 @@
+"""SQLite-backed storage backend for the task backlog."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+import sqlite3
+from typing import Dict, List, Optional
+
+from .memory import Memory
+from .task import Task
+from .task_table import TaskTable
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        position INTEGER NOT NULL,
+        description TEXT NOT NULL,
+        component TEXT NOT NULL,
+        priority INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        command TEXT,
+        timeout REAL,
+        cpu_limit REAL,
+        memory_limit INTEGER,
+        inputs TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS yaml_exports (
+        path TEXT PRIMARY KEY,
+        digest TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_dependencies (
+        task_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        depends_on INTEGER NOT NULL,
+        PRIMARY KEY (task_id, position)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_component ON tasks (component)",
+    "CREATE INDEX IF NOT EXISTS idx_task_dependencies_depends_on ON task_dependencies (depends_on)",
+]
+
+# Nullable task columns added after the first release, created on open when
+# an older database lacks them.
+OPTIONAL_COLUMNS = (
+    ("timeout", "REAL"),
+    ("cpu_limit", "REAL"),
+    ("memory_limit", "INTEGER"),
+    ("inputs", "TEXT"),
+)
+
+READY_QUERY = """
+    SELECT * FROM tasks AS t
+    WHERE t.status = 'pending'
+      AND NOT EXISTS (
+        SELECT 1 FROM task_dependencies AS d
+        LEFT JOIN tasks AS dep ON dep.id = d.depends_on
+        WHERE d.task_id = t.id AND (dep.status IS NULL OR dep.status != 'done')
+      )
+    ORDER BY t.priority DESC, t.position
+"""
+
+
+class SQLiteMemory(Memory):
+    """Persist tasks in SQLite and keep ``tasks.yml`` as an exported view.
+
+    The task methods keep the :class:`Memory` signatures so the orchestrator
+    can use either backend. Status changes and additions update single rows;
+    the YAML file named by ``tasks_file`` is re-exported on
+    :meth:`save_tasks` and :meth:`compact_tasks`. It is imported when the
+    database holds no tasks yet and whenever its content differs from the
+    last import or export, so edits made to the file by hand are picked up.
+    JSON state handling is inherited unchanged.
+    """
+
+    def __init__(self, path: Path, db_path: Path = Path("tasks.sqlite3")):
+        """Initialize the store.
+
+        Parameters
+        ----------
+        path:
+            File location for the JSON state.
+        db_path:
+            SQLite database holding the task backlog.
+        """
+        super().__init__(path)
+        self.db_path = Path(db_path)
+        self._dirty = False
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            for statement in SCHEMA_STATEMENTS:
+                self._conn.execute(statement)
+            self._add_missing_columns()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    def load_tasks(self, tasks_file: str) -> List[Task]:
+        """Return all tasks, importing ``tasks_file`` if it is new or was edited."""
+        if not self._conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone():
+            self.import_yaml(tasks_file)
+        elif self._yaml_changed(tasks_file):
+            logger.info("%s changed since it was last exported; importing it", tasks_file)
+            self.import_yaml(tasks_file)
+        return self._query("SELECT * FROM tasks ORDER BY position")
+
+    def load_table(self, tasks_file: str) -> TaskTable:
+        """Return all tasks as a :class:`TaskTable`."""
+        return TaskTable(self.load_tasks(tasks_file))
+
+    def save_tasks(self, tasks: List[Task], tasks_file: str) -> None:
+        """Replace the stored backlog with ``tasks`` and export it as YAML."""
+        self._replace(tasks)
+        self.export_yaml(tasks_file, tasks)
+
+    def record_status(self, task: Task, tasks: List[Task], tasks_file: str) -> None:
+        """Update the status column of ``task`` in place."""
+        self._validator.validate_items([self._task_data(task)])
+        with self._conn:
+            self._conn.execute(
+                "UPDATE tasks SET status = ? WHERE id = ?", (task.status, task.id)
+            )
+        self._dirty = True
+
+    def record_tasks(self, new_tasks: List[Task], tasks: List[Task], tasks_file: str) -> None:
+        """Insert ``new_tasks`` after the existing rows."""
+        self._validator.validate_items(self._task_data(t) for t in new_tasks)
+        row = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM tasks").fetchone()
+        with self._conn:
+            self._insert(new_tasks, row[0] + 1)
+        self._dirty = True
+
+    def compact_tasks(self, tasks: List[Task], tasks_file: str) -> None:
+        """Export the backlog to ``tasks_file`` if rows changed since the last export."""
+        if self._dirty:
+            self.export_yaml(tasks_file)
+
+    # ------------------------------------------------------------------
+    def import_yaml(self, tasks_file: str) -> List[Task]:
+        """Replace the stored backlog with the contents of ``tasks_file``."""
+        tasks = Memory.load_tasks(self, tasks_file)
+        self._replace(tasks)
+        self._remember_yaml(tasks_file)
+        return tasks
+
+    def export_yaml(self, tasks_file: str, tasks: Optional[List[Task]] = None) -> None:
+        """Write the stored backlog to ``tasks_file`` in the YAML format."""
+        if tasks is None:
+            tasks = self._query("SELECT * FROM tasks ORDER BY position")
+        Memory.save_tasks(self, tasks, tasks_file)
+        self._remember_yaml(tasks_file)
+        self._dirty = False
+
+    def ready_tasks(self) -> List[Task]:
+        """Return pending tasks whose dependencies are all done, best first."""
+        return self._query(READY_QUERY)
+
+    def tasks_by_status(self, status: str) -> List[Task]:
+        """Return tasks with ``status`` in backlog order."""
+        return self._query("SELECT * FROM tasks WHERE status = ? ORDER BY position", (status,))
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _yaml_digest(tasks_file: str) -> Optional[str]:
+        try:
+            return hashlib.sha256(Path(tasks_file).read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def _yaml_changed(self, tasks_file: str) -> bool:
+        digest = self._yaml_digest(tasks_file)
+        if digest is None:
+            return False
+        row = self._conn.execute(
+            "SELECT digest FROM yaml_exports WHERE path = ?", (str(Path(tasks_file).resolve()),)
+        ).fetchone()
+        return row is None or row["digest"] != digest
+
+    def _remember_yaml(self, tasks_file: str) -> None:
+        digest = self._yaml_digest(tasks_file)
+        if digest is None:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO yaml_exports (path, digest) VALUES (?, ?)",
+                (str(Path(tasks_file).resolve()), digest),
+            )
+
+    def _add_missing_columns(self) -> None:
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        missing = [(name, kind) for name, kind in OPTIONAL_COLUMNS if name not in existing]
+        for name, kind in missing:
+            self._conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {kind}")
+        if missing:
+            # Rows stored before the upgrade lack these fields; re-import the YAML.
+            self._conn.execute("DELETE FROM yaml_exports")
+
+    def _replace(self, tasks: List[Task]) -> None:
+        self._validator.validate([self._task_data(t) for t in tasks])
+        with self._conn:
+            self._conn.execute("DELETE FROM task_dependencies")
+            self._conn.execute("DELETE FROM tasks")
+            self._insert(tasks, 0)
+
+    def _insert(self, tasks: List[Task], start: int) -> None:
+        self._conn.executemany(
+            "INSERT INTO tasks (id, position, description, component, priority, status, command,"
+            " timeout, cpu_limit, memory_limit, inputs) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    t.id, start + pos, t.description, t.component, t.priority, t.status, t.command,
+                    t.timeout, t.cpu_limit, t.memory_limit,
+                    json.dumps(list(t.inputs)) if t.inputs is not None else None,
+                )
+                for pos, t in enumerate(tasks)
+            ],
+        )
+        self._conn.executemany(
+            "INSERT INTO task_dependencies (task_id, position, depends_on) VALUES (?, ?, ?)",
+            [(t.id, pos, dep) for t in tasks for pos, dep in enumerate(t.dependencies)],
+        )
+
+    def _query(self, sql: str, params=()) -> List[Task]:
+        rows = self._conn.execute(sql, params).fetchall()
+        if not rows:
+            return []
+        ids = [row["id"] for row in rows]
+        dependencies: Dict[int, List[int]] = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for dep in self._conn.execute(
+                "SELECT task_id, depends_on FROM task_dependencies"
+                f" WHERE task_id IN ({placeholders}) ORDER BY task_id, position",
+                chunk,
+            ):
+                dependencies.setdefault(dep["task_id"], []).append(dep["depends_on"])
+        return [
+            Task(
+                id=row["id"],
+                description=row["description"],
+                component=row["component"],
+                dependencies=dependencies.get(row["id"], []),
+                priority=row["priority"],
+                status=row["status"],
+                command=row["command"],
+                timeout=row["timeout"],
+                cpu_limit=row["cpu_limit"],
+                memory_limit=row["memory_limit"],
+                inputs=json.loads(row["inputs"]) if row["inputs"] is not None else None,
+            )
+            for row in rows
+        ]
@@ -13,3 +13,7 @@ class Task:
     priority: int
     status: str
     command: Optional[str] = None
+    timeout: Optional[float] = None
+    cpu_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
+    inputs: Optional[List[str]] = None
@@ -0,0 +1,200 @@
+"""Shared loader for YAML task files with a parsed snapshot cache.
+
+Parsing ``tasks.yml`` dominates start-up of every component that reads the
+backlog. :func:`load_task_file` parses with libyaml when it is available and
+keeps a JSON snapshot of the parsed (and optionally validated) task list in
+memory and under :func:`core.cache.cache_dir`. Snapshots are keyed by the
+file's size, modification time and SHA-256 digest, so unchanged files are
+never parsed twice, neither within one process nor across CLI invocations.
+
+Snapshots are plain JSON rather than pickles because the cache directory
+defaults to a path relative to the working directory: loading a planted
+pickle from there would run arbitrary code. Task files holding values JSON
+cannot represent exactly, such as YAML timestamps, are parsed every time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any, Dict, Optional
+
+import yaml
+
+from .cache import cache_dir
+from .validation import schema_key, validate_tasks
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeDumper, SafeLoader
+
+logger = logging.getLogger(__name__)
+
+# Modification times closer than this to the moment a snapshot was taken are
+# not trusted on their own, since a same-size rewrite within the filesystem's
+# timestamp granularity would otherwise go unnoticed.
+_RACY_WINDOW_NS = 2_000_000_000
+
+_SNAPSHOT_FIELDS = ("digest", "schema", "size", "mtime_ns", "checked_ns")
+
+_snapshots: Dict[str, Dict[str, Any]] = {}
+
+
+def parse_yaml(text: str) -> Any:
+    """Parse ``text`` with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def dump_yaml(data: Any) -> str:
+    """Serialize ``data`` with the fastest available safe dumper."""
+    return yaml.dump(data, Dumper=SafeDumper, sort_keys=False)
+
+
+def load_task_file(path: Path, schema: Optional[Dict] = None) -> Any:
+    """Return the parsed contents of the YAML task file at ``path``.
+
+    Parameters
+    ----------
+    path:
+        Task file to load.
+    schema:
+        Optional JSON schema the data is validated against. Validation only
+        runs when the snapshot has not been validated against this schema.
+
+    Returns
+    -------
+    Any
+        A fresh copy of the parsed data (``[]`` for an empty file) which the
+        caller is free to mutate.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be read.
+    yaml.YAMLError
+        If the file is not valid YAML.
+    jsonschema.ValidationError
+        If ``schema`` is given and the data does not match it.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    stat = path.stat()
+    snapshot = _snapshots.get(key) or _read_snapshot(key)
+
+    if snapshot is None or not _stat_matches(snapshot, stat):
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if snapshot is None or snapshot["digest"] != digest:
+            data = parse_yaml(raw.decode("utf-8")) or []
+            payload = _encode(data)
+            if payload is None:
+                _forget(key)
+                if schema is not None:
+                    validate_tasks(data, schema)
+                return data
+            snapshot = {"digest": digest, "schema": None, "payload": payload}
+        snapshot.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, checked_ns=time.time_ns())
+        _store(key, snapshot)
+
+    wanted = schema_key(schema)
+    if wanted is not None and snapshot["schema"] != wanted:
+        data = json.loads(snapshot["payload"])
+        validate_tasks(data, schema)
+        snapshot["schema"] = wanted
+        _store(key, snapshot)
+        return data
+
+    return json.loads(snapshot["payload"])
+
+
+def remember_task_file(path: Path, text: str, data: Any, schema: Optional[Dict] = None) -> None:
+    """Record ``data`` as the parsed form of ``text`` just written to ``path``.
+
+    Writers call this after saving a task file so the next load is served
+    from the snapshot instead of re-parsing what was just serialized.
+    ``schema`` names the schema ``data`` was already validated against.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    payload = _encode(data)
+    if payload is None:
+        _forget(key)
+        return
+    stat = path.stat()
+    snapshot = {
+        "digest": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "schema": schema_key(schema),
+        "payload": payload,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "checked_ns": time.time_ns(),
+    }
+    _store(key, snapshot)
+
+
+# ----------------------------------------------------------------------
+def _stat_matches(snapshot: Dict[str, Any], stat: os.stat_result) -> bool:
+    return (
+        snapshot["size"] == stat.st_size
+        and snapshot["mtime_ns"] == stat.st_mtime_ns
+        and stat.st_mtime_ns < snapshot["checked_ns"] - _RACY_WINDOW_NS
+    )
+
+
+def _encode(data: Any) -> Optional[str]:
+    """Return ``data`` as JSON, or ``None`` if JSON cannot represent it exactly."""
+    try:
+        payload = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    # Non-string mapping keys are converted silently; reject those as well.
+    return payload if json.loads(payload) == data else None
+
+
+def _snapshot_path(key: str) -> Path:
+    name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return cache_dir("tasks") / f"{name}.json"
+
+
+def _read_snapshot(key: str) -> Optional[Dict[str, Any]]:
+    # The header line holds the metadata, the rest of the file the payload.
+    try:
+        with _snapshot_path(key).open("r", encoding="utf-8") as fh:
+            header = json.loads(fh.readline())
+            payload = fh.read()
+        snapshot = {name: header[name] for name in _SNAPSHOT_FIELDS}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, KeyError) as exc:
+        logger.warning("Ignoring unreadable task snapshot: %s", exc)
+        return None
+    snapshot["payload"] = payload
+    _snapshots[key] = snapshot
+    return snapshot
+
+
+def _store(key: str, snapshot: Dict[str, Any]) -> None:
+    _snapshots[key] = snapshot
+    try:
+        target = _snapshot_path(key)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        header = {name: snapshot[name] for name in _SNAPSHOT_FIELDS}
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(json.dumps(header) + "\n")
+            fh.write(snapshot["payload"])
+        os.replace(tmp, target)
+    except OSError as exc:  # pragma: no cover - read-only cache location
+        logger.warning("Could not persist task snapshot: %s", exc)
+
+
+def _forget(key: str) -> None:
+    _snapshots.pop(key, None)
+    try:
+        _snapshot_path(key).unlink(missing_ok=True)
+    except OSError:  # pragma: no cover - read-only cache location
+        pass
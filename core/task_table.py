@@ -0,0 +1,242 @@
+"""Columnar, array-backed storage for very large task backlogs."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .task import Task
+
+FIELDS = ("id", "description", "component", "dependencies", "priority", "status")
+# Task fields that are usually unset; stored sparsely per row.
+OPTIONAL_FIELDS = ("command", "timeout", "cpu_limit", "memory_limit", "inputs")
+_TASK_FIELDS = frozenset(Task.__dataclass_fields__)
+
+
+def _field(task, name: str, default=None):
+    if isinstance(task, Mapping):
+        return task.get(name, default)
+    return getattr(task, name, default)
+
+
+def _extras(task) -> Dict[str, object]:
+    if isinstance(task, Mapping):
+        return {key: value for key, value in task.items() if key not in FIELDS and value is not None}
+    return {name: getattr(task, name) for name in OPTIONAL_FIELDS if getattr(task, name, None) is not None}
+
+
+class TaskTable:
+    """Store tasks column by column instead of as one object per task.
+
+    Integer columns (id, priority, status and component codes) live in
+    :mod:`array` buffers, dependencies are kept in compressed sparse row form
+    (``dep_offsets`` indexes into one flat ``dep_ids`` array) and statuses and
+    components are interned. Rarely set fields such as ``command`` or
+    ``timeout``, and keys that are not :class:`Task` fields such as the
+    Reflector's ``metadata``, are kept sparsely in ``extras``. Rows are
+    exposed as :class:`TaskView` objects that read and write the columns in
+    place, so Memory, the Orchestrator, the Planner, the Reflector and the
+    VisionEngine share one table without converting it to ``Task`` or
+    ``dict`` instances.
+
+    Every write through a view is logged by row, so consumers such as the
+    Planner can pick up changes with :meth:`changed_rows` instead of
+    rescanning the table; :attr:`revision` counts the writes.
+    """
+
+    def __init__(self, tasks: Iterable[object] = ()) -> None:
+        self.ids = array("q")
+        self.priorities = array("i")
+        self.statuses = array("B")
+        self.components = array("H")
+        self.dep_offsets = array("Q", [0])
+        self.dep_ids = array("q")
+        self.descriptions: List[str] = []
+        self.extras: Dict[int, Dict[str, object]] = {}
+        self._status_names: List[str] = []
+        self._status_codes: Dict[str, int] = {}
+        self._component_names: List[str] = []
+        self._component_codes: Dict[str, int] = {}
+        self._index: Optional[Dict[int, int]] = None
+        self._changes = array("q")
+        for task in tasks:
+            self.append(task)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def revision(self) -> int:
+        """Number of writes made through views so far."""
+        return len(self._changes)
+
+    def __getitem__(self, row: Union[int, slice]) -> Union["TaskView", List["TaskView"]]:
+        if isinstance(row, slice):
+            return [TaskView(self, index) for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("task row out of range")
+        return TaskView(self, row)
+
+    def __iter__(self) -> Iterator["TaskView"]:
+        for row in range(len(self)):
+            yield TaskView(self, row)
+
+    # ------------------------------------------------------------------
+    def append(self, task: object) -> "TaskView":
+        """Append ``task`` (a :class:`Task`, mapping or view) and return its view."""
+        task_id = _field(task, "id")
+        if not isinstance(task_id, int):
+            raise TypeError(f"Task ids must be integers, got {task_id!r}")
+        row = len(self)
+        self.ids.append(task_id)
+        self.priorities.append(_field(task, "priority", 0))
+        self.statuses.append(self._intern_status(_field(task, "status")))
+        self.components.append(
+            self._intern(_field(task, "component", ""), self._component_names, self._component_codes)
+        )
+        self.dep_ids.extend(_field(task, "dependencies", None) or [])
+        self.dep_offsets.append(len(self.dep_ids))
+        self.descriptions.append(_field(task, "description", ""))
+        extras = _extras(task)
+        if extras:
+            self.extras[row] = extras
+        if self._index is not None:
+            self._index.setdefault(task_id, row)
+        return TaskView(self, row)
+
+    def extend(self, tasks: Iterable[object]) -> None:
+        """Append every task of ``tasks``."""
+        for task in tasks:
+            self.append(task)
+
+    def row_of(self, task_id: int) -> Optional[int]:
+        """Return the row holding ``task_id`` or ``None``."""
+        if self._index is None:
+            self._index = {}
+            for row, value in enumerate(self.ids):
+                self._index.setdefault(value, row)
+        return self._index.get(task_id)
+
+    def changed_rows(self, since: int = 0) -> List[int]:
+        """Return the rows written since :attr:`revision` was ``since``, oldest first."""
+        return list(dict.fromkeys(self._changes[since:]))
+
+    def status_name(self, code: int) -> str:
+        """Return the status string stored under ``code``."""
+        return self._status_names[code]
+
+    def status_count(self, status: str) -> int:
+        """Return the number of tasks with ``status`` without materializing rows."""
+        code = self._status_codes.get(status)
+        return 0 if code is None else self.statuses.count(code)
+
+    def to_tasks(self) -> List[Task]:
+        """Return the rows as independent :class:`Task` objects."""
+        return [Task(**{key: value for key, value in view.items() if key in _TASK_FIELDS}) for view in self]
+
+    # ------------------------------------------------------------------
+    def _intern_status(self, status) -> int:
+        return self._intern(status, self._status_names, self._status_codes)
+
+    @staticmethod
+    def _intern(value, names: List, codes: Dict) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+
+class TaskView(Mapping):
+    """Row of a :class:`TaskTable` usable both as a task object and as a dict.
+
+    Attribute access mirrors :class:`Task`; mapping access mirrors the task
+    dictionaries used by the Reflector and Memory, with unset optional fields
+    omitted and extra keys such as ``metadata`` included. Assigning
+    ``status`` or ``priority`` writes straight into the table.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: TaskTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._row]
+
+    @property
+    def description(self) -> str:
+        return self._table.descriptions[self._row]
+
+    @property
+    def component(self) -> str:
+        table = self._table
+        return table._component_names[table.components[self._row]]
+
+    @property
+    def dependencies(self) -> List[int]:
+        offsets = self._table.dep_offsets
+        return self._table.dep_ids[offsets[self._row]:offsets[self._row + 1]].tolist()
+
+    @property
+    def priority(self) -> int:
+        return self._table.priorities[self._row]
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        self._table.priorities[self._row] = value
+        self._table._changes.append(self._row)
+
+    @property
+    def status(self) -> str:
+        table = self._table
+        return table._status_names[table.statuses[self._row]]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self._table.statuses[self._row] = self._table._intern_status(value)
+        self._table._changes.append(self._row)
+
+    @property
+    def command(self) -> Optional[str]:
+        return self._extra("command")
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._extra("timeout")
+
+    @property
+    def cpu_limit(self) -> Optional[float]:
+        return self._extra("cpu_limit")
+
+    @property
+    def memory_limit(self) -> Optional[int]:
+        return self._extra("memory_limit")
+
+    @property
+    def inputs(self) -> Optional[List[str]]:
+        return self._extra("inputs")
+
+    def _extra(self, name: str):
+        return self._table.extras.get(self._row, {}).get(name)
+
+    # ------------------------------------------------------------------
+    def __getitem__(self, key: str):
+        if key in FIELDS:
+            return getattr(self, key)
+        return self._table.extras.get(self._row, {})[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        yield from self._table.extras.get(self._row, ())
+
+    def __len__(self) -> int:
+        return len(FIELDS) + len(self._table.extras.get(self._row, ()))
+
+    def __repr__(self) -> str:
+        return f"TaskView({dict(self)!r})"
@@ -0,0 +1,139 @@
+"""Compiled and incremental JSON-schema validation of task lists."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from jsonschema import exceptions
+from jsonschema.validators import validator_for
+from opentelemetry import metrics
+
+# Keywords that only describe a schema; anything else next to ``items``
+# constrains the list as a whole and rules out per-item validation.
+_ANNOTATIONS = {"$schema", "$id", "title", "description", "type", "items"}
+
+_compiled: Dict[str, object] = {}
+
+
+def schema_key(schema: Optional[Dict]) -> Optional[str]:
+    """Return a stable digest identifying ``schema``."""
+    if schema is None:
+        return None
+    encoded = json.dumps(schema, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def compiled_validator(schema: Dict):
+    """Return a validator for ``schema``, checking and building it only once.
+
+    Raises
+    ------
+    jsonschema.SchemaError
+        If ``schema`` itself is invalid.
+    """
+    key = schema_key(schema)
+    validator = _compiled.get(key)
+    if validator is None:
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = _compiled[key] = cls(schema)
+    return validator
+
+
+def validate_tasks(instance, schema: Dict) -> None:
+    """Drop-in replacement for :func:`jsonschema.validate` using a cached validator."""
+    error = exceptions.best_match(compiled_validator(schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+class TaskListValidator:
+    """Validate task lists against ``schema``, skipping unchanged tasks.
+
+    For schemas shaped like ``{"type": "array", "items": {...}}`` each task
+    is validated on its own and remembered by its canonical JSON encoding;
+    later calls only validate tasks whose content is not in the last
+    validated snapshot. Other schemas fall back to validating the whole list.
+    Durations are recorded in the ``task_validation_seconds`` histogram.
+    """
+
+    def __init__(self, schema: Dict) -> None:
+        self.schema = schema
+        self._validator = compiled_validator(schema)
+        self._item_validator = None
+        if schema.get("type") == "array" and isinstance(schema.get("items"), dict):
+            if set(schema) <= _ANNOTATIONS:
+                self._item_validator = type(self._validator)(schema["items"])
+        self._validated: Set[str] = set()
+
+        meter = metrics.get_meter_provider().get_meter(__name__)
+        self._duration = meter.create_histogram(
+            "task_validation_seconds", description="Time spent validating task lists"
+        )
+        self._checked = meter.create_counter(
+            "task_validation_items_total", description="Tasks checked against the schema"
+        )
+
+    # ------------------------------------------------------------------
+    def validate(self, tasks: List[Dict]) -> None:
+        """Validate the full task list and make it the new snapshot.
+
+        Raises
+        ------
+        jsonschema.ValidationError
+            For the first invalid task, with its index in ``error.path``.
+        """
+        start = time.perf_counter()
+        if self._item_validator is None:
+            validate_tasks(tasks, self.schema)
+            self._record(start, "full", len(tasks))
+            return
+        if not isinstance(tasks, list):
+            validate_tasks(tasks, self.schema)
+        snapshot, checked = self._validate_items(tasks, self._validated)
+        self._validated = snapshot
+        self._record(start, "incremental", checked)
+
+    def validate_items(self, tasks: Iterable[Dict]) -> None:
+        """Validate individual ``tasks`` and add them to the snapshot."""
+        start = time.perf_counter()
+        tasks = list(tasks)
+        if self._item_validator is None:
+            validate_tasks(tasks, self.schema)
+            self._record(start, "full", len(tasks))
+            return
+        snapshot, checked = self._validate_items(tasks, self._validated)
+        self._validated |= snapshot
+        self._record(start, "incremental", checked)
+
+    def mark_valid(self, tasks: Iterable[Dict]) -> None:
+        """Record ``tasks`` as already validated, e.g. after a cached load."""
+        if self._item_validator is not None:
+            self._validated = {self._encode(task) for task in tasks}
+
+    # ------------------------------------------------------------------
+    def _validate_items(self, tasks: List[Dict], known: Set[str]):
+        snapshot: Set[str] = set()
+        checked = 0
+        for index, task in enumerate(tasks):
+            encoded = self._encode(task)
+            if encoded not in known:
+                checked += 1
+                error = exceptions.best_match(self._item_validator.iter_errors(task))
+                if error is not None:
+                    error.path.appendleft(index)
+                    raise error
+            snapshot.add(encoded)
+        return snapshot, checked
+
+    @staticmethod
+    def _encode(task) -> str:
+        return json.dumps(task, sort_keys=True, separators=(",", ":"), default=repr)
+
+    def _record(self, start: float, mode: str, checked: int) -> None:
+        attrs = {"validation.mode": mode}
+        self._duration.record(time.perf_counter() - start, attrs)
+        self._checked.add(checked, attrs)
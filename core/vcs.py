@@ -0,0 +1,65 @@
+"""Thin helpers around the ``git`` command line."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+
+def git_output(args: List[str], cwd: Path, stdin: Optional[bytes] = None) -> Optional[bytes]:
+    """Return the stdout of ``git args`` in ``cwd`` or ``None`` if it fails."""
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, input=stdin, capture_output=True, check=False
+        )
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def git_revision(cwd: Path = Path(".")) -> Optional[str]:
+    """Return the commit checked out in ``cwd`` or ``None`` outside a repository."""
+    out = git_output(["rev-parse", "HEAD"], cwd)
+    return out.decode().strip() if out else None
+
+
+def previous_sources(paths: List[Path], cwd: Path = Path(".")) -> Tuple[Optional[str], Dict[str, str]]:
+    """Return the parent commit of ``HEAD`` and the content of ``paths`` there.
+
+    All files are read with a single ``git cat-file --batch`` call. Paths
+    that did not exist in the parent commit are left out.
+    """
+    out = git_output(["rev-parse", "--show-toplevel", "HEAD~1"], cwd)
+    if not out:
+        return None, {}
+    top, revision = out.decode().split()
+    names: Dict[str, str] = {}
+    for path in paths:
+        try:
+            names[str(path)] = Path(path).resolve().relative_to(top).as_posix()
+        except ValueError:
+            continue
+    if not names:
+        return revision, {}
+
+    request = "".join(f"{revision}:{name}\n" for name in names.values()).encode("utf-8")
+    out = git_output(["cat-file", "--batch"], Path(top), request)
+    if out is None:
+        return revision, {}
+
+    sources: Dict[str, str] = {}
+    offset = 0
+    for path in names:
+        end = out.index(b"\n", offset)
+        header = out[offset:end].split()
+        offset = end + 1
+        if len(header) != 3 or header[1] != b"blob":
+            continue
+        size = int(header[2])
+        try:
+            sources[path] = out[offset:offset + size].decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+        offset += size + 1
+    return revision, sources
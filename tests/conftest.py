@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 import pytest
@@ -11,3 +12,15 @@ def add_project_root_to_sys_path():
     yield
     if str(ROOT) in sys.path:
         sys.path.remove(str(ROOT))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dir(tmp_path_factory):
+    """Keep on-disk caches written during tests out of the repository."""
+    previous = os.environ.get("AI_SWA_CACHE_DIR")
+    os.environ["AI_SWA_CACHE_DIR"] = str(tmp_path_factory.mktemp("ai_swa_cache"))
+    yield
+    if previous is None:
+        os.environ.pop("AI_SWA_CACHE_DIR", None)
+    else:
+        os.environ["AI_SWA_CACHE_DIR"] = previous
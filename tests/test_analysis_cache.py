@@ -0,0 +1,27 @@
+from core.analysis_cache import AnalysisCache
+
+
+def test_analysis_cache_round_trip(tmp_path):
+    cache = AnalysisCache("v1", root=tmp_path)
+    key = cache.key("print('hi')\n")
+
+    assert cache.get(key) is None
+    cache.put(key, {"max_complexity": 1})
+
+    assert cache.get(key) == {"max_complexity": 1}
+    assert (tmp_path / key[:2] / f"{key}.json").exists()
+
+
+def test_analysis_cache_namespaces_keys(tmp_path):
+    content = "x = 1\n"
+    assert AnalysisCache("v1", root=tmp_path).key(content) != AnalysisCache("v2", root=tmp_path).key(content)
+
+
+def test_analysis_cache_ignores_corrupt_entries(tmp_path):
+    cache = AnalysisCache("v1", root=tmp_path)
+    key = cache.key("x = 1\n")
+    path = tmp_path / key[:2] / f"{key}.json"
+    path.parent.mkdir()
+    path.write_text("{not json")
+
+    assert cache.get(key) is None
@@ -0,0 +1,98 @@
+import subprocess
+
+from core.analysis_scope import AnalysisScope
+
+
+def _write(root, name, text):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def test_scope_reports_changed_and_removed_files_without_git(tmp_path):
+    root = tmp_path / "src"
+    _write(root, "a.py", "a = 1\n")
+    _write(root, "b.py", "b = 1\n")
+    state = tmp_path / "scope.json"
+
+    scope = AnalysisScope(["*.py"], root=root, state_path=state)
+    changes = scope.changes()
+    assert [p.name for p in changes.changed] == ["a.py", "b.py"]
+    merged = scope.merge({str(p): {"name": p.name} for p in changes.changed})
+    assert len(merged) == 2
+
+    scope = AnalysisScope(["*.py"], root=root, state_path=state)
+    assert scope.changes().changed == []
+
+    _write(root, "b.py", "b = 2\n")
+    (root / "a.py").unlink()
+    changes = scope.changes()
+    assert [p.name for p in changes.changed] == ["b.py"]
+    assert changes.removed == [str(root / "a.py")]
+    merged = scope.merge({str(root / "b.py"): {"name": "b.py", "version": 2}})
+    assert merged == {str(root / "b.py"): {"name": "b.py", "version": 2}}
+
+
+def test_scope_uses_git_diff_since_last_commit(tmp_path):
+    root = tmp_path
+    _git(root, "init")
+    _git(root, "config", "user.email", "t@example.com")
+    _git(root, "config", "user.name", "Tester")
+    for name in ("a.py", "b.py", "pkg/c.py"):
+        _write(root, name, f"# {name}\n")
+    _git(root, "add", ".")
+    _git(root, "commit", "-m", "init")
+
+    scope = AnalysisScope(["**/*.py"], root=root, state_path=tmp_path / "scope.json")
+    changes = scope.changes()
+    scope.merge({str(p): {} for p in changes.changed})
+    assert len(changes.changed) == 3
+
+    _write(root, "pkg/c.py", "c = 2\n")
+    _git(root, "commit", "-am", "change c")
+    _write(root, "d.py", "d = 1\n")
+
+    changes = scope.changes()
+    assert sorted(p.name for p in changes.changed) == ["c.py", "d.py"]
+
+
+def test_scope_notices_reverted_dirty_files(tmp_path):
+    root = tmp_path
+    _git(root, "init")
+    _git(root, "config", "user.email", "t@example.com")
+    _git(root, "config", "user.name", "Tester")
+    _write(root, "a.py", "a = 1\n")
+    _write(root, "b.py", "b = 1\n")
+    _git(root, "add", ".")
+    _git(root, "commit", "-m", "init")
+    state = tmp_path / ".scope.json"
+
+    _write(root, "a.py", "a = 2\n")
+    scope = AnalysisScope(["*.py"], root=root, state_path=state)
+    scope.merge({str(p): {"a": p.read_text()} for p in scope.changes().changed})
+
+    _git(root, "checkout", "--", "a.py")
+    scope = AnalysisScope(["*.py"], root=root, state_path=state)
+    changes = scope.changes()
+    assert [p.name for p in changes.changed] == ["a.py"]
+    merged = scope.merge({str(root / "a.py"): {"a": "a = 1\n"}})
+    assert merged[str(root / "a.py")] == {"a": "a = 1\n"}
+
+    assert AnalysisScope(["*.py"], root=root, state_path=state).changes().changed == []
+
+
+def test_scope_discards_snapshot_from_other_namespace(tmp_path):
+    root = tmp_path / "src"
+    _write(root, "a.py", "a = 1\n")
+    state = tmp_path / "scope.json"
+    scope = AnalysisScope(["*.py"], root=root, state_path=state, namespace="cc=10")
+    scope.merge({str(p): {} for p in scope.changes().changed})
+
+    assert AnalysisScope(["*.py"], root=root, state_path=state, namespace="cc=10").changes().changed == []
+    changes = AnalysisScope(["*.py"], root=root, state_path=state, namespace="cc=15").changes()
+    assert [p.name for p in changes.changed] == ["a.py"]
@@ -1,7 +1,9 @@
 import asyncio
 import unittest
 
-from core.async_runner import AsyncRunner
+import sys
+
+from core.async_runner import AsyncRunner, OutputLine
 
 
 class TestAsyncRunner(unittest.IsolatedAsyncioTestCase):
@@ -25,6 +27,85 @@ class TestAsyncRunner(unittest.IsolatedAsyncioTestCase):
         duration = asyncio.get_event_loop().time() - start
         self.assertLess(duration, 1.0)
 
+    async def test_run_timeout_kills_and_keeps_output(self):
+        start = asyncio.get_event_loop().time()
+        result = await self.runner.run(["sh", "-c", "echo started; sleep 5"], timeout=0.3)
+        self.assertLess(asyncio.get_event_loop().time() - start, 2.0)
+        self.assertTrue(result["timed_out"])
+        self.assertEqual(result["stdout"].strip(), "started")
+        self.assertNotEqual(result["exit_code"], 0)
+
+    async def test_run_many_bounded_and_in_completion_order(self):
+        cmds = [["sleep", "0.6"], ["sleep", "0.1"], ["sleep", "0.1"]]
+        start = asyncio.get_event_loop().time()
+        results = [result async for result in self.runner.run_many(cmds, concurrency=2)]
+        duration = asyncio.get_event_loop().time() - start
+        self.assertEqual([r["index"] for r in results], [1, 2, 0])
+        self.assertTrue(all(r["exit_code"] == 0 and not r["timed_out"] for r in results))
+        self.assertLess(duration, 1.2)
+
+    async def test_run_many_deadline(self):
+        cmds = [["sleep", "5"]] * 3
+        results = [r async for r in self.runner.run_many(cmds, concurrency=1, timeout=10, deadline=0.3)]
+        self.assertTrue(all(r["timed_out"] for r in results))
+        self.assertEqual(sorted(r["exit_code"] is None for r in results), [False, True, True])
+
+    async def test_run_many_reports_commands_that_fail_to_start(self):
+        cmds = ["sleep 0.3", "nonexistent-cmd-xyz", "echo hi"]
+        results = {r["index"]: r async for r in self.runner.run_many(cmds, concurrency=3)}
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertIsNone(results[1]["exit_code"])
+        self.assertIn("nonexistent-cmd-xyz", results[1]["error"])
+        self.assertEqual((results[0]["exit_code"], results[0]["error"]), (0, None))
+        self.assertEqual(results[2]["stdout"].strip(), "hi")
+
+    async def test_run_many_rejects_zero_concurrency(self):
+        with self.assertRaises(ValueError):
+            async for _ in self.runner.run_many([["true"]], concurrency=0):
+                pass
+
+    async def test_run_many_cancellation(self):
+        async def consume():
+            async for _ in self.runner.run_many([["sleep", "5"]] * 2, concurrency=2):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 2.0)
+
+    async def test_stream_yields_tagged_lines(self):
+        script = (
+            "import sys, time; sys.stdout.buffer.write(b'caf\\xc3'); sys.stdout.flush(); time.sleep(0.1); "
+            "sys.stdout.buffer.write(b'\\xa9\\r\\nend'); sys.stderr.write('warn\\n')"
+        )
+        lines = self.runner.stream([sys.executable, "-c", script])
+        collected = [line async for line in lines]
+        self.assertEqual([l for l in collected if l.stream == "stdout"], [OutputLine("stdout", "café"), OutputLine("stdout", "end")])
+        self.assertIn(OutputLine("stderr", "warn"), collected)
+        self.assertEqual(lines.returncode, 0)
+        self.assertFalse(lines.timed_out)
+
+    async def test_stream_applies_backpressure(self):
+        script = "import sys\nfor i in range(5000): print(i)"
+        lines = self.runner.stream([sys.executable, "-c", script], max_lines=4)
+        count = 0
+        async for _ in lines:
+            self.assertLessEqual(lines._queue.qsize(), 4)
+            count += 1
+        self.assertEqual(count, 5000)
+
+    async def test_stream_timeout_and_early_close(self):
+        lines = self.runner.stream(["sh", "-c", "echo first; sleep 5"], timeout=0.3)
+        self.assertEqual([line.text async for line in lines], ["first"])
+        self.assertTrue(lines.timed_out)
+
+        async with self.runner.stream(["sh", "-c", "echo one; sleep 5"]) as early:
+            async for line in early:
+                break
+        self.assertIsNotNone(early.returncode)
+
 
 if __name__ == "__main__":
     unittest.main()
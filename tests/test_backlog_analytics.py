@@ -0,0 +1,62 @@
+from core.backlog_analytics import BacklogAnalytics
+from core.backlog_validation import ValidationReport
+from core.reflector import Reflector
+
+
+def _task(task_id, description="work", status="pending", **extra):
+    task = {
+        "id": task_id,
+        "description": description,
+        "component": "core",
+        "dependencies": [],
+        "priority": 2,
+        "status": status,
+    }
+    task.update(extra)
+    return task
+
+
+def test_aggregates_match_backlog():
+    tasks = [
+        _task(1, "Refactor core/a.py to reduce complexity"),
+        _task(2, "Refactor core/a.py to reduce complexity", status="done"),
+        _task(3, "Write docs", status="in_progress", component="docs"),
+        _task(4, "Clean up", metadata={"type": "refactor", "filepath": "core/b.py"}),
+        {"id": 5, "description": "incomplete"},
+    ]
+
+    backlog = BacklogAnalytics(tasks)
+
+    assert backlog.total == 5
+    assert backlog.status_counts == {"pending": 2, "done": 1, "in_progress": 1, "unknown": 1}
+    assert backlog.priority_distribution == {1: 0, 2: 4, 3: 1, 4: 0, 5: 0}
+    assert backlog.component_counts == {"core": 3, "docs": 1, "unknown": 1}
+    assert backlog.pending_refactors == 1
+    assert backlog.refactor_files == {"core/a.py", "core/b.py"}
+    assert backlog.duplicate_tasks == [
+        {"description": "Refactor core/a.py to reduce complexity", "task_ids": [1, 2]}
+    ]
+    assert backlog.validation == ValidationReport.build(tasks)
+
+
+def test_extend_updates_aggregates_and_validation():
+    backlog = BacklogAnalytics([_task(1)])
+    assert backlog.validation.ok
+
+    backlog.extend([_task(1, "other")])
+
+    assert backlog.total == 2
+    assert backlog.task_analysis()["pending_tasks"] == 2
+    assert backlog.validation.duplicate_ids == [1, 1]
+
+
+def test_reflector_decisions_use_shared_analytics(tmp_path):
+    refl = Reflector(tasks_path=tmp_path / "tasks.yml", analysis_paths=[tmp_path / "none.py"])
+    tasks = [_task(i, f"Refactor core/m{i}.py") for i in range(1, 7)] + [_task(7, "Refactor core/m1.py")]
+
+    decisions = refl.decide({"code_metrics": {"needs_attention": True}}, tasks)
+
+    assert [d["type"] for d in decisions["refactor_tasks"]] == ["refactor_consolidation"]
+    assert decisions["technical_debt_priorities"][0]["duplicates"] == [
+        {"description": "Refactor core/m1.py", "task_ids": [1, 7]}
+    ]
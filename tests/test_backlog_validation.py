@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+
+from core.backlog_validation import ValidationReport, refactor_target
+from core.reflector import Reflector
+
+
+def _task(task_id, description="work", status="pending", dependencies=None):
+    return {
+        "id": task_id,
+        "description": description,
+        "component": "core",
+        "dependencies": dependencies or [],
+        "priority": 1,
+        "status": status,
+    }
+
+
+def test_refactor_target():
+    assert refactor_target("Refactor core/a.py to reduce complexity") == "core/a.py"
+    assert refactor_target("refactor notes") is None
+    assert refactor_target("Write docs for core/a.py") is None
+
+
+def test_report_collects_every_problem():
+    tasks = [
+        _task(1, "Refactor a.py"),
+        _task(2, "Refactor a.py"),
+        _task(2, dependencies=[1, 99]),
+        {"id": 4, "description": "incomplete"},
+    ]
+
+    report = ValidationReport.build(tasks)
+
+    assert not report.ok
+    assert report.duplicate_ids == [2, 2]
+    assert report.duplicate_refactors == [("a.py", 2, 1)]
+    assert report.missing_fields == [(4, ["component", "dependencies", "priority", "status"])]
+    assert report.dangling_dependencies == [(2, 99)]
+
+
+def test_report_of_clean_backlog_is_ok():
+    tasks = [_task(1, "Refactor a.py", status="done"), _task(2, "Refactor a.py", dependencies=[1])]
+    assert ValidationReport.build(tasks).ok
+
+
+def test_reflector_validate_raises_and_logs(tmp_path, caplog):
+    refl = Reflector(tasks_path=tmp_path / "tasks.yml", analysis_paths=[tmp_path / "none.py"])
+
+    with pytest.raises(ValueError, match=r"Duplicate task IDs found: \[1, 1\]"):
+        refl.validate([_task(1), _task(1)])
+    with pytest.raises(ValueError, match="Task 3 missing fields"):
+        refl.validate([{"id": 3}])
+
+    with caplog.at_level(logging.WARNING):
+        assert refl.validate([_task(1, "Refactor a.py"), _task(2, "Refactor a.py", dependencies=[7])])
+    assert "Potential duplicate refactor task for a.py" in caplog.text
+    assert "depends on unknown task 7" in caplog.text
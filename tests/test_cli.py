@@ -61,3 +61,51 @@ def test_cli_unwritable_memory(tmp_path):
         check=False,
     )
     assert result.returncode != 0
+
+
+def test_cli_workers_option(tmp_path):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1])
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "core.cli",
+            "--memory",
+            str(tmp_path / "state.json"),
+            "--workers",
+            "2",
+        ],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert result.returncode == 0
+    assert "Run finished" in result.stdout
+
+
+def test_cli_sqlite_backend(tmp_path):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1])
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "core.cli",
+            "--memory",
+            str(tmp_path / "state.json"),
+            "--backend",
+            "sqlite",
+            "--database",
+            str(tmp_path / "tasks.sqlite3"),
+        ],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert result.returncode == 0
+    assert (tmp_path / "tasks.sqlite3").exists()
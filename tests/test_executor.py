@@ -1,4 +1,5 @@
 import os
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -125,6 +126,144 @@ class TestExecutor(unittest.TestCase):
             assert logs, "Log file not created"
             assert logs[0].read_text().strip() == "hello there"
 
+    @patch('builtins.print')
+    def test_execute_streams_large_output_with_bounded_buffers(self, _print):
+        import sys
+        import tempfile
+
+        script = (
+            "import sys; sys.stdout.write('a' * 100 + 'b' * 200000 + 'z' * 50); "
+            "sys.stderr.write('oops')"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = Executor(head_bytes=100, tail_bytes=50, log_dir=Path(tmpdir))
+            task = Task(
+                id="big",
+                description="Chatty",
+                component="test",
+                dependencies=[],
+                priority=1,
+                status="pending",
+                command=f'{sys.executable} -c "{script}"',
+            )
+            result = executor.execute(task)
+
+            assert result.returncode == 0
+            assert result.stdout.total == 200150
+            assert result.stdout.omitted == 200000
+            assert result.stdout.text() == "a" * 100 + "\n... 200000 bytes omitted ...\n" + "z" * 50
+            assert result.stderr.text() == "oops"
+            assert result.total_bytes == 200154
+            log = result.log_file.read_bytes()
+            assert len(log) == 200154
+            assert b"oops" in log
+
+    @patch('builtins.print')
+    def test_execute_without_command_returns_none(self, _print):
+        task = Task(id="n", description="No command", component="test", dependencies=[], priority=1, status="pending")
+        self.assertIsNone(self.executor.execute(task))
+
+    @patch('builtins.print')
+    def test_execute_enforces_task_timeout(self, _print):
+        import signal
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = Executor(log_dir=Path(tmpdir), timeout=30)
+            task = Task(
+                id="slow",
+                description="Sleeps",
+                component="test",
+                dependencies=[],
+                priority=1,
+                status="pending",
+                command="sh -c 'echo started; sleep 10'",
+                timeout=0.3,
+            )
+            start = time.monotonic()
+            result = executor.execute(task)
+
+            self.assertLess(time.monotonic() - start, 5)
+            self.assertTrue(result.timed_out)
+            self.assertEqual(result.returncode, -signal.SIGKILL)
+            self.assertEqual(result.stdout.text().strip(), "started")
+
+    @unittest.skipUnless(hasattr(os, "wait4"), "needs os.wait4")
+    @patch('builtins.print')
+    def test_execute_enforces_rlimits_and_reports_usage(self, _print):
+        import sys
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = Executor(log_dir=Path(tmpdir))
+
+            def run(script, **limits):
+                task = Task(
+                    id="res",
+                    description="Resources",
+                    component="test",
+                    dependencies=[],
+                    priority=1,
+                    status="pending",
+                    command=f'{sys.executable} -c "{script}"',
+                    **limits,
+                )
+                return executor.execute(task)
+
+            busy = run("while True: pass", cpu_limit=1)
+            self.assertLess(busy.returncode, 0)
+            self.assertFalse(busy.timed_out)
+            self.assertGreaterEqual(busy.usage["user_cpu_seconds"] + busy.usage["system_cpu_seconds"], 0.9)
+
+            hungry = run("x = bytearray(1024 ** 3)", memory_limit=256 * 1024 ** 2)
+            self.assertNotEqual(hungry.returncode, 0)
+            self.assertIn("MemoryError", hungry.stderr.text())
+
+            ok = run("x = bytearray(32 * 1024 ** 2)")
+            self.assertEqual(ok.returncode, 0)
+            self.assertGreater(ok.usage["max_rss_bytes"], 32 * 1024 ** 2)
+            self.assertEqual(
+                set(ok.usage),
+                {
+                    "user_cpu_seconds",
+                    "system_cpu_seconds",
+                    "max_rss_bytes",
+                    "block_input_ops",
+                    "block_output_ops",
+                    "voluntary_context_switches",
+                    "involuntary_context_switches",
+                },
+            )
+
+    @unittest.skipUnless(hasattr(os, "wait4"), "needs os.wait4")
+    @patch('builtins.print')
+    def test_rlimits_use_wrapper_without_prlimit(self, _print):
+        import resource
+        import sys
+        import tempfile
+        from types import SimpleNamespace
+
+        import core.executor as executor_module
+
+        without_prlimit = SimpleNamespace(
+            **{name: getattr(resource, name) for name in ("RLIMIT_CPU", "RLIMIT_AS", "RLIM_INFINITY", "getrlimit")}
+        )
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(executor_module, "resource", without_prlimit):
+            task = Task(
+                id="wrapped",
+                description="Wrapped",
+                component="test",
+                dependencies=[],
+                priority=1,
+                status="pending",
+                command=f'{sys.executable} -c "x = bytearray(1024 ** 3)"',
+                memory_limit=256 * 1024 ** 2,
+            )
+            output = Executor(log_dir=Path(tmpdir)).execute(task)
+
+        self.assertNotEqual(output.returncode, 0)
+        self.assertIn("MemoryError", output.stderr.text())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import os
+
+from core.file_index import FileIndex, glob_regex
+
+
+def _touch(root, rel, text=""):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _names(paths, root):
+    return [p.relative_to(root).as_posix() for p in paths]
+
+
+def test_glob_regex_matches_path_glob_semantics():
+    assert glob_regex("*.py").match("a.py")
+    assert not glob_regex("*.py").match("core/a.py")
+    assert glob_regex("core/*.py").match("core/a.py")
+    assert not glob_regex("core/*.py").match("x/core/a.py")
+    assert glob_regex("**/*.py").match("a.py")
+    assert glob_regex("**/*.py").match("x/y/a.py")
+
+
+def test_file_index_prunes_excludes_and_gitignore(tmp_path):
+    _touch(tmp_path, ".gitignore", "logs/\n*.tmp\n/build\n")
+    _touch(tmp_path, "core/a.py")
+    _touch(tmp_path, "core/scratch.tmp")
+    _touch(tmp_path, "logs/run.py")
+    _touch(tmp_path, "build/gen.py")
+    _touch(tmp_path, "pkg/build/kept.py")
+    _touch(tmp_path, "services/node/node_modules/lib.py")
+    _touch(tmp_path, ".git/hooks/hook.py")
+    _touch(tmp_path, "pkg/.gitignore", "*.py\n!keep.py\n")
+    _touch(tmp_path, "pkg/drop.py")
+    _touch(tmp_path, "pkg/keep.py")
+
+    index = FileIndex(tmp_path)
+
+    assert _names(index.glob("**/*.py"), tmp_path) == ["core/a.py", "pkg/keep.py"]
+    assert "core/scratch.tmp" not in _names(index.files(), tmp_path)
+
+
+def test_file_index_excludes_are_configurable(tmp_path):
+    _touch(tmp_path, "node_modules/lib.py")
+    _touch(tmp_path, "vendor/lib.py")
+
+    index = FileIndex(tmp_path, excludes=["vendor"])
+
+    assert _names(index.glob("**/*.py"), tmp_path) == ["node_modules/lib.py"]
+
+
+def test_file_index_reuses_listings_of_unchanged_directories(tmp_path, monkeypatch):
+    _touch(tmp_path, "core/a.py")
+    old = 1_000_000_000
+    for directory in (tmp_path, tmp_path / "core"):
+        os.utime(directory, ns=(old, old))
+    index = FileIndex(tmp_path)
+    assert _names(index.files(), tmp_path) == ["core/a.py"]
+
+    scanned = []
+    original = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scanned.append(str(path)) or original(path))
+    assert _names(index.files(), tmp_path) == ["core/a.py"]
+    assert scanned == []
+
+    _touch(tmp_path, "core/b.py")
+    assert _names(index.files(), tmp_path) == ["core/a.py", "core/b.py"]
+    assert scanned == [str(tmp_path / "core")]
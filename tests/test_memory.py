@@ -58,3 +58,110 @@ def test_save_tasks_omit_null_command(tmp_path):
     mem.save_tasks(tasks, tasks_file)
     data = yaml.safe_load(tasks_file.read_text())
     assert "command" not in data[0]
+
+
+def _task(id, status="pending"):
+    return Task(
+        id=id,
+        description=f"task {id}",
+        component="core",
+        dependencies=[],
+        priority=1,
+        status=status,
+    )
+
+
+def test_record_status_is_journaled_and_replayed(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    mem = Memory(tmp_path / "state.json")
+    tasks = [_task(1), _task(2)]
+    mem.save_tasks(tasks, tasks_file)
+    snapshot = tasks_file.read_text()
+
+    tasks[0].status = "done"
+    mem.record_status(tasks[0], tasks, tasks_file)
+    new_task = _task(3)
+    tasks.append(new_task)
+    mem.record_tasks([new_task], tasks, tasks_file)
+
+    assert tasks_file.read_text() == snapshot
+    loaded = Memory(tmp_path / "state.json").load_tasks(tasks_file)
+    assert loaded == tasks
+
+
+def test_compaction_rewrites_yaml_and_truncates_journal(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    journal = tmp_path / "tasks.yml.journal"
+    mem = Memory(tmp_path / "state.json", compact_every=2)
+    tasks = [_task(1), _task(2)]
+    mem.save_tasks(tasks, tasks_file)
+
+    tasks[0].status = "in_progress"
+    mem.record_status(tasks[0], tasks, tasks_file)
+    assert journal.exists()
+    tasks[0].status = "done"
+    mem.record_status(tasks[0], tasks, tasks_file)
+
+    assert not journal.exists()
+    assert yaml.safe_load(tasks_file.read_text())[0]["status"] == "done"
+
+    tasks[1].status = "done"
+    mem.record_status(tasks[1], tasks, tasks_file)
+    mem.compact_tasks(tasks, tasks_file)
+    assert not journal.exists()
+    assert yaml.safe_load(tasks_file.read_text())[1]["status"] == "done"
+
+
+def test_replay_ignores_torn_entry_and_duplicate_additions(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    mem = Memory(tmp_path / "state.json")
+    mem.save_tasks([_task(1)], tasks_file)
+    journal = tmp_path / "tasks.yml.journal"
+    journal.write_text(
+        '{"op":"add","task":{"id":1,"description":"task 1","component":"core",'
+        '"dependencies":[],"priority":1,"status":"done"}}\n'
+        '{"op":"status","id":1,"sta'
+    )
+
+    loaded = mem.load_tasks(tasks_file)
+    assert [(t.id, t.status) for t in loaded] == [(1, "done")]
+
+
+def test_append_after_torn_entry_is_replayed(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    mem = Memory(tmp_path / "state.json")
+    tasks = [_task(1), _task(2)]
+    mem.save_tasks(tasks, tasks_file)
+    journal = tmp_path / "tasks.yml.journal"
+    journal.write_text('{"op":"status","id":1,"status":"done"}\n{"op":"status","id":1,"sta')
+
+    tasks[1].status = "done"
+    Memory(tmp_path / "state.json").record_status(tasks[1], tasks, tasks_file)
+
+    assert journal.read_text().splitlines()[-1] == '{"op":"status","id":2,"status":"done"}'
+    loaded = Memory(tmp_path / "state.json").load_tasks(tasks_file)
+    assert [(t.id, t.status) for t in loaded] == [(1, "done"), (2, "done")]
+
+
+def test_replay_skips_corrupt_lines(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    mem = Memory(tmp_path / "state.json")
+    mem.save_tasks([_task(1), _task(2)], tasks_file)
+    (tmp_path / "tasks.yml.journal").write_text(
+        '{"op":"status","id":1,"sta{"op":"status","id":1,"status":"in_progress"}\n'
+        '{"op":"status","id":2,"status":"done"}\n'
+    )
+
+    loaded = mem.load_tasks(tasks_file)
+    assert [(t.id, t.status) for t in loaded] == [(1, "pending"), (2, "done")]
+
+
+def test_record_status_rejects_invalid_status(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    mem = Memory(tmp_path / "state.json")
+    tasks = [_task(1)]
+    mem.save_tasks(tasks, tasks_file)
+    tasks[0].status = "bogus"
+    with pytest.raises(ValidationError):
+        mem.record_status(tasks[0], tasks, tasks_file)
+    assert not (tmp_path / "tasks.yml.journal").exists()
@@ -0,0 +1,33 @@
+from core.metric_history import MetricHistory
+
+
+def test_metric_history_records_only_changed_versions(tmp_path):
+    history = MetricHistory(tmp_path / "history.sqlite3")
+
+    assert history.record([("a.py", None, "d1", 2, 80.0)]) == 1
+    assert history.record([("a.py", None, "d1", 2, 80.0)]) == 0
+    assert history.known("a.py")
+    assert not history.known("b.py")
+    assert history.history("a.py") == {}
+
+    assert history.record([("a.py", "rev", "d2", 5, 70.0)]) == 1
+    assert history.history("a.py") == {
+        "previous_complexity": 2,
+        "current_complexity": 5,
+        "delta_complexity": 3,
+        "previous_mi": 80.0,
+        "current_mi": 70.0,
+        "delta_mi": -10.0,
+    }
+    history.close()
+
+
+def test_metric_history_persists(tmp_path):
+    db = tmp_path / "history.sqlite3"
+    history = MetricHistory(db)
+    history.record([("a.py", None, "d1", 1, 90.0), ("a.py", None, "d2", 3, 85.0)])
+    history.close()
+
+    reopened = MetricHistory(db)
+    assert reopened.history("a.py")["delta_complexity"] == 2
+    reopened.close()
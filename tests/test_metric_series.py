@@ -0,0 +1,41 @@
+from core.metric_series import MetricSeries
+
+
+def test_window_means_use_running_sums(tmp_path):
+    series = MetricSeries(tmp_path / "series.sqlite3")
+    for ts, value in [(10, 1.0), (20, 2.0), (30, 3.0), (40, 6.0)]:
+        series.append({"avg_complexity": value, "done_tasks": ts}, ts=ts)
+
+    window = series.window(25, end=40)
+    assert window.count == 3
+    assert window.means["avg_complexity"] == (2.0 + 3.0 + 6.0) / 3
+    assert window.first["done_tasks"] == 20
+    assert window.last["done_tasks"] == 40
+
+    assert series.window(5, end=40).count == 1
+    assert series.window(5, end=8) is None
+    series.close()
+
+
+def test_database_is_created_on_first_append(tmp_path):
+    path = tmp_path / "series.sqlite3"
+    series = MetricSeries(path)
+    assert series.window(10, end=10) is None
+    assert not path.exists()
+
+    series.append({"avg_complexity": 1.0}, ts=5)
+    assert path.exists()
+    assert series.window(10, end=10).count == 1
+    series.close()
+
+
+def test_clock_stepping_back_keeps_window_consistent(tmp_path):
+    series = MetricSeries(tmp_path / "series.sqlite3")
+    series.append({"avg_complexity": 1.0}, ts=100)
+    series.append({"avg_complexity": 3.0}, ts=90)
+
+    window = series.window(50, end=120)
+    assert window.count == 2
+    assert window.means["avg_complexity"] == 2.0
+    assert window.last["ts"] == 100
+    series.close()
@@ -0,0 +1,70 @@
+from core.backlog_analytics import BacklogAnalytics
+from core.near_duplicates import NearDuplicateIndex, jaccard, minhash, shingles
+
+
+def test_shingles_normalize_case_and_numbers():
+    assert shingles("Clean up 3 duplicate tasks") == shingles("clean up 12 duplicate tasks")
+    assert shingles("Refactor") == frozenset(["refactor"])
+    assert shingles("") == frozenset()
+
+
+def test_minhash_estimates_jaccard():
+    a = shingles("improve error handling in the executor when commands fail with a timeout")
+    b = shingles("improve error handling in the executor when commands fail with an error")
+    sig_a, sig_b = minhash(a, num_perm=256), minhash(b, num_perm=256)
+    estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / 256
+    assert abs(estimate - jaccard(a, b)) < 0.15
+
+
+def test_index_clusters_similar_texts_only():
+    index = NearDuplicateIndex()
+    index.add("a", "Improve error handling in core/executor.py")
+    index.add("b", "Write architecture documentation for the planner")
+    index.add("c", "Improve error handling in core/executor.py properly")
+    index.add("d", "improve ERROR handling in core/executor.py")
+    index.add("e", "Write architecture documentation for the planner module")
+
+    assert index.clusters() == [["a", "c", "d"], ["b", "e"]]
+
+
+def test_index_keeps_groups_apart():
+    index = NearDuplicateIndex()
+    index.add(1, "Refactor core/a.py - Max complexity: 20", group="core/a.py")
+    index.add(2, "Refactor core/b.py - Max complexity: 20", group="core/b.py")
+    index.add(3, "Refactor core/a.py - Max complexity: 25", group="core/a.py")
+
+    assert index.clusters() == [[1, 3]]
+
+
+def test_backlog_reports_open_near_duplicates():
+    tasks = [
+        {"id": 1, "description": "Clean up 3 duplicate tasks", "status": "pending"},
+        {"id": 2, "description": "Clean up 4 duplicate tasks", "status": "pending"},
+        {"id": 3, "description": "Clean up 5 duplicate tasks", "status": "done"},
+        {"id": 4, "description": "Clean up 4 duplicate tasks", "status": "pending"},
+    ]
+
+    analysis = BacklogAnalytics(tasks).task_analysis()
+
+    assert analysis["near_duplicate_tasks"] == [
+        {"task_ids": [1, 2], "descriptions": ["Clean up 3 duplicate tasks", "Clean up 4 duplicate tasks"]}
+    ]
+    assert analysis["duplicate_tasks"] == [{"description": "Clean up 4 duplicate tasks", "task_ids": [2, 4]}]
+
+
+def test_backlog_indexes_descriptions_on_first_query(monkeypatch):
+    from core import near_duplicates
+
+    signed = []
+    original = near_duplicates._signature
+    monkeypatch.setattr(near_duplicates, "_signature", lambda *args: signed.append(args[0]) or original(*args))
+    backlog = BacklogAnalytics([
+        {"id": 1, "description": "Write the user guide", "status": "pending"},
+        {"id": 2, "description": "Write the user guide again", "status": "pending"},
+    ])
+    assert signed == []
+
+    assert len(backlog.near_duplicates) == 2
+    assert len(signed) == 2
+    backlog.add({"id": 3, "description": "Profile the scheduler", "status": "pending"})
+    assert len(backlog.near_duplicates) == 3
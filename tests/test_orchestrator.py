@@ -1,5 +1,4 @@
 import unittest
-from dataclasses import asdict
 from unittest.mock import Mock, MagicMock, call, patch
 import yaml
 from pathlib import Path
@@ -13,6 +12,7 @@ from core.reflector import Reflector
 from core.memory import Memory
 from core.self_auditor import SelfAuditor
 from core.orchestrator import Orchestrator
+from core.task_table import TaskTable
 
 
 class TestOrchestrator(unittest.TestCase):
@@ -50,7 +50,7 @@ class TestOrchestrator(unittest.TestCase):
 
         task1_planned = Task(id="t1", description="Task 1", component="test", dependencies=[], priority=1, status="pending")
 
-        self.mock_memory.load_tasks.return_value = initial_tasks
+        self.mock_memory.load_table.return_value = initial_tasks
         self.mock_reflector.run_cycle.return_value = reflected_tasks
 
         # Planner will return task1 first, then None to terminate
@@ -60,20 +60,23 @@ class TestOrchestrator(unittest.TestCase):
             self.orchestrator.run(tasks_file)
 
         # Verify initial load
-        self.mock_memory.load_tasks.assert_called_once_with(tasks_file)
+        self.mock_memory.load_table.assert_called_once_with(tasks_file)
 
         # Verify reflector call
-        self.mock_reflector.run_cycle.assert_called_once_with([asdict(t) for t in initial_tasks])
+        self.mock_reflector.run_cycle.assert_called_once_with(initial_tasks)
         self.mock_memory.save_tasks.assert_any_call(reflected_tasks, tasks_file)  # First save after reflection
 
         # Verify planner calls (called twice: once for task1, once for None)
         self.mock_planner.plan.assert_has_calls([call(reflected_tasks), call(reflected_tasks)])
 
         # Verify task1 status updates and save calls
-        # 1. After reflection
-        # 2. Status to "in_progress"
-        # 3. Status to "done"
-        self.assertEqual(self.mock_memory.save_tasks.call_count, 3)
+        # 1. Full save after reflection
+        # 2. Status to "in_progress" is journaled
+        # 3. Status to "done" is journaled
+        # 4. The journal is compacted at the end of the run
+        self.assertEqual(self.mock_memory.save_tasks.call_count, 1)
+        self.assertEqual(self.mock_memory.record_status.call_count, 2)
+        self.mock_memory.compact_tasks.assert_called_once_with(reflected_tasks, tasks_file)
 
         # Check specific calls for task1_planned
         # Note: reflected_tasks list is modified in place by the orchestrator for status.
@@ -109,13 +112,14 @@ class TestOrchestrator(unittest.TestCase):
         self.assertEqual(task1_planned.status, "done")
 
         # Check the sequence of save_tasks more carefully for status changes
-        # Call 1: After reflector.run_cycle
+        # save_tasks: After reflector.run_cycle
         #   reflected_tasks might have new tasks. Task1 is not yet processed.
-        # Call 2: Task1 status -> "in_progress"
-        # Call 3: Task1 status -> "done"
+        # record_status 1: Task1 status -> "in_progress"
+        # record_status 2: Task1 status -> "done"
 
         args_list = self.mock_memory.save_tasks.call_args_list
-        self.assertEqual(len(args_list), 3)
+        self.assertEqual(len(args_list), 1)
+        self.mock_memory.record_status.assert_called_with(task1_planned, reflected_tasks, tasks_file)
 
         # Call 1: after reflection
         self.assertEqual(args_list[0], call(reflected_tasks, tasks_file))
@@ -147,7 +151,7 @@ class TestOrchestrator(unittest.TestCase):
         self.mock_executor.reset_mock() # Resetting this mock means we need to re-assign side_effect
 
         self.mock_executor.execute.side_effect = execute_side_effect # Re-assign after reset
-        self.mock_memory.load_tasks.return_value = initial_tasks
+        self.mock_memory.load_table.return_value = initial_tasks
         self.mock_reflector.run_cycle.return_value = reflected_tasks
         task1_planned.status = "pending" # Reset status before rerun
         self.mock_planner.plan.side_effect = [task1_planned, None]
@@ -157,17 +161,18 @@ class TestOrchestrator(unittest.TestCase):
 
         # Now the execute_side_effect assertion would have run.
         # And we can re-verify other calls.
-        self.mock_memory.load_tasks.assert_called_once_with(tasks_file)
-        self.mock_reflector.run_cycle.assert_called_once_with([asdict(t) for t in initial_tasks])
+        self.mock_memory.load_table.assert_called_once_with(tasks_file)
+        self.mock_reflector.run_cycle.assert_called_once_with(initial_tasks)
         self.mock_executor.execute.assert_called_once_with(task1_planned)
         self.assertEqual(task1_planned.status, "done") # Final status
-        self.assertEqual(self.mock_memory.save_tasks.call_count, 3)
+        self.assertEqual(self.mock_memory.save_tasks.call_count, 1)
+        self.assertEqual(self.mock_memory.record_status.call_count, 2)
 
     def test_auditor_generated_tasks_are_appended(self):
         tasks_file = "audit.yml"
         base_task = Task(id=1, description="base", component="core", dependencies=[], priority=1, status="pending")
 
-        self.mock_memory.load_tasks.return_value = [base_task]
+        self.mock_memory.load_table.return_value = TaskTable([base_task])
         self.mock_reflector.run_cycle.return_value = [base_task]
         self.mock_planner.plan.side_effect = [base_task, None]
 
@@ -185,22 +190,23 @@ class TestOrchestrator(unittest.TestCase):
             self.orchestrator.run(tasks_file)
 
         self.mock_auditor.audit.assert_called()
-        # After audit there should be an extra save with the new task appended
-        args = self.mock_memory.save_tasks.call_args_list[-1].args[0]
+        # After audit the new task should be appended and journaled
+        new_tasks, args, _ = self.mock_memory.record_tasks.call_args.args
         self.assertEqual(len(args), 2)
         self.assertEqual(args[-1].description, "Refactor foo.py")
+        self.assertEqual([t.id for t in new_tasks], [2])
 
 
     def test_run_loop_no_tasks_from_memory_and_no_new_tasks_from_reflector(self):
         tasks_file = "empty_tasks.yml"
-        self.mock_memory.load_tasks.return_value = []  # No tasks loaded
+        self.mock_memory.load_table.return_value = []  # No tasks loaded
         self.mock_reflector.run_cycle.return_value = [] # No new tasks from reflector
         self.mock_planner.plan.return_value = None # Planner finds nothing to do
 
         with patch('builtins.print') as mock_print:
             self.orchestrator.run(tasks_file)
 
-        self.mock_memory.load_tasks.assert_called_once_with(tasks_file)
+        self.mock_memory.load_table.assert_called_once_with(tasks_file)
         self.mock_reflector.run_cycle.assert_called_once_with([])
         self.mock_memory.save_tasks.assert_called_once_with([], tasks_file) # Saved empty list after reflection
         self.mock_planner.plan.assert_called_once_with([]) # Called with empty list
@@ -209,32 +215,34 @@ class TestOrchestrator(unittest.TestCase):
     def test_run_loop_terminates_when_planner_returns_none(self):
         tasks_file = "tasks.yml"
         initial_tasks = [Task(id="t1", description="", component="test", dependencies=[], priority=1, status="pending")]
-        self.mock_memory.load_tasks.return_value = initial_tasks
+        self.mock_memory.load_table.return_value = initial_tasks
         self.mock_reflector.run_cycle.return_value = initial_tasks # Reflector adds no new tasks
         self.mock_planner.plan.return_value = None # Planner immediately says nothing to do
 
         with patch('builtins.print') as mock_print:
             self.orchestrator.run(tasks_file)
 
-        self.mock_memory.load_tasks.assert_called_once_with(tasks_file)
-        self.mock_reflector.run_cycle.assert_called_once_with([asdict(t) for t in initial_tasks])
+        self.mock_memory.load_table.assert_called_once_with(tasks_file)
+        self.mock_reflector.run_cycle.assert_called_once_with(initial_tasks)
         self.mock_memory.save_tasks.assert_called_once_with(initial_tasks, tasks_file) # After reflection
         self.mock_planner.plan.assert_called_once_with(initial_tasks)
         self.mock_executor.execute.assert_not_called()
 
-    def test_run_handles_load_tasks_returning_none(self):
+    def test_run_handles_load_table_returning_none(self):
         tasks_file = "non_existent_tasks.yml"
-        self.mock_memory.load_tasks.return_value = None # Simulate file not found / load error
+        self.mock_memory.load_table.return_value = None # Simulate file not found / load error
         self.mock_reflector.run_cycle.return_value = [] # Reflector works with empty list
         self.mock_planner.plan.return_value = None
 
         with patch('builtins.print') as mock_print:
             self.orchestrator.run(tasks_file)
 
-        self.mock_memory.load_tasks.assert_called_once_with(tasks_file)
-        self.mock_reflector.run_cycle.assert_called_once_with([]) # Called with empty list
-        self.mock_memory.save_tasks.assert_called_once_with([], tasks_file)
-        self.mock_planner.plan.assert_called_once_with([])
+        self.mock_memory.load_table.assert_called_once_with(tasks_file)
+        (table,), _ = self.mock_reflector.run_cycle.call_args # Called with an empty table
+        self.assertIsInstance(table, TaskTable)
+        self.assertEqual(len(table), 0)
+        self.mock_memory.save_tasks.assert_called_once_with(table, tasks_file)
+        self.mock_planner.plan.assert_called_once_with(table)
         self.mock_executor.execute.assert_not_called()
 
     def test_run_task_missing_status_attribute(self):
@@ -246,7 +254,7 @@ class TestOrchestrator(unittest.TestCase):
 
         initial_tasks = [task_no_status]
 
-        self.mock_memory.load_tasks.return_value = initial_tasks
+        self.mock_memory.load_table.return_value = initial_tasks
         self.mock_reflector.run_cycle.return_value = initial_tasks
         self.mock_planner.plan.side_effect = [task_no_status, None] # Planner returns this malformed task
 
@@ -321,5 +329,213 @@ class TestOrchestrator(unittest.TestCase):
         assert data[1]['description'] == 'reflector task'
 
 
+class TestOrchestratorParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = MagicMock(spec=Memory)
+        self.auditor = MagicMock(spec=SelfAuditor)
+        self.auditor.audit.return_value = []
+        self.reflector = MagicMock(spec=Reflector)
+        self.reflector.run_cycle.return_value = None
+
+    def _task(self, id, dependencies=None, priority=1):
+        return Task(id=id, description=f"task {id}", component="test",
+                    dependencies=dependencies or [], priority=priority, status="pending")
+
+    def test_independent_tasks_run_concurrently(self):
+        import threading
+        import time
+
+        tasks = [self._task(i) for i in range(4)]
+        self.memory.load_table.return_value = tasks
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        class SleepyExecutor:
+            def execute(self, task):
+                with lock:
+                    active.append(task.id)
+                    peak.append(len(active))
+                time.sleep(0.2)
+                with lock:
+                    active.remove(task.id)
+
+        orch = Orchestrator(Planner(), SleepyExecutor(), self.reflector, self.memory, self.auditor)
+        with patch('builtins.print'):
+            orch.run("parallel.yml", workers=4)
+
+        self.assertTrue(all(t.status == "done" for t in tasks))
+        self.assertEqual(max(peak), 4)
+
+    def test_dependents_start_after_dependencies_finish(self):
+        import threading
+
+        first = self._task("first", priority=5)
+        second = self._task("second", dependencies=["first"])
+        unrelated = self._task("unrelated")
+        self.memory.load_table.return_value = [second, first, unrelated]
+        order = []
+        lock = threading.Lock()
+
+        class RecordingExecutor:
+            def execute(self, task):
+                if task.id == "second":
+                    assert first.status == "done"
+                with lock:
+                    order.append(task.id)
+
+        orch = Orchestrator(Planner(), RecordingExecutor(), self.reflector, self.memory, self.auditor)
+        with patch('builtins.print'):
+            orch.run("parallel.yml", workers=2)
+
+        self.assertEqual(sorted(order), ["first", "second", "unrelated"])
+        self.assertLess(order.index("first"), order.index("second"))
+
+    def test_audit_tasks_are_scheduled_in_parallel_mode(self):
+        self.memory.load_table.return_value = TaskTable([self._task(1)])
+        self.auditor.audit.side_effect = [[{
+            "id": 2,
+            "description": "Refactor foo.py",
+            "component": "refactor",
+            "dependencies": [1],
+            "priority": 2,
+            "status": "pending",
+        }], []]
+        executor = MagicMock(spec=Executor)
+
+        orch = Orchestrator(Planner(), executor, self.reflector, self.memory, self.auditor)
+        with patch('builtins.print'):
+            orch.run("parallel.yml", workers=2)
+
+        executed = [c.args[0].id for c in executor.execute.call_args_list]
+        self.assertEqual(executed, [1, 2])
+
+    def test_failed_commands_mark_tasks_failed(self):
+        from core.executor import CommandOutput, OutputBuffer
+
+        first = self._task(1)
+        dependent = self._task(2, dependencies=[1])
+        other = self._task(3)
+
+        class FailingExecutor:
+            def __init__(self):
+                self.executed = []
+
+            def execute(self, task):
+                self.executed.append(task.id)
+                return CommandOutput(
+                    returncode=1 if task.id == 1 else 0,
+                    log_file=Path("task.log"),
+                    stdout=OutputBuffer(0, 0),
+                    stderr=OutputBuffer(0, 0),
+                    timed_out=task.id == 3,
+                )
+
+        for workers in (1, 2):
+            table = TaskTable([first, dependent, other])
+            self.memory.load_table.return_value = table
+            executor = FailingExecutor()
+            orch = Orchestrator(Planner(), executor, self.reflector, self.memory, self.auditor)
+            with patch('builtins.print'):
+                orch.run("failing.yml", workers=workers)
+
+            self.assertEqual(sorted(executor.executed), [1, 3])
+            self.assertEqual([t.status for t in table], ["failed", "pending", "failed"])
+
+    def test_only_free_worker_slots_are_filled(self):
+        import threading
+
+        table = TaskTable([self._task(i) for i in range(6)])
+        self.memory.load_table.return_value = table
+        in_progress = []
+        lock = threading.Lock()
+
+        class CountingExecutor:
+            def execute(self, task):
+                with lock:
+                    in_progress.append(table.status_count("in_progress"))
+                if task.id == 0:
+                    raise RuntimeError("boom")
+
+        orch = Orchestrator(Planner(), CountingExecutor(), self.reflector, self.memory, self.auditor)
+        with patch('builtins.print'):
+            orch.run("parallel.yml", workers=2)
+
+        self.assertEqual(len(in_progress), 6)
+        self.assertLessEqual(max(in_progress), 2)
+        self.assertEqual([t.status for t in table], ["failed"] + ["done"] * 5)
+
+
+    def test_dependents_are_dispatched_before_the_audit(self):
+        table = TaskTable([self._task(1), self._task(2, dependencies=[1])])
+        self.memory.load_table.return_value = table
+        statuses = []
+        self.auditor.audit.side_effect = lambda tasks: statuses.append([t.status for t in tasks]) or []
+        executor = MagicMock(spec=Executor)
+
+        orch = Orchestrator(Planner(), executor, self.reflector, self.memory, self.auditor)
+        with patch('builtins.print'):
+            orch.run("parallel.yml", workers=2)
+
+        self.assertEqual(statuses[0], ["done", "in_progress"])
+        self.assertEqual(len(statuses), 2)
+
+
+class TestOrchestratorBackgroundAudit(unittest.TestCase):
+
+    def setUp(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.memory = MagicMock(spec=Memory)
+        self.reflector = MagicMock(spec=Reflector)
+        self.reflector.run_cycle.return_value = None
+        self.auditor = MagicMock(spec=SelfAuditor)
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(self.pool.shutdown)
+        self.audit_results = []
+        self.auditor.audit_async.side_effect = lambda existing: self.pool.submit(
+            lambda: self.audit_results.pop(0) if self.audit_results else []
+        )
+
+    def _task(self, id, dependencies=None):
+        return Task(id=id, description=f"task {id}", component="test",
+                    dependencies=dependencies or [], priority=1, status="pending")
+
+    def _run(self, tasks, workers):
+        self.memory.load_table.return_value = TaskTable(tasks)
+        executor = MagicMock(spec=Executor)
+        orch = Orchestrator(Planner(), executor, self.reflector, self.memory,
+                            self.auditor, background_audit=True)
+        with patch('builtins.print'):
+            orch.run("background.yml", workers=workers)
+        return [c.args[0].id for c in executor.execute.call_args_list]
+
+    def test_audit_runs_off_the_critical_path(self):
+        self.audit_results = [[{
+            "id": 3,
+            "description": "Refactor foo.py",
+            "component": "refactor",
+            "dependencies": [],
+            "priority": 1,
+            "status": "pending",
+        }]]
+
+        executed = self._run([self._task(1), self._task(2)], workers=1)
+
+        self.auditor.audit.assert_not_called()
+        self.assertEqual(sorted(executed), [1, 2, 3])
+        new_tasks = self.memory.record_tasks.call_args.args[0]
+        self.assertEqual([t.id for t in new_tasks], [3])
+
+    def test_overlapping_audits_are_coalesced(self):
+        executed = self._run([self._task(i) for i in range(5)], workers=2)
+
+        self.assertEqual(sorted(executed), [0, 1, 2, 3, 4])
+        self.assertGreaterEqual(self.auditor.audit_async.call_count, 1)
+        self.assertLessEqual(self.auditor.audit_async.call_count, 5)
+        self.memory.record_tasks.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
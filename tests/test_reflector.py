@@ -1,4 +1,5 @@
 import yaml  # noqa: E402
+from core.backlog_analytics import BacklogAnalytics  # noqa: E402
 from core.reflector import Reflector  # noqa: E402
 
 
@@ -58,3 +59,120 @@ def test_reflector_collects_metrics(tmp_path):
     analysis = refl.analyze()
     assert analysis.get("observability_metrics") == {"coverage": 90}
 
+
+
+def test_reflector_only_analyzes_changed_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "a.py").write_text("def a():\n    return 1\n")
+    (tmp_path / "b.py").write_text("def b():\n    return 2\n")
+    refl = Reflector(tasks_path=tmp_path / "tasks.yml")
+    analyzed = []
+    original = refl.self_auditor.analyze
+    monkeypatch.setattr(
+        refl.self_auditor, "analyze", lambda paths: analyzed.append(sorted(map(str, paths))) or original(paths)
+    )
+
+    first = refl.analyze()["code_metrics"]
+    (tmp_path / "b.py").write_text("def b(x):\n    if x:\n        return 2\n    return 3\n")
+    second = refl.analyze()["code_metrics"]
+
+    assert analyzed == [["b.py", "core/a.py"], ["b.py"]]
+    assert first["total_files"] == second["total_files"] == 2
+
+
+def test_reflector_reuses_decisions_when_inputs_unchanged(tmp_path, monkeypatch):
+    tasks_file = tmp_path / "tasks.yml"
+    code_file = tmp_path / "module.py"
+    code_file.write_text("def f():\n    return 1\n")
+    tasks = [
+        {"id": 1, "description": "same", "component": "core", "dependencies": [], "priority": 1, "status": "done"},
+        {"id": 2, "description": "same", "component": "core", "dependencies": [], "priority": 1, "status": "done"},
+    ]
+    refl = Reflector(tasks_path=tasks_file, analysis_paths=[code_file])
+    outcomes = []
+    monkeypatch.setattr(refl._cycles, "add", lambda amount, attrs: outcomes.append(attrs["reflector.cycle"]))
+    analyzed = []
+    original = refl.analyze
+    monkeypatch.setattr(refl, "analyze", lambda *args: analyzed.append(1) or original(*args))
+
+    built = []
+    monkeypatch.setattr(
+        "core.reflector.BacklogAnalytics", lambda tasks: built.append(1) or BacklogAnalytics(tasks)
+    )
+    executed = []
+    original_execute = refl.execute
+    monkeypatch.setattr(refl, "execute", lambda *args: executed.append(1) or original_execute(*args))
+
+    first = refl.run_cycle(list(tasks))
+    saved = tasks_file.read_text()
+    second = refl.run_cycle(list(tasks))
+    assert tasks_file.read_text() == saved
+    code_file.write_text("def f():\n    return 2\n")
+    refl.run_cycle(list(tasks))
+
+    assert outcomes == ["fresh", "cached", "fresh"]
+    assert len(analyzed) == len(executed) == 2
+    assert len(built) == 2
+    assert [t["description"] for t in second] == [t["description"] for t in first]
+    assert len(first) == 3
+
+
+def test_reflector_cached_cycle_merges_scope(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.py").write_text("def a():\n    return 1\n")
+    refl = Reflector(tasks_path=tmp_path / "tasks.yml")
+    outcomes = []
+    monkeypatch.setattr(refl._cycles, "add", lambda amount, attrs: outcomes.append(attrs["reflector.cycle"]))
+    merged = []
+    original = refl.scope.merge
+    monkeypatch.setattr(refl.scope, "merge", lambda metrics: merged.append(metrics) or original(metrics))
+
+    refl.run_cycle([])
+    refl.run_cycle([])
+
+    assert outcomes == ["fresh", "cached"]
+    assert len(merged) == 2
+    assert refl.scope._pending == {}
+
+
+def test_reflector_collects_metrics_once_per_cycle(tmp_path):
+    metrics_file = tmp_path / "metrics.json"
+    metrics_file.write_text('{"coverage": 90}')
+    provider = MetricsProvider(metrics_file)
+    calls = []
+    original = provider.collect
+    provider.collect = lambda: calls.append(1) or original()
+    refl = Reflector(
+        tasks_path=tmp_path / "tasks.yml", analysis_paths=[tmp_path / "none.py"], metrics_provider=provider
+    )
+
+    refl.run_cycle([])
+    refl.run_cycle([])
+
+    assert len(calls) == 2
+
+
+def test_reflector_evolution_trends_from_recorded_cycles(tmp_path):
+    day = 86400
+    refl = Reflector(tasks_path=tmp_path / "tasks.yml", analysis_paths=[tmp_path / "none.py"], trend_window=7 * day)
+    assert refl._analyze_evolution_trends(now=0)["complexity_trend"] == "unknown"
+
+    samples = [(0, 2.0, 0), (day, 2.0, 1), (8 * day, 4.0, 4), (10 * day, 4.0, 10)]
+    for ts, complexity, done in samples:
+        refl.series.append({"avg_complexity": complexity, "done_tasks": done, "completion_rate": done / 10}, ts=ts)
+
+    trends = refl._analyze_evolution_trends(now=10 * day)
+    assert trends["complexity_trend"] == "increasing"
+    assert trends["feature_velocity"] == 3.0
+    assert trends["task_completion_rate"] == 0.7
+
+
+def test_reflector_logs_invalid_tasks_and_continues(tmp_path, caplog):
+    tasks_file = tmp_path / "tasks.yml"
+    tasks_file.write_text("- id: 1\n  description: broken\n  status: unknown\n")
+    refl = Reflector(tasks_path=tasks_file, analysis_paths=[tmp_path / "none.py"])
+
+    with caplog.at_level("ERROR"):
+        assert refl._load_tasks() == []
+    assert "Invalid task" in caplog.text
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from core.memory import Memory
+from core.reflector import Reflector
+from core.reflector_daemon import ReflectorDaemon
+from core.task import Task
+
+
+def _reflector(tmp_path, *files):
+    return Reflector(tasks_path=tmp_path / "tasks.yml", analysis_paths=[tmp_path / f for f in files])
+
+
+def test_process_updates_only_touched_files(tmp_path):
+    (tmp_path / "a.py").write_text("def a():\n    return 1\n")
+    (tmp_path / "b.py").write_text("def b():\n    return 1\n")
+    refl = _reflector(tmp_path, "a.py", "b.py")
+    daemon = ReflectorDaemon(refl, root=tmp_path, use_watchdog=False)
+    daemon._initial_analysis()
+    before = dict(daemon.metrics)
+    assert sorted(before) == ["a.py", "b.py"]
+
+    analyzed = []
+    original = refl.self_auditor.analyze
+    refl.self_auditor.analyze = lambda paths: analyzed.append([p.name for p in paths]) or original(paths)
+    (tmp_path / "a.py").write_text("def a(x):\n    if x:\n        return 1\n    return 2\n")
+    (tmp_path / "b.py").unlink()
+    daemon.process(["a.py", "b.py"])
+
+    assert analyzed == [["a.py"]]
+    assert sorted(daemon.metrics) == ["a.py"]
+    assert daemon.metrics["a.py"]["max_complexity"] == 2
+
+
+def test_polling_daemon_debounces_changes(tmp_path):
+    target = tmp_path / "a.py"
+    target.write_text("def a():\n    return 1\n")
+    refl = _reflector(tmp_path, "a.py")
+    batches = []
+    done = threading.Event()
+    daemon = ReflectorDaemon(refl, root=tmp_path, debounce=0.3, poll_interval=0.05, use_watchdog=False)
+    original = daemon.process
+    daemon.process = lambda paths: (batches.append(sorted(paths)), original(paths), done.set())
+
+    daemon.start()
+    try:
+        for n in range(3):
+            target.write_text("def a():\n    return %d\n" % (n + 10))
+            time.sleep(0.1)
+        assert done.wait(5)
+    finally:
+        daemon.stop()
+
+    assert batches == [["a.py"]]
+
+
+def test_touch_ignores_files_outside_scope(tmp_path):
+    refl = _reflector(tmp_path, "a.py")
+    daemon = ReflectorDaemon(refl, root=tmp_path, use_watchdog=False)
+
+    daemon.touch([str(tmp_path / "other.py"), str(tmp_path / "a.py"), "/elsewhere/a.py"])
+
+    assert daemon._pending == {"a.py"}
+
+
+def _task(task_id, description):
+    return Task(id=task_id, description=description, component="core", dependencies=[], priority=3, status="pending")
+
+
+def test_repeated_batches_keep_backlog_stable(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    memory = Memory(tmp_path / "state.json")
+    backlog = [_task(n, f"Pending work item {n}") for n in range(1, 23)] + [_task(23, "Pending work item 1")]
+    memory.save_tasks(backlog, tasks_file)
+    memory.record_tasks([_task(24, "Journaled task")], backlog, tasks_file)
+    target = tmp_path / "a.py"
+    target.write_text("def a():\n    return 1\n")
+    refl = Reflector(tasks_path=tasks_file, analysis_paths=[target], memory=memory)
+    daemon = ReflectorDaemon(refl, root=tmp_path, use_watchdog=False)
+    daemon._initial_analysis()
+
+    counts = []
+    for n in range(3):
+        target.write_text("def a():\n    return %d\n" % n)
+        daemon.process(["a.py"])
+        counts.append(len(memory.load_task_data(tasks_file)))
+
+    tasks = memory.load_task_data(tasks_file)
+    assert counts == [26, 26, 26]
+    assert sorted(t["metadata"]["decision_type"] for t in tasks if "metadata" in t) == [
+        "process_improvement",
+        "task_cleanup",
+    ]
+    assert 24 in {t["id"] for t in tasks}
+    assert len(memory._journal(tasks_file)) == 0
@@ -0,0 +1,106 @@
+import os
+import sys
+from unittest.mock import patch
+
+from core.executor import Executor
+from core.result_cache import ResultCache
+from core.task import Task
+
+
+def _task(command, inputs):
+    return Task(
+        id="cached",
+        description="Cached command",
+        component="test",
+        dependencies=[],
+        priority=1,
+        status="pending",
+        command=command,
+        inputs=inputs,
+    )
+
+
+def test_key_covers_command_env_and_inputs(tmp_path, monkeypatch):
+    cache = ResultCache(root=tmp_path / "cache", env=["MODE"])
+    (tmp_path / "a.txt").write_text("one")
+    monkeypatch.setenv("MODE", "x")
+    key = cache.key("cat a.txt", ["*.txt"], cwd=tmp_path)
+
+    assert cache.key("cat a.txt", ["*.txt"], cwd=tmp_path) == key
+    assert cache.key("cat  a.txt", ["*.txt"], cwd=tmp_path) != key
+    monkeypatch.setenv("MODE", "y")
+    assert cache.key("cat a.txt", ["*.txt"], cwd=tmp_path) != key
+    monkeypatch.setenv("MODE", "x")
+    (tmp_path / "b.txt").write_text("two")
+    assert cache.key("cat a.txt", ["*.txt"], cwd=tmp_path) != key
+    (tmp_path / "b.txt").unlink()
+    (tmp_path / "a.txt").write_text("changed")
+    assert cache.key("cat a.txt", ["*.txt"], cwd=tmp_path) != key
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(root=tmp_path / "cache", max_bytes=2500)
+    log = tmp_path / "log"
+    log.write_bytes(b"x" * 1000)
+    for key in ("aa1", "bb2"):
+        cache.put(key, {"returncode": 0}, log)
+        os.utime(tmp_path / "cache" / key[:2] / f"{key}.json", ns=(1, 1))
+        os.utime(tmp_path / "cache" / key[:2] / f"{key}.log", ns=(1, 1))
+    assert cache.get("aa1") is not None  # refreshes aa1
+
+    cache.put("cc3", {"returncode": 0}, log)
+
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None
+    assert cache.get("cc3") is not None
+
+
+@patch("builtins.print")
+def test_executor_replays_cached_results(_print, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input.txt").write_text("data")
+    counter = tmp_path / "runs"
+    script = f"import sys; open({str(counter)!r}, 'a').write('x'); print(open('input.txt').read()); sys.exit(3)"
+    command = f'{sys.executable} -c "{script}"'
+    executor = Executor(log_dir=tmp_path / "logs", result_cache=ResultCache(root=tmp_path / "cache"))
+
+    first = executor.execute(_task(command, ["input.txt"]))
+    second = executor.execute(_task(command, ["input.txt"]))
+
+    assert counter.read_text() == "x"
+    assert not first.cached and second.cached
+    assert second.returncode == first.returncode == 3
+    assert second.stdout.text() == first.stdout.text() == "data\n"
+    assert second.log_file.read_text() == "data\n"
+
+    (tmp_path / "input.txt").write_text("new")
+    third = executor.execute(_task(command, ["input.txt"]))
+    assert not third.cached and third.stdout.text() == "new\n"
+
+    executor.execute(_task(command, None))
+    assert counter.read_text() == "xxx"
+
+
+def test_key_covers_limits_and_absolute_inputs(tmp_path):
+    cache = ResultCache(root=tmp_path / "cache")
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.txt").write_text("one")
+    work = tmp_path / "work"
+    work.mkdir()
+    pattern = str(data / "*.txt")
+    key = cache.key("cat", [pattern], cwd=work, limits={"timeout": 1})
+
+    assert cache.key("cat", [pattern], cwd=work, limits={"timeout": 2}) != key
+    assert cache.key("cat", [pattern], cwd=work, limits={"timeout": 1, "memory_limit": 10}) != key
+    (data / "a.txt").write_text("two")
+    assert cache.key("cat", [pattern], cwd=work, limits={"timeout": 1}) != key
+
+
+@patch("builtins.print")
+def test_executor_runs_uncached_on_invalid_pattern(_print, tmp_path):
+    executor = Executor(log_dir=tmp_path / "logs", result_cache=ResultCache(root=tmp_path / "cache"))
+
+    output = executor.execute(_task(f"{sys.executable} -c pass", [""]))
+
+    assert output.returncode == 0 and not output.cached
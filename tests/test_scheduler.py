@@ -0,0 +1,142 @@
+import time
+import unittest
+
+from core.planner import Planner
+from core.scheduler import TaskScheduler
+from core.task import Task
+
+
+class TestTaskScheduler(unittest.TestCase):
+
+    def _create_task(self, id, priority, status="pending", dependencies=None):
+        return Task(
+            id=id,
+            description=f"Task {id}",
+            component="test",
+            dependencies=dependencies or [],
+            priority=priority,
+            status=status,
+        )
+
+    def test_empty_scheduler(self):
+        self.assertIsNone(TaskScheduler().next_task())
+
+    def test_equal_priority_keeps_list_order(self):
+        tasks = [self._create_task(i, 1) for i in range(3)]
+        self.assertEqual(TaskScheduler(tasks).next_task().id, 0)
+
+    def test_dependents_unlocked_when_handed_out_task_is_done(self):
+        dep = self._create_task("dep", 1)
+        main = self._create_task("main", 5, dependencies=["dep"])
+        scheduler = TaskScheduler([main, dep])
+
+        self.assertIs(scheduler.next_task(), dep)
+        dep.status = "in_progress"
+        self.assertIsNone(scheduler.next_task())
+        dep.status = "done"
+        self.assertIs(scheduler.next_task(), main)
+
+    def test_missing_dependency_resolved_by_added_task(self):
+        main = self._create_task("main", 5, dependencies=["later"])
+        scheduler = TaskScheduler([main])
+        self.assertIsNone(scheduler.next_task())
+
+        scheduler.add(self._create_task("later", 1, status="done"))
+        self.assertIs(scheduler.next_task(), main)
+
+    def test_update_reports_external_status_change(self):
+        blocked = self._create_task("blocked", 1, status="in_progress")
+        main = self._create_task("main", 5, dependencies=["blocked"])
+        scheduler = TaskScheduler([blocked, main])
+        self.assertIsNone(scheduler.next_task())
+
+        blocked.status = "done"
+        scheduler.update(blocked)
+        self.assertIs(scheduler.next_task(), main)
+
+        blocked.status = "pending"
+        scheduler.update(blocked)
+        self.assertIs(scheduler.next_task(), blocked)
+
+    def test_update_reports_dependency_change(self):
+        dep = self._create_task("dep", 1, status="in_progress")
+        main = self._create_task("main", 5, dependencies=["dep"])
+        scheduler = TaskScheduler([dep, main])
+        self.assertIsNone(scheduler.next_task())
+
+        main.dependencies = []
+        scheduler.update(main)
+        self.assertIs(scheduler.next_task(), main)
+
+        main.dependencies = ["dep"]
+        scheduler.update(main)
+        self.assertIsNone(scheduler.next_task())
+
+    def test_failed_task_is_no_longer_tracked(self):
+        task = self._create_task("flaky", 1)
+        scheduler = TaskScheduler([task])
+        self.assertEqual(scheduler.pop_ready(), [task])
+
+        task.status = "failed"
+        self.assertEqual(scheduler.pop_ready(), [])
+        self.assertNotIn("flaky", scheduler._outstanding)
+
+    def test_pop_ready_respects_limit(self):
+        tasks = [self._create_task(i, i) for i in range(4)]
+        scheduler = TaskScheduler(tasks)
+
+        self.assertEqual([t.id for t in scheduler.pop_ready(2)], [3, 2])
+        self.assertEqual([t.id for t in scheduler.pop_ready(0)], [])
+        self.assertEqual([t.id for t in scheduler.pop_ready()], [1, 0])
+
+    def test_duplicate_id_rejected(self):
+        scheduler = TaskScheduler([self._create_task("dup", 1)])
+        with self.assertRaises(ValueError):
+            scheduler.add(self._create_task("dup", 2))
+
+    def test_planner_registers_appended_tasks(self):
+        planner = Planner()
+        tasks = [self._create_task(1, 1, status="done")]
+        self.assertIsNone(planner.plan(tasks))
+        scheduler = planner.scheduler(tasks)
+
+        tasks.append(self._create_task(2, 3, dependencies=[1]))
+        self.assertEqual(planner.plan(tasks).id, 2)
+        self.assertIs(planner.scheduler(tasks), scheduler)
+
+    def test_planner_rejects_appended_duplicate(self):
+        planner = Planner()
+        tasks = [self._create_task(1, 1)]
+        planner.plan(tasks)
+        tasks.append(self._create_task(1, 2))
+        with self.assertRaises(ValueError):
+            planner.plan(tasks)
+
+    def test_planner_sees_changes_to_tasks_never_handed_out(self):
+        planner = Planner()
+        dep = self._create_task(1, 1, status="in_progress")
+        main = self._create_task(2, 5, dependencies=[1])
+        tasks = [dep, main]
+        self.assertIsNone(planner.plan(tasks))
+
+        dep.status = "done"
+        self.assertIs(planner.plan(tasks), main)
+
+    def test_long_chain_is_processed_incrementally(self):
+        size = 20000
+        tasks = [
+            self._create_task(i, 1, dependencies=[i - 1] if i else [])
+            for i in range(size)
+        ]
+        planner = Planner()
+        start = time.perf_counter()
+        for expected in range(size):
+            task = planner.plan(tasks)
+            self.assertEqual(task.id, expected)
+            task.status = "done"
+        self.assertIsNone(planner.plan(tasks))
+        self.assertLess(time.perf_counter() - start, 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -64,3 +64,129 @@ def test_self_auditor_wily_history(tmp_path):
     meta = tasks[0]["metadata"]
     assert "delta_complexity" in meta
     assert meta["delta_complexity"] != 0
+
+
+def test_self_auditor_incremental_reanalyzes_changed_files(tmp_path, monkeypatch):
+    first = tmp_path / "first.py"
+    second = tmp_path / "second.py"
+    first.write_text("def foo():\n    return 1\n")
+    second.write_text("def bar():\n    return 2\n")
+    auditor = SelfAuditor()
+    analyzed = []
+    original = auditor._analyze_sources
+
+    def spy(sources, workers=None):
+        analyzed.append(sorted(path.name for path, _ in sources))
+        return original(sources, workers)
+
+    monkeypatch.setattr(auditor, "_analyze_sources", spy)
+
+    baseline = auditor.analyze_incremental([first, second])
+    assert baseline == SelfAuditor().analyze([first, second])
+
+    assert auditor.analyze_incremental([first, second]) == baseline
+
+    second.write_text("def bar(x):\n    if x:\n        return 2\n    return 3\n")
+    updated = auditor.analyze_incremental([first, second])
+
+    assert analyzed == [["first.py", "second.py"], [], ["second.py"]]
+    assert updated[str(first)] == baseline[str(first)]
+    assert updated[str(second)] != baseline[str(second)]
+
+
+def test_self_auditor_audit_async(tmp_path):
+    pyfile = tmp_path / "sample.py"
+    pyfile.write_text(
+        "def foo(x):\n    if x > 1:\n        return 1\n    else:\n        return 0\n"
+    )
+    auditor = SelfAuditor(complexity_threshold=1, incremental=True)
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        new_tasks = auditor.audit_async([]).result(timeout=30)
+    finally:
+        os.chdir(cwd)
+
+    assert new_tasks
+    assert new_tasks[0]["metadata"]["type"] == "refactor"
+
+
+def test_self_auditor_reuses_cached_metrics(tmp_path, monkeypatch):
+    target = tmp_path / "sample.py"
+    target.write_text("def foo(x):\n    if x:\n        return 1\n    return 0\n")
+    cache_root = tmp_path / "cache"
+
+    first = SelfAuditor(complexity_threshold=1)
+    first.cache.root = cache_root
+    expected = first.analyze([target])
+
+    second = SelfAuditor(complexity_threshold=1)
+    second.cache.root = cache_root
+
+    def fail(*_):
+        raise AssertionError("cached file analyzed again")
+
+    monkeypatch.setattr(second, "_analyze_file", fail)
+    assert second.analyze([target]) == expected
+
+    other = SelfAuditor(complexity_threshold=5)
+    other.cache.root = cache_root
+    calls = []
+    original = other._analyze_file
+    monkeypatch.setattr(other, "_analyze_file", lambda *a: calls.append(a) or original(*a))
+    other.analyze([target])
+    assert len(calls) == 1
+
+
+def test_self_auditor_parallel_matches_serial(tmp_path):
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"module_{index}.py"
+        branches = "".join(f"    if x == {n}:\n        return {n}\n" for n in range(index))
+        path.write_text(f"def foo(x):\n{branches}    return -1\n")
+        paths.append(path)
+
+    serial = SelfAuditor(complexity_threshold=2, cache=False).analyze(paths)
+    parallel = SelfAuditor(complexity_threshold=2, cache=False).analyze(paths, workers=3)
+
+    assert parallel == serial
+    assert list(parallel) == [str(path) for path in paths]
+
+
+def test_self_auditor_analyze_matches_radon_for_classes(tmp_path):
+    from radon.complexity import cc_visit
+    from radon.metrics import mi_visit
+
+    source = (
+        "class Foo:\n"
+        "    def bar(self, x):\n"
+        "        if x:\n"
+        "            return 1\n"
+        "        return 0\n"
+        "\n"
+        "def baz():\n"
+        "    return 2\n"
+    )
+    target = tmp_path / "sample.py"
+    target.write_text(source)
+
+    metrics = SelfAuditor(cache=False).analyze([target])[str(target)]
+
+    assert metrics["maintainability"]["mi"] == mi_visit(source, False)
+    assert [(c["name"], c["complexity"]) for c in metrics["complexity"]] == [
+        (block.name, block.complexity) for block in cc_visit(source)
+    ]
+    assert {c["type"] for c in metrics["complexity"]} == {"class", "Foo", "function"}
+
+
+def test_self_auditor_history_without_git(tmp_path):
+    target = tmp_path / "outside_repo.py"
+    target.write_text("def foo(x):\n    return x\n")
+    auditor = SelfAuditor(track_history=True)
+
+    assert "history" not in auditor.analyze([target])[str(target)]
+
+    target.write_text("def foo(x):\n    if x:\n        return 1\n    return 0\n")
+    history = auditor.analyze([target])[str(target)]["history"]
+    assert history["delta_complexity"] == 1
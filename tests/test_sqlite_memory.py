@@ -0,0 +1,155 @@
+import sqlite3
+
+import pytest
+import yaml
+from jsonschema.exceptions import ValidationError
+
+from core.memory import Memory
+from core.sqlite_memory import SQLiteMemory
+from core.task import Task
+
+
+def _task(id, status="pending", dependencies=None, priority=1, component="core"):
+    return Task(
+        id=id,
+        description=f"task {id}",
+        component=component,
+        dependencies=dependencies or [],
+        priority=priority,
+        status=status,
+    )
+
+
+def test_imports_existing_yaml_on_first_load(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    tasks = [_task(1, status="done"), _task(2, dependencies=[1])]
+    Memory(tmp_path / "state.json").save_tasks(tasks, tasks_file)
+
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    assert store.load_tasks(tasks_file) == tasks
+
+    tasks_file.unlink()
+    assert store.load_tasks(tasks_file) == tasks
+
+
+def test_record_status_updates_single_row_and_exports(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    tasks = [_task(1), _task(2)]
+    store.save_tasks(tasks, tasks_file)
+
+    tasks[1].status = "done"
+    store.record_status(tasks[1], tasks, tasks_file)
+    assert yaml.safe_load(tasks_file.read_text())[1]["status"] == "pending"
+
+    store.compact_tasks(tasks, tasks_file)
+    assert yaml.safe_load(tasks_file.read_text())[1]["status"] == "done"
+
+    conn = sqlite3.connect(tmp_path / "tasks.sqlite3")
+    assert conn.execute("SELECT status FROM tasks WHERE id = 2").fetchone() == ("done",)
+
+
+def test_ready_tasks_query(tmp_path):
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    tasks = [
+        _task(1, status="done"),
+        _task(2, dependencies=[1], priority=2),
+        _task(3, dependencies=[4], priority=5),
+        _task(4, status="in_progress"),
+        _task(5, dependencies=[99], priority=5),
+        _task(6, priority=3),
+    ]
+    store.save_tasks(tasks, tmp_path / "tasks.yml")
+
+    assert [t.id for t in store.ready_tasks()] == [6, 2]
+    assert [t.id for t in store.tasks_by_status("pending")] == [2, 3, 5, 6]
+
+
+def test_record_tasks_appends_rows(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    tasks = [_task(1)]
+    store.save_tasks(tasks, tasks_file)
+
+    new_tasks = [_task(2, dependencies=[1], component="refactor")]
+    tasks.extend(new_tasks)
+    store.record_tasks(new_tasks, tasks, tasks_file)
+
+    assert store.load_tasks(tasks_file) == tasks
+
+
+def test_invalid_tasks_are_rejected(tmp_path):
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    tasks = [_task(1)]
+    store.save_tasks(tasks, tmp_path / "tasks.yml")
+    with pytest.raises(ValidationError):
+        store.save_tasks([_task(2, priority=9)], tmp_path / "tasks.yml")
+    assert store.load_tasks(tmp_path / "tasks.yml") == tasks
+
+
+def test_reimports_yaml_edited_after_export(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    store.save_tasks([_task(1), _task(2)], tasks_file)
+    store.close()
+
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    assert [t.id for t in store.load_tasks(tasks_file)] == [1, 2]
+
+    edited = [_task(1, status="done"), _task(3)]
+    Memory(tmp_path / "state.json").save_tasks(edited, tasks_file)
+    assert store.load_tasks(tasks_file) == edited
+    assert store.load_tasks(tasks_file) == edited
+    store.close()
+
+
+def test_task_limits_and_inputs_survive_round_trip(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    limited = _task(1)
+    limited.timeout, limited.cpu_limit, limited.memory_limit = 0.5, 2.0, 64 * 1024 * 1024
+    limited.inputs = ["core/*.py", "setup.cfg"]
+    Memory(tmp_path / "state.json").save_tasks([limited, _task(2)], tasks_file)
+
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    loaded = store.load_tasks(tasks_file)
+    assert loaded[0] == limited
+    loaded[1].status = "done"
+    store.record_status(loaded[1], loaded, tasks_file)
+    store.compact_tasks(loaded, tasks_file)
+    store.save_tasks(store.load_tasks(tasks_file), tasks_file)
+    store.close()
+
+    saved = yaml.safe_load(tasks_file.read_text())[0]
+    assert (saved["timeout"], saved["cpu_limit"], saved["memory_limit"]) == (0.5, 2.0, 64 * 1024 * 1024)
+    assert saved["inputs"] == ["core/*.py", "setup.cfg"]
+
+
+def test_old_database_gains_limit_columns_and_reimports(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    limited = _task(1)
+    limited.timeout = 3.0
+    Memory(tmp_path / "state.json").save_tasks([limited], tasks_file)
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    store.load_tasks(tasks_file)
+    store.close()
+    conn = sqlite3.connect(tmp_path / "tasks.sqlite3")
+    with conn:
+        conn.execute("ALTER TABLE tasks DROP COLUMN timeout")
+    conn.close()
+
+    store = SQLiteMemory(tmp_path / "state.json", tmp_path / "tasks.sqlite3")
+    assert store.load_tasks(tasks_file)[0].timeout == 3.0
+    store.close()
+
+
+def test_cli_closes_sqlite_backend(tmp_path, monkeypatch):
+    from core import cli
+
+    monkeypatch.chdir(tmp_path)
+    closed = []
+    monkeypatch.setattr(SQLiteMemory, "close", lambda self: closed.append(self.db_path))
+    monkeypatch.setattr(cli, "setup_telemetry", lambda: None)
+    monkeypatch.setattr(cli.Orchestrator, "run", lambda self, workers=1: None)
+
+    assert cli.main(["--backend", "sqlite", "--database", str(tmp_path / "cli.sqlite3")]) == 0
+    assert closed == [tmp_path / "cli.sqlite3"]
@@ -0,0 +1,112 @@
+import datetime
+import json
+import os
+import pickle
+
+import pytest
+import yaml
+from jsonschema.exceptions import ValidationError
+
+from core import task_loader
+from core.memory import TASK_SCHEMA
+from core.task_loader import load_task_file, remember_task_file
+
+TASKS = (
+    "- id: 1\n"
+    "  description: test\n"
+    "  component: core\n"
+    "  dependencies: []\n"
+    "  priority: 1\n"
+    "  status: pending\n"
+)
+
+
+def _age(path, seconds=10):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_unchanged_file_is_not_parsed_again(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.yml"
+    path.write_text(TASKS)
+    _age(path)
+    first = load_task_file(path)
+
+    def fail(_text):
+        raise AssertionError("file parsed twice")
+
+    monkeypatch.setattr(task_loader, "parse_yaml", fail)
+    second = load_task_file(path)
+    assert first == second
+    assert first is not second
+
+    task_loader._snapshots.clear()
+    assert load_task_file(path) == first
+
+
+def test_changed_content_is_reparsed(tmp_path):
+    path = tmp_path / "tasks.yml"
+    path.write_text(TASKS)
+    assert load_task_file(path)[0]["status"] == "pending"
+    path.write_text(TASKS.replace("pending", "done   "))
+    assert load_task_file(path)[0]["status"] == "done"
+
+
+def test_validation_runs_once_per_schema(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.yml"
+    path.write_text(TASKS)
+    _age(path)
+    load_task_file(path, TASK_SCHEMA)
+
+    def fail(*_args):
+        raise AssertionError("validated twice")
+
+    monkeypatch.setattr(task_loader, "validate_tasks", fail)
+    assert load_task_file(path, TASK_SCHEMA)[0]["id"] == 1
+
+
+def test_invalid_data_raises(tmp_path):
+    path = tmp_path / "tasks.yml"
+    path.write_text("- id: 'one'\n")
+    assert load_task_file(path) == [{"id": "one"}]
+    with pytest.raises(ValidationError):
+        load_task_file(path, TASK_SCHEMA)
+
+
+def test_invalid_yaml_raises(tmp_path):
+    path = tmp_path / "tasks.yml"
+    path.write_text("- id: [1\n")
+    with pytest.raises(yaml.YAMLError):
+        load_task_file(path)
+
+
+def test_remember_primes_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.yml"
+    path.write_text(TASKS)
+    remember_task_file(path, TASKS, [{"id": 1}])
+    monkeypatch.setattr(task_loader, "parse_yaml", lambda _text: pytest.fail("parsed"))
+    assert load_task_file(path) == [{"id": 1}]
+
+
+def test_foreign_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "tasks.yml"
+    path.write_text(TASKS)
+    _age(path)
+    key = str(path.resolve())
+    task_loader._snapshot_path(key).write_bytes(pickle.dumps({"digest": "x"}))
+    task_loader._snapshots.clear()
+
+    assert load_task_file(path)[0]["id"] == 1
+    header = task_loader._snapshot_path(key).read_text().splitlines()[0]
+    assert json.loads(header)["digest"] != "x"
+
+
+def test_data_without_json_form_is_parsed_each_time(tmp_path):
+    path = tmp_path / "tasks.yml"
+    path.write_text("- id: 1\n  due: 2024-01-02\n")
+    _age(path)
+
+    first = load_task_file(path)
+    assert first == [{"id": 1, "due": datetime.date(2024, 1, 2)}]
+    assert load_task_file(path) == first
+    assert str(path.resolve()) not in task_loader._snapshots
@@ -0,0 +1,146 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+from core.task_table import TaskTable, TaskView
+from vision.vision_engine import VisionEngine
+
+
+def _tasks():
+    return [
+        Task(id=1, description="first", component="core", dependencies=[], priority=2, status="done"),
+        Task(id=2, description="second", component="core", dependencies=[1], priority=3,
+             status="pending", command="echo hi"),
+        Task(id=3, description="third", component="docs", dependencies=[1, 2], priority=5,
+             status="pending"),
+    ]
+
+
+def test_round_trip_and_mapping_access():
+    tasks = _tasks()
+    table = TaskTable(tasks)
+    assert len(table) == 3
+    assert table.to_tasks() == tasks
+
+    view = table[1]
+    assert view.command == "echo hi"
+    assert view["dependencies"] == [1]
+    assert dict(table[2]) == {
+        "id": 3,
+        "description": "third",
+        "component": "docs",
+        "dependencies": [1, 2],
+        "priority": 5,
+        "status": "pending",
+    }
+    assert "command" not in table[0]
+    assert table.row_of(3) == 2
+    assert table.row_of(99) is None
+
+
+def test_views_write_through_to_columns():
+    table = TaskTable(_tasks())
+    table[1].status = "done"
+    assert table[1].status == "done"
+    assert table.status_count("done") == 2
+    assert table.status_count("in_progress") == 0
+
+
+def test_rejects_non_integer_ids():
+    with pytest.raises(TypeError):
+        TaskTable([{"id": "one", "status": "pending"}])
+
+
+def test_planner_schedules_table_rows():
+    table = TaskTable(_tasks())
+    planner = Planner()
+    first = planner.plan(table)
+    assert first.id == 2
+    first.status = "done"
+    assert planner.plan(table).id == 3
+
+    table.append({"id": 4, "description": "late", "component": "core",
+                  "dependencies": [], "priority": 9, "status": "pending"})
+    assert planner.plan(table).id == 4
+
+
+def test_planner_picks_up_rows_written_elsewhere():
+    table = TaskTable(_tasks())
+    planner = Planner()
+    assert planner.plan(table).id == 2
+
+    table[2].status = "in_progress"
+    table[0].status = "pending"
+    assert table.changed_rows(0) == [2, 0]
+    assert planner.plan(table).id == 1
+    table[0].status = "done"
+    table[1].status = "done"
+    assert planner.plan(table) is None
+    table[2].status = "pending"
+    assert planner.plan(table).id == 3
+
+
+def test_vision_engine_accepts_table_rows():
+    table = TaskTable(_tasks())
+    ordered = VisionEngine().prioritize(list(table))
+    assert [t.id for t in ordered] == [1, 2, 3]
+
+
+def test_reflector_accepts_table_rows(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    memory = Memory(tmp_path / "state.json")
+    memory.save_tasks(_tasks() + [Task(id=4, description="third", component="docs", dependencies=[],
+                                       priority=1, status="pending")], tasks_file)
+    table = memory.load_table(tasks_file)
+    refl = Reflector(tasks_path=tasks_file, analysis_paths=[tmp_path / "missing.py"], memory=memory)
+    result = refl.run_cycle(table)
+    assert [t["id"] for t in result] == [1, 2, 3, 4, 5]
+    saved = yaml.safe_load(tasks_file.read_text())
+    assert [t["id"] for t in saved] == [1, 2, 3, 4, 5]
+    assert saved[1]["command"] == "echo hi"
+    assert saved[4]["metadata"]["decision_type"] == "task_cleanup"
+
+
+def test_optional_fields_and_extra_keys_round_trip():
+    task = {"id": 7, "description": "run", "component": "ci", "dependencies": [], "priority": 2,
+            "status": "pending", "command": "make", "timeout": 1.5, "inputs": ["*.py"],
+            "metadata": {"generated_by": "Reflector"}}
+    table = TaskTable([task])
+    view = table[0]
+    assert (view.timeout, view.inputs, view.memory_limit) == (1.5, ["*.py"], None)
+    assert dict(view) == task
+    assert table.to_tasks() == [Task(id=7, description="run", component="ci", dependencies=[], priority=2,
+                                     status="pending", command="make", timeout=1.5, inputs=["*.py"])]
+    table.extend([Task(id=8, description="x", component="ci", dependencies=[7], priority=1, status="pending")])
+    assert [row.id for row in table[-2:]] == [7, 8]
+
+
+def test_orchestrator_runs_on_memory_table(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    memory = Memory(tmp_path / "state.json")
+    memory.save_tasks(_tasks(), tasks_file)
+    reflector = Reflector(tasks_path=tasks_file, analysis_paths=[tmp_path / "missing.py"], memory=memory)
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    executed = []
+
+    class RecordingExecutor:
+        def execute(self, task):
+            assert isinstance(task, TaskView)
+            executed.append((task.id, task.command))
+
+    orch = Orchestrator(Planner(), RecordingExecutor(), reflector, memory, auditor)
+    with patch("builtins.print"):
+        orch.run(str(tasks_file))
+
+    assert executed == [(2, "echo hi"), (3, None)]
+    existing = auditor.audit.call_args.args[0]
+    assert isinstance(existing, TaskTable)
+    assert [t.status for t in memory.load_tasks(tasks_file)] == ["done", "done", "done"]
@@ -15,3 +15,13 @@ def test_task_ids_unique():
         tasks = yaml.safe_load(f)
     ids = [task["id"] for task in tasks]
     assert len(ids) == len(set(ids)), "Task IDs must be unique"
+
+def test_header_schema_accepts_statuses_the_orchestrator_writes():
+    from core.bootstrap import load_schema_and_tasks
+    from core.memory import TASK_SCHEMA
+    from core.validation import validate_tasks
+
+    schema, tasks = load_schema_and_tasks(ROOT / "tasks.yml")
+    statuses = TASK_SCHEMA["items"]["properties"]["status"]["enum"]
+    assert schema["items"]["properties"]["status"]["enum"] == statuses
+    validate_tasks([dict(tasks[0], status="failed")], schema)
@@ -0,0 +1,90 @@
+import pytest
+from jsonschema.exceptions import SchemaError, ValidationError
+
+from core.memory import TASK_SCHEMA
+from core.validation import TaskListValidator, compiled_validator, validate_tasks
+
+
+def _task(id, status="pending"):
+    return {
+        "id": id,
+        "description": f"task {id}",
+        "component": "core",
+        "dependencies": [],
+        "priority": 1,
+        "status": status,
+    }
+
+
+class CountingValidator:
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def iter_errors(self, instance):
+        self.calls += 1
+        return self.inner.iter_errors(instance)
+
+
+def test_compiled_validator_is_cached():
+    schema = {"type": "array", "items": {"type": "integer"}}
+    assert compiled_validator(schema) is compiled_validator(dict(schema))
+
+
+def test_invalid_schema_rejected():
+    with pytest.raises(SchemaError):
+        compiled_validator({"type": 5})
+
+
+def test_validate_tasks_matches_jsonschema():
+    validate_tasks([_task(1)], TASK_SCHEMA)
+    with pytest.raises(ValidationError):
+        validate_tasks([{"id": "one"}], TASK_SCHEMA)
+
+
+def test_only_changed_tasks_are_revalidated():
+    validator = TaskListValidator(TASK_SCHEMA)
+    counter = CountingValidator(validator._item_validator)
+    validator._item_validator = counter
+    tasks = [_task(i) for i in range(10)]
+
+    validator.validate(tasks)
+    assert counter.calls == 10
+
+    tasks[3]["status"] = "done"
+    validator.validate(tasks)
+    assert counter.calls == 11
+
+    validator.validate(tasks)
+    assert counter.calls == 11
+
+
+def test_invalid_change_reports_index():
+    validator = TaskListValidator(TASK_SCHEMA)
+    tasks = [_task(1), _task(2)]
+    validator.validate(tasks)
+    tasks[1]["status"] = "bogus"
+    with pytest.raises(ValidationError) as info:
+        validator.validate(tasks)
+    assert list(info.value.path) == [1, "status"]
+
+
+def test_non_list_schema_falls_back_to_full_validation():
+    schema = {"type": "array", "items": {"type": "object"}, "minItems": 2}
+    validator = TaskListValidator(schema)
+    assert validator._item_validator is None
+    with pytest.raises(ValidationError):
+        validator.validate([_task(1)])
+    validator.validate([_task(1), _task(2)])
+
+
+def test_custom_header_schema_is_validated_incrementally():
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "items": {"type": "object", "required": ["id"]},
+    }
+    validator = TaskListValidator(schema)
+    validator.validate([_task(1)])
+    with pytest.raises(ValidationError):
+        validator.validate([_task(1), {"status": "pending"}])
@@ -7,6 +7,7 @@ from types import SimpleNamespace
 
 import yaml
 
+from core.task_loader import load_task_file
 from .vision_engine import wsjf_score
 
 
@@ -28,7 +29,7 @@ def main(argv=None) -> int:
     if not path.exists():
         print(f"Tasks file not found: {path}", file=sys.stderr)
         return 1
-    data = yaml.safe_load(path.read_text()) or []
+    data = load_task_file(path)
     tasks = [SimpleNamespace(**item) for item in data]
     scored = [
         {"id": item.get("id"), "wsjf": wsjf_score(task)}